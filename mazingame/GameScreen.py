@@ -33,12 +33,13 @@ import getpass
 import math
 import curses
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, List, Optional
 from argparse import Namespace
 
 from .globals import (
     MAZE_ROWS, MAZE_COLS, PAD_ROWS, PAD_COLS,
-    SCREEN_ROWS, SCREEN_COLUMNS
+    SCREEN_ROWS, SCREEN_COLUMNS, CLIMB_ROWS_AHEAD, STATUS_INTERVAL
 )
 from .mazepy import mazepy
 from .curses_utils import curses_utils
@@ -47,11 +48,13 @@ from .highscores import *
 from .gameclasses import Player
 from .gameclasses import Goal
 from .gameclasses import MazingCell
-from .gameclasses import GameGrid
-from .curses_utils import curses_utils
+from .levelcache import getLevel
 
 logger = logging.getLogger(__name__)
 
+#blank pad character in GameScreen.shadow
+BLANK=ord(" ")
+
 class GameScreen:
     """Manages the game screen display and interaction.
     
@@ -67,11 +70,18 @@ class GameScreen:
         grid: The maze grid
         player: Player object
         gamepad: Curses pad for maze display
+        shadow: Characters drawn to the pad, a bytearray per pad row
+        dirtyRect: Pad area changed since last refresh, as (top, left,
+            bottom, right), or None
         goal: Goal object marking the target location
         useFullTerminal: Whether to use full terminal or scrolling mode
         score: Current game score
         totalMoves: Total moves made by player
         gameover: Whether the game has ended
+        climbed: Rows climbed in endless climb mode
+        frameInterval: Minimum seconds between screen updates, 0 for no limit
+        framePending: Whether moves are waiting for the next screen update
+        statusPending: Whether status line is waiting for the next update
     """
     
     def __init__(self, stdscr: Any, useFullTerminal: bool, args: Namespace,
@@ -89,6 +99,9 @@ class GameScreen:
         self.grid=None
         self.player=None
         self.gamepad=None
+        #what has been drawn to gamepad, pad contents are never read back
+        self.shadow=[]
+        self.dirtyRect=None
         self.padCornerRow=0
         self.padCornerColumn=0
         self.goal=None
@@ -104,6 +117,13 @@ class GameScreen:
         self.replayInProgress=False
         self.algorithm=""
         self.args=args
+        self.climbed=0
+        #render scheduler, times are time.monotonic() seconds
+        self.frameInterval=1.0/args.fps if args.fps>0 else 0.0
+        self.lastFrame=0.0
+        self.framePending=False
+        self.lastStatus=0.0
+        self.statusPending=False
         #screenshot index
         self.screenshotIndex=0
         
@@ -142,12 +162,21 @@ class GameScreen:
         self.player=Player(name)
 
         #if replay get saved grid
-        if self.args.replay:
+        gameLevel=None
+        if self.args.climb:
+            #endless maze above the player, no goal
+            algorithm=random.choice(mazepy.streamingAlgorithmKeys())
+            self.grid=mazepy.initStreamingMaze(algorithm,MAZE_ROWS,MAZE_COLS,climbable=True)
+            self.algorithm=algorithm
+
+            playerRow=MAZE_ROWS-1
+            playerColumn=random.randint(0,MAZE_COLS-1)
+            goalRow=-1
+            goalColumn=-1
+        elif self.args.replay:
             replayGameId=self.args.replay[0]
             mazeInfo=getMazeInfo(replayGameId)
-            jsonString=mazeInfo["maze_json"]
-
-            self.grid=mazepy.initMazeFromJSON(jsonString,MazingCell)
+            self.grid=loadMaze(mazeInfo,MazingCell)
             self.algorithm=self.algorithm
     
             playerRow=mazeInfo["player_row"]
@@ -155,28 +184,16 @@ class GameScreen:
             goalRow=mazeInfo["goal_row"]
             goalColumn=mazeInfo["goal_column"]
         else:
-            #do it always right after setting random seed, to get same maze when using 
-            #same seed
-            self.grid=GameGrid(MAZE_ROWS,MAZE_COLS,MazingCell)
-            self.algorithm=""
-            #if level is None and self.args.algorithm:
-            #    self.algorithm=self.args.algorithm[0]
-            #else:
-            self.algorithm=random.choice(list(mazepy.MAZE_ALGORITHMS.keys()))
-        
-            self.grid=mazepy.initMaze(self.grid,self.algorithm)
-
-            braid=0.5#self.args.braid
-            #if braid<0:
-            #    braid=0.0
-            #if braid>1.0:
-            #    braid=1.0
-            self.grid.doBraid(braid)
-
-            playerRow=MAZE_ROWS-1
-            playerColumn=random.randint(0,MAZE_COLS-1)
-            goalRow=random.randint(0, MAZE_ROWS // 2)
-            goalColumn=random.randint(0,MAZE_COLS-1)
+            #generate maze, start and goal from the level seed
+            #or get them from level cache
+            gameLevel=getLevel(self.level,hard=self.args.hard)
+            self.grid=gameLevel.grid
+            self.algorithm=self.grid.algorithm_key
+
+            playerRow=gameLevel.playerRow
+            playerColumn=gameLevel.playerColumn
+            goalRow=gameLevel.goalRow
+            goalColumn=gameLevel.goalColumn
         
         #set start time after maze has been initialized
         self.startTime=utils.currentTimeMillis()
@@ -194,9 +211,15 @@ class GameScreen:
         self.goal=Goal(goalRow,goalColumn,goalScreenRow,goalScreenColumn)
 
         #find solution shortest path
-        distances = currentCell.getDistances()
-        self.shortestPath=distances.pathTo(self.grid.getCell(goalRow,goalColumn))
-        self.shortestPathLength=len(self.shortestPath)-1#does not count starting position
+        if self.args.climb:
+            self.shortestPath=mazepy.Distances(currentCell)
+            self.shortestPathLength=0
+        elif gameLevel is None:
+            #length does not count starting position
+            (self.shortestPath,self.shortestPathLength)=mazepy.solve(self.grid,currentCell,self.grid.getCell(goalRow,goalColumn))
+        else:
+            self.shortestPath=gameLevel.shortestPath
+            self.shortestPathLength=gameLevel.shortestPathLength
         #utils.debug("Shortest path: %d" % self.shortestPathLength)
         
 
@@ -210,39 +233,14 @@ class GameScreen:
             else:
                 self.useFullTerminal=False
                 self.gamepad=curses.newpad(PAD_ROWS,PAD_COLS)
-        for y in range(0, PAD_ROWS):
-            for x in range(0, PAD_COLS):
-                try:
-                    #if y==goalScreenRow and (x==goalScreenColumn or x==goalScreenColumn+2):
-                    if y==goalScreenRow and x==goalScreenColumn:
-                        self.gamepad.addch(y,x, ord(self.goal.symbol))
-                    else:
-                        self.gamepad.addch(y,x, ord(' '))
-                except curses.error as e:
-                    logger.debug(f"Could not add character at ({y},{x}): {e}")
-
-        if self.args.showpath:
-            for pathCell in self.shortestPath.getCells():
-                y=(1+pathCell.row)*2-1
-                x=(1+pathCell.column)*4-2
-                if y==goalScreenRow and x==goalScreenColumn:
-                    self.gamepad.addch(y,x, ord(self.goal.symbol))
-                else:
-                    self.gamepad.addch(y,x, ord('*'))
-
-        if self.args.showmaze:
-            for row in range(MAZE_ROWS):
-                for col in range(MAZE_COLS):
-                    currentCell=self.grid.getCell(row,col)
-                    screenRow=row*2+1
-                    screenColumn=(1+col)*4-2
-                    self.renderCell(currentCell,screenRow, screenColumn)
+        self.shadow=[bytearray(b" "*PAD_COLS) for _ in range(PAD_ROWS)]
+        self.drawFrame(self.composeFrame())
 
 
         #player location on screen
-        #center of screen in bottom row above status line
-        #screen row is location in pad
-        self.player.screenRow=PAD_ROWS-3
+        #screen row is location in pad, player starts in the bottom row
+        #except in hard mode
+        self.player.screenRow=self.player.row*2+1
         self.player.screenColumn=(1+self.player.column)*4-2
 
         #init game cells
@@ -252,20 +250,85 @@ class GameScreen:
 
         #visible pad upper left corner
         # Use dynamic screen dimensions instead of global constants
-        self.padCornerRow=PAD_ROWS - self.screenRows
+        #player is shown three rows above the bottom of the screen, as
+        #when starting from the bottom row of the maze
+        maxPadCornerRow=max(PAD_ROWS-self.screenRows,0)
+        self.padCornerRow=min(max(self.player.screenRow-(self.screenRows-3),0),maxPadCornerRow)
         self.padCornerColumn=PAD_COLS - self.screenColumns
         if self.padCornerColumn<0 or self.player.column<6:
             self.padCornerColumn=0
 
 
-        self.updatePad()
+        self.statusPending=True
+        self.render(True)
+
+    def composeFrame(self) -> List[str]:
+        """Compose the pad contents at game start, one string per pad row.
+
+        Walls are the same that renderCell draws for every cell when the
+        whole maze is shown. Shortest path and goal are drawn over them.
+
+        Returns:
+            List of PAD_ROWS strings of PAD_COLS characters
+        """
+        lines=[" "*PAD_COLS]*PAD_ROWS
+        if self.args.showmaze:
+            masks=self.grid.linkMasks()
+            lines[0]="+"+"---+"*MAZE_COLS
+            for row in range(MAZE_ROWS):
+                rowMasks=masks[row*MAZE_COLS:(row+1)*MAZE_COLS]
+                lines[row*2+1]="|"+"".join("    " if mask & mazepy.LINK_EAST else "   |" for mask in rowMasks)
+                lines[row*2+2]="+"+"".join("   +" if mask & mazepy.LINK_SOUTH else "---+" for mask in rowMasks)
+
+        def overlay(y: int, x: int, chr: str) -> None:
+            if 0<=y<PAD_ROWS and 0<=x<PAD_COLS:
+                lines[y]=lines[y][:x]+chr+lines[y][x+1:]
+
+        if self.args.showpath:
+            for pathCell in self.shortestPath.getCells():
+                overlay((1+pathCell.row)*2-1,(1+pathCell.column)*4-2,'*')
+        overlay(self.goal.screenRow,self.goal.screenColumn,self.goal.symbol)
+        return lines
+
+    def drawFrame(self, lines: List[str]) -> None:
+        """Draw pad rows, one addstr per row.
+
+        Args:
+            lines: Strings to draw from the first pad row down
+        """
+        self.markDirty(0,0,len(lines)-1,PAD_COLS-1)
+        for y,line in enumerate(lines):
+            self.shadow[y][:]=line.encode("ascii")
+            try:
+                self.gamepad.addstr(y,0,line)
+            except curses.error as e:
+                #writing the last character of a pad moves the cursor
+                #outside of it, the line is drawn anyway
+                logger.debug(f"Could not add line {y}: {e}")
 
     def movePlayer(self, direction: str) -> None:
         """Move the player in the specified direction.
-        
+
+        Move is shown on screen when next frame is due, see render().
+
         Args:
             direction: Direction to move ('up', 'down', 'left', 'right')
         """
+        self.applyMove(direction)
+        self.render()
+
+    def applyMove(self, direction: str) -> bool:
+        """Move the player without updating the terminal.
+
+        Trail and walls around the new cell are drawn to the pad, so that
+        all moves made between two frames are shown in the next frame.
+
+        Args:
+            direction: Direction to move ('up', 'down', 'left', 'right')
+
+        Returns:
+            True if the player moved, False if there is a wall
+        """
         #direction is 'up', 'down', 'left', 'right'
         #toRow and toColumn are maze coordinates where to move the player
         player=self.player    
@@ -302,24 +365,158 @@ class GameScreen:
                 if player.screenColumn<1:
                     player.screenColumn=1
             #adds cell where just moved to
-            player.addVisitedCell(grid.getCell(player.row,player.column))
+            if self.args.climb:
+                #window cells move when the maze grows, do not keep them
+                self.climb()
+            else:
+                player.addVisitedCell(grid.getCell(player.row,player.column))
             self.totalMoves=self.totalMoves+1
-        else:
-            pass
+            self.renderCell(grid.getCell(player.row,player.column),player.screenRow,player.screenColumn)
+            self.framePending=True
+            self.statusPending=True
+            return True
+        return False
+
+    def render(self, force: bool = False) -> bool:
+        """Show pending moves on screen if next frame is due.
+
+        Frames are shown at most once per frame interval, except when
+        the player reaches the goal.
+
+        Args:
+            force: Show frame even if frame interval has not passed
+
+        Returns:
+            True if a frame was shown
+        """
+        if not self.framePending and not force:
+            return False
+        now=time.monotonic()
+        if not force and not self.atGoal() and now-self.lastFrame<self.frameInterval:
+            return False
+        self.lastFrame=now
+        self.framePending=False
         self.updatePad()
+        return True
+
+    def tick(self) -> None:
+        """Show pending frame and status line when they are due.
+
+        Called by the game loop when there is no input. Elapsed time on
+        the status line is updated also when the player does not move.
+        """
+        if self.render() or self.gameover:
+            return
+        #only the status line is updated, pad is not copied to screen
+        #before the frame that draws the player
+        if self.statusDue() and (self.statusPending or not self.args.replay):
+            self.updateStatus()
+            curses.doupdate()
+
+    def idleTimeout(self) -> int:
+        """Get milliseconds to wait for input before calling tick().
+
+        Returns:
+            Timeout in milliseconds
+        """
+        interval=STATUS_INTERVAL
+        if self.frameInterval>0:
+            interval=min(interval,self.frameInterval)
+        return max(1,int(interval*1000))
+
+    def statusDue(self) -> bool:
+        """Return True if status interval has passed since last status update."""
+        return time.monotonic()-self.lastStatus>=STATUS_INTERVAL
+
+    def atGoal(self) -> bool:
+        """Return True if the player is at the goal."""
+        return self.player.row==self.goal.row and self.player.column==self.goal.column
+
+    def climb(self) -> None:
+        """Grow the maze above the player in endless climb mode.
+
+        New rows are generated when the player is less than
+        CLIMB_ROWS_AHEAD rows from the top of the maze window. The pad is
+        scrolled down with the maze, so walls and trail stay in place.
+        """
+        player=self.player
+        self.climbed=max(self.climbed,self.grid.streamRow(player.row))
+        if player.row>=CLIMB_ROWS_AHEAD:
+            return
+        rows=self.grid.advance(CLIMB_ROWS_AHEAD-player.row)
+        player.row=player.row+rows
+        player.screenRow=player.screenRow+2*rows
+        self.scrollPad(2*rows)
+        if self.args.showmaze:
+            #previous top wall line was drawn before links to the new rows
+            self.clearPadRow(2*rows)
+            #links to the dropped rows were removed from the bottom row
+            for row in list(range(rows))+[MAZE_ROWS-1]:
+                for col in range(MAZE_COLS):
+                    self.renderCell(self.grid.getCell(row,col),row*2+1,(1+col)*4-2)
 
 
     def takeScreenshot(self) -> None:
-        #take screenshot to specified directory
-        #hardcoded to use Cygwin
-        os.system('/usr/bin/import.exe -window "/cygdrive/c/Dropbox/git/mazingame" /cygdrive/c/Dropbox/git/mazingame/temp/image_%03d.png' % screenshotIndex)
+        #save image of the maze and cells visited so far to current directory
+        visited=mazepy.ArrayDistances(self.grid,self.player.visitedCells[0])
+        for moveIndex,cell in enumerate(self.player.visitedCells):
+            visited.setDistanceTo(cell,moveIndex)
+        fileName="mazingame_%d_%03d.png" % (self.level,self.screenshotIndex)
+        self.grid.toImage(fileName,showPath=visited)
         self.screenshotIndex=self.screenshotIndex+1
 
+    def scrollPad(self, rows: int) -> None:
+        """Scroll maze rows of the pad down, blank rows come to the top.
+
+        Args:
+            rows: Number of pad rows to scroll
+        """
+        #maze is in pad rows above the status line
+        self.gamepad.setscrreg(0,PAD_ROWS-2)
+        self.gamepad.scrollok(True)
+        self.gamepad.scroll(-rows)
+        self.gamepad.scrollok(False)
+        self.markDirty(0,0,PAD_ROWS-2,PAD_COLS-1)
+        mazeRows=self.shadow[:PAD_ROWS-1]
+        self.shadow[:PAD_ROWS-1]=[bytearray(b" "*PAD_COLS) for _ in range(rows)]+mazeRows[:len(mazeRows)-rows]
+
+    def clearPadRow(self, row: int) -> None:
+        """Clear a pad row.
+
+        Args:
+            row: Pad row
+        """
+        self.gamepad.move(row,0)
+        self.gamepad.clrtoeol()
+        self.shadow[row][:]=b" "*PAD_COLS
+        self.markDirty(row,0,row,PAD_COLS-1)
+
+    def markDirty(self, top: int, left: int, bottom: int, right: int) -> None:
+        """Add a pad area to the area refreshed by next refreshScreen.
+
+        Args:
+            top: First pad row
+            left: First pad column
+            bottom: Last pad row
+            right: Last pad column
+        """
+        if self.dirtyRect is not None:
+            (dirtyTop,dirtyLeft,dirtyBottom,dirtyRight)=self.dirtyRect
+            (top,left)=(min(top,dirtyTop),min(left,dirtyLeft))
+            (bottom,right)=(max(bottom,dirtyBottom),max(right,dirtyRight))
+        self.dirtyRect=(top,left,bottom,right)
+
     def addCharacter(self, row: int, column: int, chr: str) -> None:
         #add character to game screen
         #note: this should be only place where actual addstr takes place
         #in gamepad
+        code=ord(chr)
+        if self.shadow[row][column]==code:
+            #already on screen
+            return
+        self.shadow[row][column]=code
         self.gamepad.addstr(row,column,chr)
+        self.markDirty(row,column,row,column)
 
     def updatePad(self) -> None:
         """Update the game pad with current player position and check for game completion."""
@@ -346,33 +543,39 @@ class GameScreen:
 
 
     def scroll(self) -> None:
-        screenRow=self.player.screenRow
-        screenColumn=self.player.screenColumn
-        
-        # Use dynamic screen dimensions instead of hardcoded values
-        visibleWinRows=self.padCornerRow+self.screenRows-1
-        visibleWinColumns=self.padCornerColumn+self.screenColumns-1
-        
-        # Calculate maximum scroll positions dynamically
-        maxPadCornerRow = PAD_ROWS - self.screenRows
-        maxPadCornerColumn = PAD_COLS - self.screenColumns
-        
-        if (screenRow-self.padCornerRow)<4:
-            self.padCornerRow=self.padCornerRow-2
-            if self.padCornerRow<1:
-                self.padCornerRow=0
-        if (screenRow-self.padCornerRow)>self.screenRows-5:
-            self.padCornerRow=self.padCornerRow+2
-            if self.padCornerRow>maxPadCornerRow:
-                self.padCornerRow=maxPadCornerRow
-        if (screenColumn-self.padCornerColumn)<4:
-            self.padCornerColumn=self.padCornerColumn-4
-            if self.padCornerColumn<4:
-                self.padCornerColumn=0
-        if (screenColumn-self.padCornerColumn)>self.screenColumns-3:
-            self.padCornerColumn=self.padCornerColumn+4
-            if self.padCornerColumn>maxPadCornerColumn:
-                self.padCornerColumn=maxPadCornerColumn
+        #moves made between frames may have moved the player several
+        #rows or columns, scroll until player is inside the margins
+        while True:
+            corner=(self.padCornerRow,self.padCornerColumn)
+            screenRow=self.player.screenRow
+            screenColumn=self.player.screenColumn
+
+            # Use dynamic screen dimensions instead of hardcoded values
+            visibleWinRows=self.padCornerRow+self.screenRows-1
+            visibleWinColumns=self.padCornerColumn+self.screenColumns-1
+
+            # Calculate maximum scroll positions dynamically
+            maxPadCornerRow = PAD_ROWS - self.screenRows
+            maxPadCornerColumn = PAD_COLS - self.screenColumns
+
+            if (screenRow-self.padCornerRow)<4:
+                self.padCornerRow=self.padCornerRow-2
+                if self.padCornerRow<1:
+                    self.padCornerRow=0
+            if (screenRow-self.padCornerRow)>self.screenRows-5:
+                self.padCornerRow=self.padCornerRow+2
+                if self.padCornerRow>maxPadCornerRow:
+                    self.padCornerRow=maxPadCornerRow
+            if (screenColumn-self.padCornerColumn)<4:
+                self.padCornerColumn=self.padCornerColumn-4
+                if self.padCornerColumn<4:
+                    self.padCornerColumn=0
+            if (screenColumn-self.padCornerColumn)>self.screenColumns-3:
+                self.padCornerColumn=self.padCornerColumn+4
+                if self.padCornerColumn>maxPadCornerColumn:
+                    self.padCornerColumn=maxPadCornerColumn
+            if corner==(self.padCornerRow,self.padCornerColumn):
+                break
 
 
     def calculateScore(self, updateStatusLine: bool = True) -> None:
@@ -383,15 +586,23 @@ class GameScreen:
         - Time elapsed vs baseline time
         
         Args:
-            updateStatusLine: Whether to update the status line display
+            updateStatusLine: Whether to update the status line display.
+                Terminal is updated by the caller, with curses.doupdate().
         """
         #elapsed since start
         if self.args.replay:
         #if self.args.view:
             #do not calculate score if replaying
             return
-        elapsedMsec=(utils.currentTimeMillis() - self.startTime)
+        #at least one millisecond, score divides by elapsed time
+        elapsedMsec=max(utils.currentTimeMillis() - self.startTime,1)
         self.elapsed=elapsedMsec/1000.0
+        if self.args.climb:
+            #score is the height reached
+            self.score=self.climbed
+            if updateStatusLine==True:
+                self.updateStatusLine("Climbed: %d Moves: %d Elapsed: %.03fsecs" % (self.climbed,self.totalMoves,self.elapsed),False)
+            return
         currentTotalMoves=float(self.totalMoves)
         if currentTotalMoves==0:
             self.score=0.0
@@ -412,40 +623,76 @@ class GameScreen:
             self.score=math.ceil(currentDefaultStepScore*(baselineTimeMsec/float(elapsedMsec)))
         
         if updateStatusLine==True and self.replayInProgress==False:
-            self.updateStatusLine("P: (%d,%d) X: (%d,%d) Moves: %d/%d Elapsed: %.03fsecs Score: %d" % (self.player.row,self.player.column,self.goal.row,self.goal.column,self.totalMoves,self.shortestPathLength,self.elapsed,self.score))
+            self.updateStatusLine("P: (%d,%d) X: (%d,%d) Moves: %d/%d Elapsed: %.03fsecs Score: %d" % (self.player.row,self.player.column,self.goal.row,self.goal.column,self.totalMoves,self.shortestPathLength,self.elapsed,self.score),False)
             #self.updateStatusLine("Level: %d Moves: %d/%d Elapsed: %.03fsecs Score: %d" % (self.level,self.totalMoves,self.shortestPathLength,self.elapsed,self.score))
 
     def refreshScreen(self) -> None:
         #show pad in screen
         #Displays a section of the pad in the middle of the screen
+        #windows are copied to virtual screen with noutrefresh and
+        #terminal is updated once, with doupdate at the end
         if self.useFullTerminal==False:
+            corner=(self.padCornerRow,self.padCornerColumn)
             self.scroll()
-            repeat=True
-            col=self.screenColumns
-            while repeat:
-                try:
-                    # Use dynamic screen dimensions
-                    self.gamepad.refresh(self.padCornerRow,self.padCornerColumn, 0,0,self.screenRows-1,col)
-                    repeat=False
-                except curses.error as e:
-                    #Cygwin default bash prompt fails to scroll screen to left
-                    #this while,except should fix it
-                    logger.debug(f"Error scrolling to cols {col}: {e}")
-                    col=col-1
+            if corner!=(self.padCornerRow,self.padCornerColumn):
+                #all of the visible pad moved
+                self.markDirty(0,0,PAD_ROWS-1,PAD_COLS-1)
+            self.refreshPad()
         else:
-            self.gamepad.refresh()
+            self.gamepad.noutrefresh()
+        self.dirtyRect=None
 
         screenRow=self.player.screenRow
         screenColumn=self.player.screenColumn
 
         playerRow=self.player.row
         playerColumn=self.player.column
-        self.calculateScore()
+        #elapsed time and score are updated after moves, at most once
+        #per status interval
+        if self.statusPending and (self.statusDue() or self.atGoal()):
+            self.updateStatus()
+        else:
+            self.calculateScore(False)
         #take screenshot
         #self.takeScreenshot()
+        curses.doupdate()
+
+    def updateStatus(self) -> None:
+        """Calculate score and draw the status line.
 
+        Terminal is updated by the caller, with curses.doupdate().
+        """
+        self.calculateScore(True)
         if self.replayInProgress==True:
-            self.updateStatusLine("REPLAY Game ID: %d Moves: %d/%d " % (self.args.replay[0],self.totalMoves,self.shortestPathLength))
+            self.updateStatusLine("REPLAY Game ID: %d Moves: %d/%d " % (self.args.replay[0],self.totalMoves,self.shortestPathLength),False)
+        self.statusPending=False
+        self.lastStatus=time.monotonic()
+
+    def refreshPad(self) -> None:
+        """Copy the changed area of the visible pad to virtual screen."""
+        if self.dirtyRect is None:
+            return
+        (top,left,bottom,right)=self.dirtyRect
+        top=max(top,self.padCornerRow)
+        left=max(left,self.padCornerColumn)
+        bottom=min(bottom,self.padCornerRow+self.screenRows-1)
+        repeat=True
+        col=self.screenColumns
+        while repeat:
+            lastColumn=min(right,self.padCornerColumn+col)
+            if top>bottom or left>lastColumn:
+                #changes are not visible
+                return
+            try:
+                # Use dynamic screen dimensions
+                self.gamepad.noutrefresh(top,left,top-self.padCornerRow,left-self.padCornerColumn,
+                                         bottom-self.padCornerRow,lastColumn-self.padCornerColumn)
+                repeat=False
+            except curses.error as e:
+                #Cygwin default bash prompt fails to scroll screen to left
+                #this while,except should fix it
+                logger.debug(f"Error scrolling to cols {col}: {e}")
+                col=col-1
 
     def renderCell(self, cell: Any, centerRow: int, centerColumn: int, recursion: bool = True) -> None:
     
@@ -497,12 +744,18 @@ class GameScreen:
             #if column is left of left border, do nothing
             return
         #if row,column is empty add character
-        _chr=self.gamepad.inch(row,column)
-        if _chr == ord(' '):
+        if self.shadow[row][column]==BLANK:
             self.addCharacter(row,column, chr)
 
     
-    def updateStatusLine(self, status: str) -> None:
+    def updateStatusLine(self, status: str, update: bool = True) -> None:
+        """Show a status line below the maze.
+
+        Args:
+            status: Status text
+            update: Whether to update the terminal now. If False, the
+                caller updates it with curses.doupdate().
+        """
         if self.useFullTerminal==False:
             row=SCREEN_ROWS-1
         else:
@@ -511,6 +764,8 @@ class GameScreen:
         self.stdscr.clrtoeol()
         #do not use addCharacter here
         self.stdscr.addstr(row, 0, status)
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
+        if update:
+            curses.doupdate()
 
 
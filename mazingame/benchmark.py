@@ -0,0 +1,176 @@
+"""Maze algorithm benchmark for MazinGame.
+
+Times each algorithm in the mazepy algorithm registry across grid sizes,
+including vectorized variants when NumPy is available.
+
+The MIT License (MIT)
+
+Copyright (c) 2015,2026 Sami Salkosuo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mazepy import mazepy
+
+logger = logging.getLogger(__name__)
+
+# Default grid sizes, the game size and larger mazes
+DEFAULT_BENCHMARK_SIZES = "20x25,100x100,300x300"
+
+GRID_CLASSES = {"grid": mazepy.Grid, "compact": mazepy.CompactGrid}
+
+
+def parseSizes(spec: str) -> List[Tuple[int, int]]:
+    """Parse a comma separated list of ROWSxCOLUMNS sizes.
+
+    Args:
+        spec: Size specification, for example "20x25,100x100"
+
+    Returns:
+        List of (rows, columns) tuples
+
+    Raises:
+        ValueError: If specification is not valid
+    """
+    sizes: List[Tuple[int, int]] = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        (rows, separator, columns) = part.partition("x")
+        if not separator or int(rows) < 1 or int(columns) < 1:
+            raise ValueError(f"Invalid size: {part}")
+        sizes.append((int(rows), int(columns)))
+    if not sizes:
+        raise ValueError(f"No sizes in: {spec}")
+    return sizes
+
+
+def _timeBest(function: Any, repeat: int) -> float:
+    best = None
+    for seed in range(repeat):
+        random.seed(seed)
+        started = time.perf_counter()
+        function(seed)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def benchmarkAlgorithms(sizes: List[Tuple[int, int]], repeat: int = 3,
+                        keys: Optional[List[str]] = None,
+                        gridClass: Any = mazepy.Grid) -> List[Dict[str, Any]]:
+    """Time registered maze algorithms.
+
+    Each algorithm is run repeat times with seeds 0..repeat-1 and the best
+    time is reported. Vectorized variants are timed too when NumPy is
+    installed.
+
+    Args:
+        sizes: List of (rows, columns) grid sizes
+        repeat: Number of runs per algorithm and size
+        keys: Algorithm keys (default: all registered algorithms)
+        gridClass: Grid class for the mazes
+
+    Returns:
+        List of result dictionaries with key, variant, rows, columns,
+        seconds and cells per second
+
+    Raises:
+        ValueError: If repeat is less than 1
+    """
+    if repeat < 1:
+        raise ValueError(f"Invalid repeat: {repeat}")
+    if keys is None:
+        keys = list(mazepy.MAZE_REGISTRY.keys())
+    results = []
+    for (rows, columns) in sizes:
+        for key in keys:
+            algorithm = mazepy.getAlgorithm(key)
+            variants = [("", lambda seed: algorithm.function(gridClass(rows, columns)))]
+            if algorithm.vectorized is not None and mazepy.numpy is not None:
+                variants.append(("vectorized",
+                                 lambda seed: algorithm.vectorized(rows, columns, seed)))
+            for (variant, function) in variants:
+                seconds = _timeBest(function, repeat)
+                results.append({
+                    "key": key,
+                    "variant": variant,
+                    "rows": rows,
+                    "columns": columns,
+                    "seconds": seconds,
+                    "rate": rows * columns / seconds if seconds > 0 else 0.0,
+                })
+                logger.debug(f"Benchmark {key} {variant} {rows}x{columns}: {seconds:.6f}s")
+    return results
+
+
+def printResults(results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a table.
+
+    Args:
+        results: Results returned by benchmarkAlgorithms
+    """
+    print("%-24s %-12s %-11s %12s %14s" % ("ALGORITHM", "VARIANT", "SIZE", "MS", "CELLS/SEC"))
+    for result in results:
+        print("%-24s %-12s %-11s %12.3f %14.0f" % (
+            mazepy.MAZE_ALGORITHMS[result["key"]], result["variant"],
+            "%dx%d" % (result["rows"], result["columns"]),
+            result["seconds"] * 1000, result["rate"]))
+
+
+def printAlgorithms() -> None:
+    """Print registered algorithms and their properties."""
+    print("%-4s %-24s %-8s %-10s %-9s %s" % ("KEY", "ALGORITHM", "RANDOM", "VECTORIZED",
+                                            "STREAMING", "COMPLEXITY / BIAS"))
+    for algorithm in mazepy.MAZE_REGISTRY.values():
+        print("%-4s %-24s %-8s %-10s %-9s %s / %s" % (
+            algorithm.key, algorithm.name, "yes" if algorithm.randomPool else "no",
+            "yes" if algorithm.vectorized is not None else "no",
+            "yes" if algorithm.streaming is not None else "no",
+            algorithm.complexity, algorithm.bias))
+
+
+def runBenchmark(args: Any) -> None:
+    """Run the benchmark command.
+
+    Args:
+        args: Command line arguments of the benchmark command
+    """
+    if args.list:
+        printAlgorithms()
+        return
+    try:
+        sizes = parseSizes(args.sizes)
+        if args.repeat < 1:
+            raise ValueError(f"Invalid repeat: {args.repeat}")
+        keys = args.algorithms.split(",") if args.algorithms else None
+        for key in keys or []:
+            mazepy.getAlgorithm(key)
+    except ValueError as e:
+        print(f"Invalid benchmark: {e}")
+        return
+    results = benchmarkAlgorithms(sizes, args.repeat, keys, GRID_CLASSES[args.grid])
+    printResults(results)
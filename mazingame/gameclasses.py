@@ -94,9 +94,10 @@ class Goal:
                 f"screen position: [{self.screenRow},{self.screenColumn}]")
 
 
-class MazingCell(mazepy.Cell):
-    """Custom cell class for MazinGame, extends mazepy.Cell."""
-    pass
+class MazingCell(mazepy.SlottedCell):
+    """Custom cell class for MazinGame, extends mazepy.SlottedCell."""
+
+    __slots__ = ()
 
 
 class GameGrid(mazepy.Grid):
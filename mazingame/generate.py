@@ -0,0 +1,212 @@
+"""Batch level pre-generation for MazinGame.
+
+Generates levels in parallel worker processes and writes the mazes, player
+starts, goals and shortest paths to the level cache, so that the game loads
+them without generating them again.
+
+The MIT License (MIT)
+
+Copyright (c) 2015,2026 Sami Salkosuo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .globals import MAZE_BRAID, MAZE_COLS, MAZE_ROWS, MAZINGAME_CACHE_FILE, MAZINGAME_CACHE_SIZE
+from .levelcache import LevelCache, getCacheFile, getCacheSize, packRandomState
+from .levels import generateLevel, levelToRecord
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Levels written to the cache in one transaction
+BATCH_SIZE = 100
+
+
+def parseLevels(spec: str) -> List[int]:
+    """Parse a level specification.
+
+    Specification is a comma separated list of levels and inclusive
+    ranges, for example "1-1000" or "5,42,100-199".
+
+    Args:
+        spec: Level specification
+
+    Returns:
+        List of levels in specification order
+
+    Raises:
+        ValueError: If specification is not valid
+    """
+    levels: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part[1:]:
+            # Allow negative start, split from the range separator
+            separator = part.index("-", 1)
+            first = int(part[:separator])
+            last = int(part[separator + 1:])
+            if last < first:
+                raise ValueError(f"Invalid level range: {part}")
+            levels.extend(range(first, last + 1))
+        else:
+            levels.append(int(part))
+    if not levels:
+        raise ValueError(f"No levels in: {spec}")
+    return levels
+
+
+def _generateRecord(task: Tuple[int, int, int, float, bool]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    # Runs in worker process
+    (level, rows, columns, braid, hard) = task
+    generated = generateLevel(level, rows, columns, braid, hard)
+    record = levelToRecord(generated)
+    record["random_state"] = packRandomState(generated.randomState)
+    return (record, generated.timings)
+
+
+def _records(tasks: List[Tuple[int, int, int, float, bool]], workers: int,
+             chunksize: int) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+    if workers <= 1:
+        for task in tasks:
+            yield _generateRecord(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_generateRecord, tasks, chunksize=chunksize)
+
+
+def generateLevels(levels: List[int], cache: LevelCache, workers: Optional[int] = None,
+                   rows: int = MAZE_ROWS, columns: int = MAZE_COLS, braid: float = MAZE_BRAID,
+                   hard: bool = False, quiet: bool = False) -> Dict[str, Any]:
+    """Generate levels in parallel and write them to a level cache.
+
+    Existing levels with the same parameters are replaced. If there are
+    more levels than fit in the cache, only the last levels are kept.
+
+    Args:
+        levels: Levels to generate
+        cache: Level cache to write the levels to
+        workers: Number of worker processes (default: number of CPUs)
+        rows: Number of maze rows
+        columns: Number of maze columns
+        braid: Braiding factor
+        hard: Generate hard mode levels
+        quiet: If True, do not print progress
+
+    Returns:
+        Dictionary with total count, elapsed seconds, mazes per second and
+        per algorithm counts and mean phase timings
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = [(level, rows, columns, braid, hard) for level in levels]
+    # Enough chunks per worker to balance load, but few enough to keep
+    # inter-process overhead small
+    chunksize = max(1, min(100, len(tasks) // (workers * 8)))
+
+    algorithms: Dict[str, Dict[str, float]] = {}
+    count = 0
+    started = time.perf_counter()
+    lastProgress = started
+    # Records from workers are stored as they are, without decoding the mazes
+    batch: List[Dict[str, Any]] = []
+
+    for (record, timings) in _records(tasks, workers, chunksize):
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            cache.putRecords(batch)
+            batch = []
+        count += 1
+        stats = algorithms.setdefault(record["algorithm"], {"count": 0})
+        stats["count"] += 1
+        for phase, seconds in timings.items():
+            stats[phase] = stats.get(phase, 0.0) + seconds
+
+        now = time.perf_counter()
+        if not quiet and now - lastProgress >= PROGRESS_INTERVAL:
+            lastProgress = now
+            print("Generated %d/%d mazes (%.1f mazes/sec)" % (
+                count, len(tasks), count / (now - started)))
+    if batch:
+        cache.putRecords(batch)
+
+    elapsed = time.perf_counter() - started
+    for stats in algorithms.values():
+        for phase in list(stats.keys()):
+            if phase != "count":
+                stats[phase] = stats[phase] / stats["count"]
+    result = {
+        "count": count,
+        "elapsed": elapsed,
+        "rate": count / elapsed if elapsed > 0 else 0.0,
+        "algorithms": algorithms,
+    }
+    logger.info(f"Generated {count} levels to {cache.cacheFile} in {elapsed:.3f}s")
+    return result
+
+
+def printSummary(result: Dict[str, Any], cacheFile: str) -> None:
+    """Print generation summary with per algorithm timings.
+
+    Args:
+        result: Result returned by generateLevels
+        cacheFile: Path to the SQLite level cache
+    """
+    print("Generated %d mazes to %s in %.3fsecs (%.1f mazes/sec)" % (
+        result["count"], cacheFile, result["elapsed"], result["rate"]))
+    print("%-10s %8s %14s %14s %14s" % ("ALGORITHM", "MAZES", "GENERATE MS", "BRAID MS", "SOLVE MS"))
+    for algorithm in sorted(result["algorithms"].keys()):
+        stats = result["algorithms"][algorithm]
+        print("%-10s %8d %14.3f %14.3f %14.3f" % (
+            algorithm, stats["count"], stats.get("generate", 0.0) * 1000,
+            stats.get("braid", 0.0) * 1000, stats.get("solve", 0.0) * 1000))
+
+
+def runGenerate(args: Any) -> None:
+    """Run the generate command.
+
+    Args:
+        args: Command line arguments of the generate command
+    """
+    try:
+        levels = parseLevels(args.levels)
+    except ValueError as e:
+        print(f"Invalid levels: {e}")
+        return
+    cacheFile = args.output if args.output is not None else getCacheFile()
+    if cacheFile is None:
+        print(f"No level cache, use -o FILE or set {MAZINGAME_CACHE_FILE}.")
+        return
+    cacheSize = getCacheSize()
+    if len(levels) > cacheSize:
+        print(f"Level cache holds {cacheSize} levels, only the last {cacheSize} are kept. "
+              f"Set {MAZINGAME_CACHE_SIZE} to keep more.")
+    cache = LevelCache(cacheFile, cacheSize)
+    result = generateLevels(levels, cache, args.workers, args.rows, args.columns, args.braid,
+                            args.hard)
+    printSummary(result, cacheFile)
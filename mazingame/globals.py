@@ -32,9 +32,30 @@ MAZINGAME_HIGHSCORE_FILE="MAZINGAME_HIGHSCORE_FILE"
 #default for high score file
 DEFAULT_MAZINGAME_HIGHSCORE_FILE="mazingame_highscores.sqlite"
 
+#environment variable that holds level cache file path and name
+MAZINGAME_CACHE_FILE="MAZINGAME_CACHE_FILE"
+#default for level cache file
+DEFAULT_MAZINGAME_CACHE_FILE="mazingame_cache.sqlite"
+#environment variable that holds maximum number of cached levels
+MAZINGAME_CACHE_SIZE="MAZINGAME_CACHE_SIZE"
+#default maximum number of cached levels
+DEFAULT_MAZINGAME_CACHE_SIZE=1000
+
 #maze
 MAZE_ROWS=20
 MAZE_COLS=25
+#braiding factor of game mazes
+MAZE_BRAID=0.5
+#endless climb mode generates new rows to keep this many maze rows
+#above the player
+CLIMB_ROWS_AHEAD=MAZE_ROWS//2
+
+#screen updates
+#default maximum number of screen updates per second, moves made
+#between updates are shown in the next update
+DEFAULT_FRAME_RATE=30
+#minimum seconds between elapsed time and score updates in status line
+STATUS_INTERVAL=0.25
 
 #game pad screen
 PAD_ROWS=MAZE_ROWS*2+2
@@ -27,6 +27,7 @@ import os
 import logging
 from typing import List, Tuple, Optional, Dict, Any
 from .utils import utils
+from .mazepy import mazepy
 from .globals import MAZINGAME_HIGHSCORE_FILE, DEFAULT_MAZINGAME_HIGHSCORE_FILE
 
 logger = logging.getLogger(__name__)
@@ -88,8 +89,10 @@ def getMazeInfo(gameId: int) -> Optional[Dict[str, Any]]:
     
     try:
         (conn, cursor) = utils.openDatabase(dbFile)
+        migrateMazesTable(cursor)
         cursor.execute(
-            "select maze_json,player_row,player_column,goal_row,goal_column from mazes where gameid=?",
+            "select maze_json,maze_blob,player_row,player_column,goal_row,goal_column "
+            "from mazes where gameid=?",
             (gameId,)
         )
         row = cursor.fetchone()
@@ -100,6 +103,7 @@ def getMazeInfo(gameId: int) -> Optional[Dict[str, Any]]:
             
         result: Dict[str, Any] = {
             "maze_json": row["maze_json"],
+            "maze_blob": row["maze_blob"],
             "player_row": row["player_row"],
             "player_column": row["player_column"],
             "goal_row": row["goal_row"],
@@ -114,6 +118,127 @@ def getMazeInfo(gameId: int) -> Optional[Dict[str, Any]]:
         return None
 
 
+def migrateMazesTable(cursor: Any) -> None:
+    """Add maze_blob column to mazes table created by older versions.
+
+    Args:
+        cursor: Database cursor
+    """
+    columns = [row[1] for row in cursor.execute("pragma table_info(mazes)")]
+    if columns and "maze_blob" not in columns:
+        cursor.execute("alter table mazes add column maze_blob blob")
+        logger.info("Added maze_blob column to mazes table")
+
+
+def migrateHighScoresTable(cursor: Any) -> None:
+    """Add hard column to highscores table created by older versions.
+
+    Games of older versions are in normal mode.
+
+    Args:
+        cursor: Database cursor
+    """
+    columns = [row[1] for row in cursor.execute("pragma table_info(highscores)")]
+    if columns and "hard" not in columns:
+        cursor.execute("alter table highscores add column hard integer default 0")
+        logger.info("Added hard column to highscores table")
+
+
+def migrateMazes(compact: bool = False) -> int:
+    """Convert JSON mazes saved by older versions to binary format.
+
+    JSON mazes are kept, so that older versions can still read the
+    high score file.
+
+    Args:
+        compact: If True, remove JSON mazes and compact the database file.
+            Older versions can not show mazes of the high score file after this.
+
+    Returns:
+        Number of converted mazes or -1 if there is no high score file
+    """
+    dbFile = getHighScoreFile()
+    if dbFile is None or not os.path.exists(dbFile):
+        logger.warning("No high score file, nothing to migrate")
+        return -1
+
+    (conn, cursor) = utils.openDatabase(dbFile)
+    try:
+        migrateMazesTable(cursor)
+        rows = cursor.execute(
+            "select rowid,maze_json from mazes where maze_blob is null and maze_json is not null"
+        ).fetchall()
+        for row in rows:
+            mazeBlob = mazepy.initMazeFromJSON(row["maze_json"]).toBytes()
+            cursor.execute(
+                "update mazes set maze_blob=? where rowid=?",
+                (mazeBlob, row["rowid"])
+            )
+        if compact:
+            cursor.execute("update mazes set maze_json=null where maze_blob is not null")
+        conn.commit()
+        if compact:
+            conn.execute("vacuum")
+        logger.info(f"Migrated {len(rows)} mazes to binary format")
+        return len(rows)
+    finally:
+        utils.closeDatabase(conn)
+
+
+def loadMaze(mazeInfo: Any, cellClass: Any = mazepy.Cell) -> mazepy.Grid:
+    """Create a maze grid from a saved maze.
+
+    Args:
+        mazeInfo: Mapping with maze_blob and maze_json, like getMazeInfo result
+        cellClass: Cell class to use
+
+    Returns:
+        Grid object with the maze
+    """
+    if mazeInfo["maze_blob"] is not None:
+        return mazepy.initMazeFromBytes(mazeInfo["maze_blob"], cellClass)
+    # Saved by older version
+    return mazepy.initMazeFromJSON(mazeInfo["maze_json"], cellClass)
+
+
+def exportThumbnails(directory: str, cellSize: int = 4) -> int:
+    """Write an image of the maze of each level in the high score file.
+
+    Images are named level_<level>.png. Shortest paths are not shown.
+
+    Args:
+        directory: Directory for the images, created if needed
+        cellSize: Cell size in pixels
+
+    Returns:
+        Number of images written or -1 if there is no high score file
+    """
+    dbFile = getHighScoreFile()
+    if dbFile is None or not os.path.exists(dbFile):
+        logger.warning("No high score file, no thumbnails")
+        return -1
+
+    os.makedirs(directory, exist_ok=True)
+    (conn, cursor) = utils.openDatabase(dbFile)
+    try:
+        migrateMazesTable(cursor)
+        # Oldest game of each level, same level has the same maze
+        rows = cursor.execute(
+            "select h.level as level,m.maze_json as maze_json,m.maze_blob as maze_blob "
+            "from highscores h join mazes m on h.gameid=m.gameid "
+            "where h.gameid in (select min(gameid) from highscores group by level) "
+            "order by h.level"
+        ).fetchall()
+    finally:
+        utils.closeDatabase(conn)
+
+    for row in rows:
+        grid = loadMaze(row)
+        grid.toImage(os.path.join(directory, f"level_{row['level']}.png"), cellSize)
+    logger.info(f"Wrote {len(rows)} thumbnails to {directory}")
+    return len(rows)
+
+
 def getHighScoreFile() -> Optional[str]:
     """Get the path to the high score database file.
     
@@ -197,8 +322,10 @@ def saveScores(
             cheat integer,
             version text,
             braid real,
-            replay_of_gameid integer
+            replay_of_gameid integer,
+            hard integer
         )''')
+        migrateHighScoresTable(cursor)
         cursor.execute('''CREATE TABLE IF NOT EXISTS gamemoves (
             gameid integer,
             move_index integer,
@@ -207,12 +334,14 @@ def saveScores(
         )''')
 
         replaygameid = args.replay[0] if args.replay else 0
+        # Hard mode has a different start and goal, scores are listed separately
+        hard = int(bool(args.hard))
         values = (timestamp, score, level, elapsed, moves, shortestPath, int(cheat),
-                 player.name, algorithm, version, braid, replaygameid, level)
+                 player.name, algorithm, version, braid, replaygameid, level, hard)
         cursor.execute(
             'insert into highscores (timestamp,score,level,elapsed_secs,moves,'
             'shortest_path_moves,cheat,player_name,algorithm,version,braid,'
-            'replay_of_gameid,level) values (?,?,?,?,?,?,?,?,?,?,?,?,?)',
+            'replay_of_gameid,level,hard) values (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
             values
         )
         
@@ -223,21 +352,25 @@ def saveScores(
             raise ValueError("Failed to retrieve game ID after insert")
         gameid = result[0]
 
-        # Save maze
-        mazeJSON = grid.toJSONString()
+        # Save maze in binary format. maze_json is used by older versions and
+        # saved only when asked, to keep the high score file small.
+        mazeBlob = grid.toBytes()
+        mazeJson = grid.toJSONString() if args.jsonmazes else None
         cursor.execute('''CREATE TABLE IF NOT EXISTS mazes (
             gameid integer,
             player_row integer,
             player_column integer,
             goal_row integer,
             goal_column integer,
-            maze_json text
+            maze_json text,
+            maze_blob blob
         )''')
+        migrateMazesTable(cursor)
         values = (gameid, player.startingRow, player.startingColumn,
-                 goal.row, goal.column, mazeJSON)
+                 goal.row, goal.column, mazeJson, mazeBlob)
         cursor.execute(
             'insert into mazes (gameid,player_row,player_column,goal_row,'
-            'goal_column,maze_json) values (?,?,?,?,?,?)',
+            'goal_column,maze_json,maze_blob) values (?,?,?,?,?,?,?)',
             values
         )
 
@@ -306,6 +439,7 @@ def listHighScores(args: Any) -> None:
 
     try:
         (conn, cursor) = utils.openDatabase(dbFile)
+        migrateHighScoresTable(cursor)
 
         level: Optional[int] = None
         algorithm: Optional[str] = None
@@ -329,6 +463,11 @@ def listHighScores(args: Any) -> None:
             sql += " (cheat=0 or cheat=1)"
         else:
             sql += " cheat=0"
+
+        if args.hard:
+            sql += " and hard=1"
+        else:
+            sql += " and (hard=0 or hard is null)"
         
         if algorithm is not None:
             sql += f" and algorithm='{algorithm}'"
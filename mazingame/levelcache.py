@@ -0,0 +1,310 @@
+"""Persistent level cache for MazinGame.
+
+Caches generated levels in SQLite, keyed by level and generation
+parameters, so that starting a game on a level that was played before
+skips maze generation and shortest path search. Least recently used
+levels are evicted when the cache is full.
+
+The MIT License (MIT)
+
+Copyright (c) 2015,2026 Sami Salkosuo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+import random
+import sqlite3
+import struct
+import logging
+from array import array
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .globals import (
+    MAZE_ROWS, MAZE_COLS, MAZE_BRAID,
+    MAZINGAME_CACHE_FILE, DEFAULT_MAZINGAME_CACHE_FILE,
+    MAZINGAME_CACHE_SIZE, DEFAULT_MAZINGAME_CACHE_SIZE
+)
+from .levels import Level, generateLevel, levelAlgorithm, levelFromRecord, levelToRecord
+from .utils import utils
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLUMNS = ("level", "hard", "algorithm", "rows", "columns", "braid", "maze",
+                 "player_row", "player_column", "goal_row", "goal_column",
+                 "shortest_path", "shortest_path_moves", "random_state")
+
+# Next value of the use counter, a logical clock for LRU eviction
+NEXT_USE = "(select coalesce(max(last_used),0)+1 from level_cache)"
+
+# Caches used by getLevel, by cache file, so schema is set up once per file
+_defaultCaches: Dict[str, "LevelCache"] = {}
+
+
+def packRandomState(state: Tuple[Any, ...]) -> bytes:
+    """Pack random.getstate() result to bytes.
+
+    Args:
+        state: Random generator state
+
+    Returns:
+        State as bytes
+    """
+    (version, internalState, gaussNext) = state
+    data = struct.pack("<B", version) + array("I", internalState).tobytes()
+    if gaussNext is not None:
+        data = data + struct.pack("<d", gaussNext)
+    return data
+
+
+def unpackRandomState(data: bytes) -> Tuple[Any, ...]:
+    """Unpack random generator state packed with packRandomState.
+
+    Args:
+        data: State as bytes
+
+    Returns:
+        State for random.setstate()
+    """
+    version = data[0]
+    internalState = array("I")
+    # Mersenne Twister state is 624 words and position
+    internalState.frombytes(data[1:1 + 625 * internalState.itemsize])
+    rest = data[1 + 625 * internalState.itemsize:]
+    gaussNext = struct.unpack("<d", rest)[0] if rest else None
+    return (version, tuple(internalState), gaussNext)
+
+
+def getCacheFile() -> Optional[str]:
+    """Get the path to the level cache file.
+
+    Returns:
+        Path to level cache file or None if caching is not available
+    """
+    cacheFile = os.environ.get(MAZINGAME_CACHE_FILE)
+    if cacheFile is not None:
+        return cacheFile
+    gameDataDir = "/data"
+    if not os.path.exists(gameDataDir):
+        logger.debug("Game data directory does not exist, levels will not be cached")
+        return None
+    return f"{gameDataDir}/{DEFAULT_MAZINGAME_CACHE_FILE}"
+
+
+def getCacheSize() -> int:
+    """Get the maximum number of cached levels.
+
+    Returns:
+        Maximum number of cached levels
+    """
+    try:
+        return int(os.environ.get(MAZINGAME_CACHE_SIZE, DEFAULT_MAZINGAME_CACHE_SIZE))
+    except ValueError:
+        logger.warning(f"Invalid {MAZINGAME_CACHE_SIZE}, using default")
+        return DEFAULT_MAZINGAME_CACHE_SIZE
+
+
+class LevelCache:
+    """SQLite cache of generated levels with LRU eviction."""
+
+    def __init__(self, cacheFile: str, maxLevels: int = DEFAULT_MAZINGAME_CACHE_SIZE) -> None:
+        """Initialize a level cache.
+
+        Args:
+            cacheFile: Path to the SQLite cache file
+            maxLevels: Maximum number of cached levels
+        """
+        self.cacheFile: str = cacheFile
+        self.maxLevels: int = maxLevels
+        # Schema is created on first use, not on every query
+        self.schemaReady: bool = False
+
+    def _open(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
+        (conn, cursor) = utils.openDatabase(self.cacheFile)
+        if not self.schemaReady:
+            try:
+                self._createSchema(cursor)
+            except sqlite3.Error:
+                utils.closeDatabase(conn)
+                raise
+            self.schemaReady = True
+        return (conn, cursor)
+
+    def _createSchema(self, cursor: sqlite3.Cursor) -> None:
+        columns = [row[1] for row in cursor.execute("pragma table_info(level_cache)")]
+        if columns and "hard" not in columns:
+            # Cache of an older version, levels are generated again
+            cursor.execute("drop table level_cache")
+            logger.info("Dropped level cache of older version")
+        cursor.execute('''CREATE TABLE IF NOT EXISTS level_cache (
+            level integer,
+            hard integer,
+            algorithm text,
+            rows integer,
+            columns integer,
+            braid real,
+            maze blob,
+            player_row integer,
+            player_column integer,
+            goal_row integer,
+            goal_column integer,
+            shortest_path text,
+            shortest_path_moves integer,
+            random_state blob,
+            last_used integer,
+            primary key (level, hard, algorithm, rows, columns, braid)
+        )''')
+
+    def get(self, level: int, algorithm: str, rows: int = MAZE_ROWS, columns: int = MAZE_COLS,
+            braid: float = MAZE_BRAID, hard: bool = False) -> Optional[Level]:
+        """Get a cached level and mark it used.
+
+        Args:
+            level: Level id
+            algorithm: Algorithm key of the level
+            rows: Number of maze rows
+            columns: Number of maze columns
+            braid: Braiding factor
+            hard: Whether the level is in hard mode
+
+        Returns:
+            Cached Level or None if not cached
+        """
+        key = (level, int(hard), algorithm, rows, columns, braid)
+        (conn, cursor) = self._open()
+        try:
+            cursor.execute(
+                "select * from level_cache where level=? and hard=? and algorithm=? "
+                "and rows=? and columns=? and braid=?", key
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute(
+                f"update level_cache set last_used={NEXT_USE} where level=? and hard=? "
+                "and algorithm=? and rows=? and columns=? and braid=?", key
+            )
+            conn.commit()
+            cached = levelFromRecord(row)
+            cached.randomState = unpackRandomState(row["random_state"])
+            return cached
+        finally:
+            utils.closeDatabase(conn)
+
+    def put(self, level: Level) -> None:
+        """Add a level to the cache and evict least recently used levels.
+
+        Args:
+            level: Generated level
+        """
+        self.putMany([level])
+
+    def putMany(self, levels: Iterable[Level]) -> None:
+        """Add levels to the cache in one transaction and evict least recently used levels.
+
+        Args:
+            levels: Generated levels, later levels are more recently used
+        """
+        records = []
+        for level in levels:
+            record = levelToRecord(level)
+            record["random_state"] = packRandomState(level.randomState)
+            records.append(record)
+        self.putRecords(records)
+
+    def putRecords(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Add stored levels to the cache in one transaction and evict least recently used levels.
+
+        Args:
+            records: Level records created by levelToRecord, with random_state
+                packed by packRandomState. Later records are more recently used.
+        """
+        insert = "insert or replace into level_cache (%s,last_used) values (%s,%s)" % (
+            ",".join(CACHE_COLUMNS), ",".join("?" * len(CACHE_COLUMNS)), NEXT_USE)
+        (conn, cursor) = self._open()
+        try:
+            for record in records:
+                cursor.execute(insert, tuple(record[column] for column in CACHE_COLUMNS))
+            cursor.execute(
+                "delete from level_cache where rowid in (select rowid from level_cache "
+                "order by last_used desc limit -1 offset ?)", (self.maxLevels,)
+            )
+            conn.commit()
+        finally:
+            utils.closeDatabase(conn)
+
+    def __len__(self) -> int:
+        """Return number of cached levels.
+
+        Returns:
+            Number of cached levels
+        """
+        (conn, cursor) = self._open()
+        try:
+            cursor.execute("select count(*) from level_cache")
+            return cursor.fetchone()[0]
+        finally:
+            utils.closeDatabase(conn)
+
+
+def getLevel(level: int, rows: int = MAZE_ROWS, columns: int = MAZE_COLS,
+             braid: float = MAZE_BRAID, cache: Optional[LevelCache] = None,
+             hard: bool = False) -> Level:
+    """Get a level from cache or generate and cache it.
+
+    Random generator is left in the same state as after generating the
+    level, also when the level comes from the cache.
+
+    Args:
+        level: Level id
+        rows: Number of maze rows
+        columns: Number of maze columns
+        braid: Braiding factor
+        cache: Level cache (default: cache in getCacheFile(), if any)
+        hard: Place player and goal at the ends of the longest path
+
+    Returns:
+        Level
+    """
+    if cache is None:
+        cacheFile = getCacheFile()
+        if cacheFile is None:
+            return generateLevel(level, rows, columns, braid, hard)
+        cache = _defaultCaches.get(cacheFile)
+        if cache is None:
+            cache = LevelCache(cacheFile, getCacheSize())
+            _defaultCaches[cacheFile] = cache
+
+    algorithm = levelAlgorithm(level)
+    try:
+        cached = cache.get(level, algorithm, rows, columns, braid, hard)
+    except sqlite3.Error as e:
+        logger.error(f"Error reading level cache: {e}")
+        cached = None
+    if cached is not None:
+        random.setstate(cached.randomState)
+        logger.debug(f"Level {level} from cache")
+        return cached
+
+    generated = generateLevel(level, rows, columns, braid, hard)
+    try:
+        cache.put(generated)
+    except sqlite3.Error as e:
+        logger.error(f"Error writing level cache: {e}")
+    return generated
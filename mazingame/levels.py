@@ -0,0 +1,229 @@
+"""Level generation for MazinGame.
+
+A level is the random seed that creates the maze, the player starting
+location and the goal. This module creates levels exactly the same way
+the game does, so that levels can also be created outside of the game.
+
+The MIT License (MIT)
+
+Copyright (c) 2015,2026 Sami Salkosuo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from .gameclasses import GameGrid, MazingCell
+from .globals import MAZE_BRAID, MAZE_COLS, MAZE_ROWS
+from .mazepy import mazepy
+
+logger = logging.getLogger(__name__)
+
+
+class Level:
+    """A generated level: maze, player start, goal and shortest path."""
+
+    def __init__(self, level: int, grid: mazepy.Grid, playerRow: int, playerColumn: int,
+                 goalRow: int, goalColumn: int, hard: bool = False) -> None:
+        """Initialize a level.
+
+        Args:
+            level: Level id, the random seed of the maze
+            grid: Maze grid
+            playerRow: Player starting row
+            playerColumn: Player starting column
+            goalRow: Goal row
+            goalColumn: Goal column
+            hard: Whether player and goal are at the ends of the longest path
+        """
+        self.level: int = level
+        self.hard: bool = hard
+        self.grid: mazepy.Grid = grid
+        self.playerRow: int = playerRow
+        self.playerColumn: int = playerColumn
+        self.goalRow: int = goalRow
+        self.goalColumn: int = goalColumn
+        self.shortestPath: Any = None
+        self.shortestPathLength: int = 0
+        # Seconds spent in each generation phase
+        self.timings: Dict[str, float] = {}
+        # State of random generator after the level was generated
+        self.randomState: Any = None
+
+    def solve(self) -> None:
+        """Find the shortest path from player start to goal."""
+        start = self.grid.getCell(self.playerRow, self.playerColumn)
+        goal = self.grid.getCell(self.goalRow, self.goalColumn)
+        (self.shortestPath, self.shortestPathLength) = mazepy.solve(self.grid, start, goal)
+
+    def pathCells(self) -> List[Tuple[int, int]]:
+        """Get the shortest path as (row, column) tuples from player to goal.
+
+        Returns:
+            List of (row, column) tuples
+        """
+        cells = sorted(self.shortestPath.getCells(), key=self.shortestPath.getDistanceTo)
+        return [(cell.row, cell.column) for cell in cells]
+
+    def setPathCells(self, pathCells: List[Tuple[int, int]]) -> None:
+        """Set the shortest path from (row, column) tuples, player first.
+
+        Args:
+            pathCells: List of (row, column) tuples
+        """
+        start = self.grid.getCell(self.playerRow, self.playerColumn)
+        path = mazepy.Distances(start)
+        for distance, (row, column) in enumerate(pathCells):
+            path.setDistanceTo(self.grid.getCell(row, column), distance)
+        self.shortestPath = path
+        self.shortestPathLength = len(pathCells) - 1
+
+    def __str__(self) -> str:
+        """Return string representation of level.
+
+        Returns:
+            String with level id, algorithm and locations
+        """
+        return (f"Level {self.level}{' hard' if self.hard else ''} ({self.grid.algorithm_key}): "
+                f"player [{self.playerRow},{self.playerColumn}], "
+                f"goal [{self.goalRow},{self.goalColumn}], "
+                f"shortest path {self.shortestPathLength}")
+
+
+def generateLevel(level: int, rows: int = MAZE_ROWS, columns: int = MAZE_COLS,
+                  braid: float = MAZE_BRAID, hard: bool = False) -> Level:
+    """Generate a level the same way the game does.
+
+    Seeds the global random generator with the level, so the same level
+    always gives the same maze, start and goal.
+
+    Args:
+        level: Level id, used as random seed
+        rows: Number of maze rows
+        columns: Number of maze columns
+        braid: Braiding factor (0.0-1.0)
+        hard: Place player and goal at the ends of the longest path
+            instead of random locations. Maze is the same as in normal mode.
+
+    Returns:
+        Generated Level with shortest path solved
+    """
+    random.seed(level)
+    started = time.perf_counter()
+    # Do it always right after setting random seed, to get same maze when using
+    # same seed
+    grid = GameGrid(rows, columns, MazingCell)
+    algorithm = random.choice(mazepy.randomAlgorithmKeys())
+    grid = mazepy.initMaze(grid, algorithm)
+    generated = time.perf_counter()
+    grid.doBraid(braid)
+    braided = time.perf_counter()
+
+    playerRow = rows - 1
+    playerColumn = random.randint(0, columns - 1)
+    goalRow = random.randint(0, rows // 2)
+    goalColumn = random.randint(0, columns - 1)
+    randomState = random.getstate()
+    if hard:
+        (start, goal, _) = grid.longestPath()
+        # Player starts from the lower end, as in normal mode
+        if start.row < goal.row:
+            (start, goal) = (goal, start)
+        (playerRow, playerColumn, goalRow, goalColumn) = (start.row, start.column,
+                                                          goal.row, goal.column)
+    result = Level(level, grid, playerRow, playerColumn, goalRow, goalColumn, hard)
+    result.randomState = randomState
+    result.solve()
+    solved = time.perf_counter()
+
+    result.timings = {
+        "generate": generated - started,
+        "braid": braided - generated,
+        "solve": solved - braided,
+    }
+    logger.debug(f"Generated {result}")
+    return result
+
+
+def levelAlgorithm(level: int) -> str:
+    """Get the maze algorithm of a level without generating the maze.
+
+    Note that this seeds the global random generator with the level.
+
+    Args:
+        level: Level id
+
+    Returns:
+        Algorithm key
+    """
+    random.seed(level)
+    return random.choice(mazepy.randomAlgorithmKeys())
+
+
+def levelToRecord(level: Level) -> Dict[str, Any]:
+    """Convert a level to a dictionary of plain values for storing.
+
+    Args:
+        level: Level to convert
+
+    Returns:
+        Dictionary with level data
+    """
+    grid = level.grid
+    return {
+        "level": level.level,
+        "hard": int(level.hard),
+        "rows": grid.rows,
+        "columns": grid.columns,
+        "braid": grid.braid,
+        "algorithm": grid.algorithm_key,
+        "maze": grid.toBytes(),
+        "player_row": level.playerRow,
+        "player_column": level.playerColumn,
+        "goal_row": level.goalRow,
+        "goal_column": level.goalColumn,
+        "shortest_path": json.dumps(level.pathCells()),
+        "shortest_path_moves": level.shortestPathLength,
+    }
+
+
+def levelFromRecord(record: Any) -> Level:
+    """Create a level from a stored dictionary or database row.
+
+    Args:
+        record: Mapping with the keys created by levelToRecord
+
+    Returns:
+        Level with grid and shortest path restored
+    """
+    maze = record["maze"]
+    if isinstance(maze, str):
+        # Stored before binary format
+        grid = mazepy.initMazeFromJSON(maze, MazingCell, GameGrid)
+    else:
+        grid = mazepy.initMazeFromBytes(maze, MazingCell, GameGrid)
+    hard = bool(record["hard"]) if "hard" in record.keys() else False
+    level = Level(record["level"], grid, record["player_row"], record["player_column"],
+                  record["goal_row"], record["goal_column"], hard)
+    level.setPathCells([tuple(cell) for cell in json.loads(record["shortest_path"])])
+    return level
@@ -13,17 +13,39 @@ Supported algorithms:
 - Wilson (W)
 - Hunt and Kill (HK)
 - Sidewinder (S)
+- Kruskal (K)
+- Prim (P)
+- Eller (E)
 
 Classes:
     Cell: Basic cell in a maze with links to neighbors
+    SlottedCell: Memory efficient cell that keeps links in a bitmask
     Distances: Tracks distances from a root cell to all other cells
+    ArrayDistances: Distances stored in a flat integer array
+    DistanceOracle: Fast distance queries from precomputed distances
     Grid: Represents the maze grid structure
     DistanceGrid: Grid subclass that displays distances
+    CellView: Lightweight cell view into a CompactGrid
+    CompactGrid: Grid that stores links as a flat bitmask array
+    WindowGrid: Window of rows of an endless maze generated row by row
+    ChunkedGrid: Very large grid of chunks generated on demand
 
 Functions:
     initMaze: Initialize a maze with a specific algorithm
     initMazeFromJSON: Reconstruct a maze from JSON representation
+    initMazeFromJSONStream: Reconstruct a maze from a JSON file in chunks
+    initMazeFromBytes: Reconstruct a maze from binary representation
+    initMazeFromMasks: Build a maze from an array of link bitmasks
+    initBinaryTreeMasks: Vectorized Binary Tree maze as bitmasks (NumPy)
+    initSidewinderMasks: Vectorized Sidewinder maze as bitmasks (NumPy)
     getRandomMaze: Generate a maze with a random algorithm
+    ellerRows: Generate maze rows with Eller's algorithm, without end
+    binaryTreeRows: Generate maze rows with Binary Tree algorithm
+    sidewinderRows: Generate maze rows with Sidewinder algorithm
+    climbableRows: Link each run of generated rows to the next row
+    initStreamingMaze: Window to an endless maze of a row-local algorithm
+    registerAlgorithm: Register a maze generation algorithm
+    solve: Find a shortest path between two cells
 """
 
 # The MIT License (MIT)
@@ -56,62 +78,93 @@ VERSION=__version__
 COPYRIGHT="(C) 2016 Sami Salkosuo"
 
 
+import os
 import random
 import json
 import logging
+import shutil
+import tempfile
+import heapq
+import struct
+import zlib
+import itertools
+from array import array
+from collections import OrderedDict, deque
 from typing import Optional, List, Dict, Any, Iterator, Type
 
+try:
+    import numpy
+except ImportError:
+    #NumPy is optional, only vectorized generators need it
+    numpy = None
+
 logger = logging.getLogger(__name__)
 
-#maze algorithms
+#maze algorithms, filled by registerAlgorithm() calls at the end of module
+#key -> MazeAlgorithm
+MAZE_REGISTRY=dict()
+#key -> name
 MAZE_ALGORITHMS=dict()
-MAZE_ALGORITHMS["AB"]="Aldous Broder"
-MAZE_ALGORITHMS["BT"]="Binary Tree"
-MAZE_ALGORITHMS["HK"]="Hunt And Kill"
-MAZE_ALGORITHMS["RB"]="Recursive Backtracker"
-MAZE_ALGORITHMS["S"]="Sidewinder"
-MAZE_ALGORITHMS["W"]="Wilson"
-
 MAZE_ALGORITHMS_DESC=[]
-for a in MAZE_ALGORITHMS.keys():
-    MAZE_ALGORITHMS_DESC.append("%s=%s" % (a,MAZE_ALGORITHMS[a]))
+
+#link bits used by bitmask based cells and grids
+#bit for direction d (0=north,1=east,2=south,3=west) is 1<<d
+LINK_NORTH=1
+LINK_EAST=2
+LINK_SOUTH=4
+LINK_WEST=8
+LINK_OPPOSITE={LINK_NORTH:LINK_SOUTH,LINK_EAST:LINK_WEST,LINK_SOUTH:LINK_NORTH,LINK_WEST:LINK_EAST}
+#number of links for each 4-bit mask
+LINK_COUNT=bytes(bin(m).count("1") for m in range(16))
+#translation table that keeps only link bits of a byte
+LINK_MASK_ONLY=bytes(b & 15 for b in range(256))
+#translation tables for rows of link bits: swap north and south links,
+#and drop north or south links
+_FLIP_NORTH_SOUTH=bytes((b & ~(LINK_NORTH|LINK_SOUTH)) | (LINK_SOUTH if b & LINK_NORTH else 0)
+                        | (LINK_NORTH if b & LINK_SOUTH else 0) for b in range(256))
+_NO_NORTH=bytes(b & ~LINK_NORTH for b in range(256))
+_NO_SOUTH=bytes(b & ~LINK_SOUTH for b in range(256))
+
+#box drawing characters for wall junctions, indexed by the walls that
+#meet at the junction
+BOX_UP=1
+BOX_RIGHT=2
+BOX_DOWN=4
+BOX_LEFT=8
+BOX_JUNCTIONS=" ╵╶└╷│┌├╴┘─┴┐┤┬┼"
+
+#image colors, palette index constants are used in scanlines
+IMAGE_FLOOR=0
+IMAGE_WALL=1
+IMAGE_PATH=2
+IMAGE_PALETTE=[(255,255,255),(0,0,0),(220,40,40)]
+
+#mazepy binary format: header, algorithm key and 4-bit link masks
+#header is magic, version, flags, rows, columns, braid and key length
+MAZE_BYTES_MAGIC=b"MZPB"
+MAZE_BYTES_VERSION=1
+MAZE_BYTES_HEADER=struct.Struct("<4sBBIIdB")
+#flag: link masks are zlib-compressed
+MAZE_BYTES_COMPRESSED=1
+#unpacked link masks of both nibbles for each byte
+_NIBBLE_PAIRS=[bytes((b & 15, b >> 4)) for b in range(256)]
+#one LINK_* bit of each mask as 0 or 1, for bytes.translate
+_LINK_BIT={bit:bytes(1 if m & bit else 0 for m in range(256))
+           for bit in (LINK_NORTH,LINK_EAST,LINK_SOUTH,LINK_WEST)}
 
 
 #====================
 #Maze classes
 
-class Cell:
-    """Basic cell class for mazes.
-    
-    Represents a single cell in a maze grid with links to neighboring cells.
-    Cells can be linked (connected) to their neighbors to form passages.
-    
-    Attributes:
-        row: Row position in the grid
-        column: Column position in the grid
-        north: Reference to northern neighbor cell
-        east: Reference to eastern neighbor cell
-        south: Reference to southern neighbor cell
-        west: Reference to western neighbor cell
-        links: Dictionary of linked (connected) neighbor cells
-        content: Display content for the cell
+class BaseCell:
+    """Cell methods shared by all cell classes.
+
+    Subclasses store the links and implement link, unlink, getLinks and
+    linked. BaseCell has no instance attributes, so subclasses that use
+    __slots__ have no per instance dictionary.
     """
 
-    def __init__(self, row: int, column: int) -> None:
-        """Initialize a cell at the given position.
-        
-        Args:
-            row: Row position in the grid
-            column: Column position in the grid
-        """
-        self.row=row
-        self.column=column
-        self.north=None
-        self.east=None
-        self.south=None
-        self.west=None
-        self.links=dict()
-        self.content="   "
+    __slots__=()
 
     def setContent(self, content: str) -> None:
         if content==None or len(content)==0:
@@ -128,28 +181,6 @@ class Cell:
     def getContent(self) -> str:
         return self.content
 
-    def link(self, cell: 'Cell', bidi: bool = True) -> 'Cell':
-        self.links[cell] = True
-        if bidi==True:
-            cell.link(self,False)
-        return self
-
-    def unlink(self, cell: 'Cell', bidi: bool = True) -> 'Cell':
-        try:
-            del self.links[cell]
-        except KeyError:
-            pass
-        if bidi==True:
-            cell.unlink(self, False)
-        return self
-
-    def getLinks(self) -> Any:
-        return self.links.keys()
-    
-    def linked(self, cell: Optional['Cell']) -> bool:
-        #return self.links.has_key(cell)
-        return cell in self.links
-
     def neighbors(self) -> List['Cell']:
         neighborsList = []
         if self.north:
@@ -202,6 +233,19 @@ class Cell:
 
         return False
 
+    def linkMask(self) -> int:
+        #LINK_* bits of linked neighbors
+        mask=0
+        if self.linked(self.north):
+            mask=mask|LINK_NORTH
+        if self.linked(self.east):
+            mask=mask|LINK_EAST
+        if self.linked(self.south):
+            mask=mask|LINK_SOUTH
+        if self.linked(self.west):
+            mask=mask|LINK_WEST
+        return mask
+
     #return Distances from this cell to all other cells
     def getDistances(self) -> 'Distances':
         distances=Distances(self)
@@ -283,6 +327,147 @@ class Cell:
 
         return output
 
+class Cell(BaseCell):
+    """Basic cell class for mazes.
+    
+    Represents a single cell in a maze grid with links to neighboring cells.
+    Cells can be linked (connected) to their neighbors to form passages.
+    
+    Attributes:
+        row: Row position in the grid
+        column: Column position in the grid
+        north: Reference to northern neighbor cell
+        east: Reference to eastern neighbor cell
+        south: Reference to southern neighbor cell
+        west: Reference to western neighbor cell
+        links: Dictionary of linked (connected) neighbor cells
+        content: Display content for the cell
+    """
+
+    def __init__(self, row: int, column: int) -> None:
+        """Initialize a cell at the given position.
+        
+        Args:
+            row: Row position in the grid
+            column: Column position in the grid
+        """
+        self.row=row
+        self.column=column
+        self.north=None
+        self.east=None
+        self.south=None
+        self.west=None
+        self.links=dict()
+        self.content="   "
+
+    def link(self, cell: 'Cell', bidi: bool = True) -> 'Cell':
+        self.links[cell] = True
+        if bidi==True:
+            cell.link(self,False)
+        return self
+
+    def unlink(self, cell: 'Cell', bidi: bool = True) -> 'Cell':
+        try:
+            del self.links[cell]
+        except KeyError:
+            pass
+        if bidi==True:
+            cell.unlink(self, False)
+        return self
+
+    def getLinks(self) -> Any:
+        return self.links.keys()
+    
+    def linked(self, cell: Optional['Cell']) -> bool:
+        #return self.links.has_key(cell)
+        return cell in self.links
+
+class SlottedCell(BaseCell):
+    """Memory efficient cell that keeps its links in a 4-bit mask.
+
+    Uses __slots__ instead of a per instance dictionary and stores links as
+    LINK_* bits instead of a dictionary keyed by neighbor cells. Only
+    adjacent cells can be linked. getLinks returns cells in north, east,
+    south, west order.
+
+    Attributes:
+        mask: LINK_* bits of linked neighbors
+    """
+
+    __slots__=("row","column","north","east","south","west","mask","content")
+
+    def __init__(self, row: int, column: int) -> None:
+        """Initialize a cell at the given position.
+
+        Args:
+            row: Row position in the grid
+            column: Column position in the grid
+        """
+        self.row=row
+        self.column=column
+        self.north=None
+        self.east=None
+        self.south=None
+        self.west=None
+        self.mask=0
+        self.content="   "
+
+    def linkBit(self, cell: Optional[Cell]) -> int:
+        """Get the link bit pointing from this cell to given cell.
+
+        Args:
+            cell: Neighbor cell
+
+        Returns:
+            One of the LINK_* bits or 0 if cell is not a neighbor
+        """
+        if cell is None:
+            return 0
+        if cell is self.north:
+            return LINK_NORTH
+        if cell is self.east:
+            return LINK_EAST
+        if cell is self.south:
+            return LINK_SOUTH
+        if cell is self.west:
+            return LINK_WEST
+        return 0
+
+    def link(self, cell: Cell, bidi: bool = True) -> 'SlottedCell':
+        bit=self.linkBit(cell)
+        if bit==0:
+            raise ValueError("Cell %s is not adjacent to %s" % (cell,self))
+        self.mask|=bit
+        if bidi==True:
+            cell.link(self,False)
+        return self
+
+    def unlink(self, cell: Cell, bidi: bool = True) -> 'SlottedCell':
+        bit=self.linkBit(cell)
+        self.mask&=~bit
+        if bidi==True and bit!=0:
+            cell.unlink(self,False)
+        return self
+
+    def getLinks(self) -> List[Cell]:
+        mask=self.mask
+        links=[]
+        if mask & LINK_NORTH:
+            links.append(self.north)
+        if mask & LINK_EAST:
+            links.append(self.east)
+        if mask & LINK_SOUTH:
+            links.append(self.south)
+        if mask & LINK_WEST:
+            links.append(self.west)
+        return links
+
+    def linked(self, cell: Optional[Cell]) -> bool:
+        return (self.mask & self.linkBit(cell))!=0
+
+    def linkMask(self) -> int:
+        return self.mask
+
 class Distances:
     """Tracks distances from a root cell to all other cells in a maze.
     
@@ -324,7 +509,8 @@ class Distances:
         breadcrumbs = Distances(self.rootCell)
         breadcrumbs.setDistanceTo(current,self.cells[current])
 
-        while current is not self.rootCell:
+        #compare with != so that cell views (that are not identical) work too
+        while current != self.rootCell:
             for neighbor in current.getLinks():
                 if self.cells[neighbor] < self.cells[current]:
                     breadcrumbs.setDistanceTo(neighbor,self.cells[neighbor])
@@ -332,6 +518,141 @@ class Distances:
                     break
         return breadcrumbs
 
+class ArrayDistances:
+    """Distances from a root cell stored in a flat integer array.
+
+    Distances are indexed by row*columns+column, -1 marks cells without
+    a distance. Has the same interface as Distances and bulk accessors
+    for maze statistics.
+
+    Attributes:
+        grid: The grid of the cells
+        rootCell: The starting cell for distance calculations
+        distances: array('i') of distances, indexed by cell index
+    """
+
+    def __init__(self, grid: 'Grid', rootCell: Cell, distances: Optional[array] = None) -> None:
+        """Initialize distances from a root cell.
+
+        Args:
+            grid: The grid of the cells
+            rootCell: The starting cell for distance calculations
+            distances: Precomputed distance array (default: only root cell)
+        """
+        self.grid=grid
+        self.columns=grid.columns
+        self.rootCell=rootCell
+        if distances is None:
+            distances=array("i",[-1])*(grid.rows*grid.columns)
+            distances[self.index(rootCell)]=0
+        self.distances=distances
+        self.count=len(distances)-distances.count(-1)
+
+    def index(self, cell: Cell) -> int:
+        return cell.row*self.columns+cell.column
+
+    def getDistanceTo(self, cell: Cell) -> Optional[int]:
+        distance=self.distances[cell.row*self.columns+cell.column]
+        return distance if distance>=0 else None
+
+    def setDistanceTo(self, cell: Cell, distance: int) -> None:
+        index=cell.row*self.columns+cell.column
+        if self.distances[index]<0:
+            self.count=self.count+1
+        self.distances[index]=distance
+
+    def getCells(self) -> Iterator[Cell]:
+        columns=self.columns
+        for index,distance in enumerate(self.distances):
+            if distance>=0:
+                yield self.grid.getCell(index // columns, index % columns)
+
+    def isPartOfPath(self, cell: Cell) -> bool:
+        return self.distances[cell.row*self.columns+cell.column]>=0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def pathTo(self, goal: Cell) -> 'ArrayDistances':
+        """Get the path from root cell to goal along decreasing distances.
+
+        Args:
+            goal: Goal cell
+
+        Returns:
+            ArrayDistances with the cells of the path
+
+        Raises:
+            ValueError: If goal has no distance or there is no path back to root
+        """
+        distances=self.distances
+        breadcrumbs=ArrayDistances(self.grid,self.rootCell)
+        current=goal
+        distance=distances[self.index(current)]
+        if distance<0:
+            raise ValueError("No distance to %s" % goal.toString())
+        breadcrumbs.setDistanceTo(current,distance)
+        while current != self.rootCell:
+            for neighbor in current.getLinks():
+                neighborDistance=distances[self.index(neighbor)]
+                #cells without a distance are -1, they are not on the path
+                if 0<=neighborDistance<distance:
+                    breadcrumbs.setDistanceTo(neighbor,neighborDistance)
+                    current=neighbor
+                    distance=neighborDistance
+                    break
+            else:
+                raise ValueError("No path from %s to root" % goal.toString())
+        return breadcrumbs
+
+    def maxDistance(self) -> int:
+        """Get the largest distance, -1 if there are no distances."""
+        return max(self.distances) if len(self.distances)>0 else -1
+
+    def histogram(self) -> List[int]:
+        """Get the number of cells at each distance.
+
+        Returns:
+            List where item d is the number of cells at distance d
+        """
+        if numpy is not None:
+            values=numpy.frombuffer(self.distances,dtype=numpy.int32)
+            return numpy.bincount(values[values>=0]).tolist()
+        counts=[0]*(self.maxDistance()+1)
+        for distance in self.distances:
+            if distance>=0:
+                counts[distance]=counts[distance]+1
+        return counts
+
+    def farthestCell(self) -> Optional[Cell]:
+        """Get the first cell, in row order, at the largest distance."""
+        maxDistance=self.maxDistance()
+        if maxDistance<0:
+            return None
+        index=self.distances.index(maxDistance)
+        return self.grid.getCell(index // self.columns, index % self.columns)
+
+def _maskDistances(masks: bytearray, rows: int, columns: int, rootIndex: int) -> array:
+    #breadth first search over cell indices using link bits
+    distances=array("i",[-1])*(rows*columns)
+    distances[rootIndex]=0
+    offsets=((LINK_NORTH,-columns),(LINK_EAST,1),(LINK_SOUTH,columns),(LINK_WEST,-1))
+    frontier=[rootIndex]
+    dist=0
+    while len(frontier)>0:
+        dist=dist+1
+        newFrontier=[]
+        for index in frontier:
+            mask=masks[index]
+            for bit,offset in offsets:
+                if mask & bit:
+                    linked=index+offset
+                    if distances[linked]<0:
+                        distances[linked]=dist
+                        newFrontier.append(linked)
+        frontier=newFrontier
+    return distances
+
 class Grid:
     """Represents a maze grid structure.
     
@@ -346,6 +667,7 @@ class Grid:
         algorithm: Name of the algorithm used to generate the maze
         algorithm_key: Short key for the algorithm
         braid: Braiding factor (0.0-1.0) for removing dead ends
+        deadEnds: Set of dead end cell indices, None until first needed
     """
 
     def __init__(self, rows: int, columns: int, cellClass: Type[Cell] = Cell) -> None:
@@ -365,6 +687,7 @@ class Grid:
         self.algorithm_key=None
         self.algorithm=None        
         self.braid=-1.0#no braiding
+        self.deadEnds=None
     
     def prepareGrid(self) -> List[List[Cell]]:
         rowList=[]
@@ -419,26 +742,176 @@ class Grid:
     def contentsOf(self, cell: Cell) -> str:
         return "   "
 
+    def getDistances(self, rootCell: Cell) -> ArrayDistances:
+        """Get distances from a cell to all cells reachable from it.
+
+        Args:
+            rootCell: The starting cell
+
+        Returns:
+            ArrayDistances from rootCell
+        """
+        distances=_maskDistances(self.linkMasks(),self.rows,self.columns,
+                                 rootCell.row*self.columns+rootCell.column)
+        return ArrayDistances(self,rootCell,distances)
+
+    def longestPath(self) -> Any:
+        """Find the longest shortest path (diameter) of the maze.
+
+        Uses two breadth first searches: the farthest cell from any cell is
+        one end of the longest path, and the farthest cell from that is the
+        other end. Exact on perfect mazes, on braided mazes a long path but
+        not always the longest.
+
+        Returns:
+            Tuple of (start cell, goal cell, length)
+        """
+        first=self.getDistances(self.getCell(0,0)).farthestCell()
+        distances=self.getDistances(first)
+        last=distances.farthestCell()
+        return (first,last,distances.getDistanceTo(last))
+
+    def deadEndIndex(self) -> set:
+        """Get indices of dead end cells, building the index if needed.
+
+        The index is kept up to date by Grid.link and Grid.unlink. Links
+        made directly with Cell.link are not seen, call invalidateDeadEnds
+        after them.
+
+        Returns:
+            Set of row*columns+column indices of cells with one link
+        """
+        if self.deadEnds is None:
+            self.deadEnds={i for i,mask in enumerate(self.linkMasks()) if LINK_COUNT[mask]==1}
+        return self.deadEnds
+
+    def invalidateDeadEnds(self) -> None:
+        #rebuilt on next use
+        self.deadEnds=None
+
+    def _updateDeadEnd(self, cell: Cell) -> None:
+        index=cell.row*self.columns+cell.column
+        if LINK_COUNT[cell.linkMask()]==1:
+            self.deadEnds.add(index)
+        else:
+            self.deadEnds.discard(index)
+
+    def link(self, cell: Cell, other: Cell) -> None:
+        """Link two cells and update the dead end index.
+
+        Args:
+            cell: First cell
+            other: Cell to link to
+        """
+        cell.link(other)
+        if self.deadEnds is not None:
+            self._updateDeadEnd(cell)
+            self._updateDeadEnd(other)
+
+    def unlink(self, cell: Cell, other: Cell) -> None:
+        """Unlink two cells and update the dead end index.
+
+        Args:
+            cell: First cell
+            other: Cell to unlink from
+        """
+        cell.unlink(other)
+        if self.deadEnds is not None:
+            self._updateDeadEnd(cell)
+            self._updateDeadEnd(other)
+
     def getDeadEndCells(self) -> List[Cell]:
-        deadends=[]
+        columns=self.columns
+        return [self.getCell(i // columns, i % columns) for i in sorted(self.deadEndIndex())]
 
-        for cell in self.eachCell():
-            if len(cell.getLinks())==1:
-                deadends.append(cell)
-        return deadends
+    def doBraid(self, p: float = 1.0, preferDeadEnds: bool = False) -> None:
+        """Remove dead ends by linking them to a neighbor.
 
-    def doBraid(self, p: float = 1.0) -> None:
+        Each dead end is braided with probability p, in row order. Time
+        depends on the number of dead ends, not on the size of the grid,
+        once the dead end index exists.
+
+        Args:
+            p: Probability to braid a dead end (0.0-1.0)
+            preferDeadEnds: Link to a neighbor that is also a dead end
+                when there is one, which removes two dead ends at once.
+                Default links to any unlinked neighbor, as earlier
+                versions did, so that same seed gives same maze.
+        """
         self.braid=p
-        for cell in self.getDeadEndCells():
-            if len(cell.getLinks())!=1 or random.random()>p:
+        deadEnds=self.deadEndIndex()
+        columns=self.columns
+        for index in sorted(deadEnds):
+            #may have been linked by an earlier dead end
+            if index not in deadEnds or random.random()>p:
                 continue
-            
+
+            cell=self.getCell(index // columns, index % columns)
             neighbors=[n for n in cell.neighbors() if cell.linked(n) == False]
-            best=[n for n in neighbors if len(cell.getLinks())==1]
-            if len(best)==0:
-                best=neighbors
+            if len(neighbors)==0:
+                #only possible in a grid with one row or column
+                continue
+            best=neighbors
+            if preferDeadEnds==True:
+                best=[n for n in neighbors if n.row*columns+n.column in deadEnds]
+                if len(best)==0:
+                    best=neighbors
             neighbor=random.choice(best)
-            cell.link(neighbor)
+            self.link(cell,neighbor)
+
+    def linkMasks(self) -> bytearray:
+        """Get LINK_* bits of all cells.
+
+        Returns:
+            bytearray of link bits in row-major order
+        """
+        masks=bytearray(self.size())
+        for i,cell in enumerate(self.eachCell()):
+            masks[i]=cell.linkMask()
+        return masks
+
+    def toBytes(self, compress: bool = True) -> bytes:
+        """Get this grid in mazepy binary format.
+
+        The format is a header followed by 4-bit link masks, two cells per
+        byte. Cell contents are not included.
+
+        Args:
+            compress: Whether to zlib-compress the link masks, when it
+                makes them smaller
+
+        Returns:
+            Maze as bytes
+        """
+        masks=self.linkMasks()
+        if len(masks) % 2==1:
+            masks.append(0)
+        #first cell of a pair in low nibble
+        packed=bytes(low | (high << 4) for low,high in zip(masks[0::2],masks[1::2]))
+        flags=0
+        if compress==True:
+            #link masks of small mazes do not always compress
+            compressed=zlib.compress(packed)
+            if len(compressed)<len(packed):
+                packed=compressed
+                flags=flags|MAZE_BYTES_COMPRESSED
+        key=(self.algorithm_key or "").encode("utf-8")
+        header=MAZE_BYTES_HEADER.pack(MAZE_BYTES_MAGIC,MAZE_BYTES_VERSION,flags,
+                                      self.rows,self.columns,self.braid,len(key))
+        return header+key+packed
+
+    @classmethod
+    def fromBytes(cls, data: bytes, cellClass: Optional[Type[Cell]] = None) -> 'Grid':
+        """Create a grid of this class from mazepy binary format.
+
+        Args:
+            data: Maze as bytes, created by toBytes()
+            cellClass: Cell class to use (default: the grid class default)
+
+        Returns:
+            Grid object with the maze
+        """
+        return initMazeFromBytes(data,cellClass,cls)
 
     def toJSONString(self, prettyprint: bool = False) -> str:
         #get JSON string of this grid
@@ -460,51 +933,856 @@ class Grid:
             out=json.dumps(jsonObj)
         return out
 
+    def dumpJSON(self, fp: Any) -> None:
+        """Write this grid as JSON to a text file, one row at a time.
+
+        Output is the same as toJSONString() but the whole maze is never
+        held in memory as one string.
+
+        Args:
+            fp: Text file object to write to
+        """
+        jsonObj=dict()
+        jsonObj["algorithm"]=self.algorithm
+        jsonObj["algorithm_key"]=self.algorithm_key
+        jsonObj["rows"]=self.rows
+        jsonObj["columns"]=self.columns
+        jsonObj["braid"]=self.braid
+        #header without closing brace, cells follow
+        fp.write(json.dumps(jsonObj)[:-1])
+        fp.write(', "cells": [')
+        separator=""
+        for row in self.eachRow():
+            cells=[cell.toJSONString(False) for cell in row]
+            if cells:
+                fp.write(separator)
+                #encoded row without brackets
+                fp.write(json.dumps(cells)[1:-1])
+                separator=", "
+        fp.write("]}")
+
     def __str__(self) -> str:
         return self.asciiStr()
 
-    def unicodeStr(self) -> None:
-        pass
+    def unicodeStr(self) -> str:
+        """Get this grid drawn with Unicode box drawing characters."""
+        return "".join(self._unicodeLines())
 
     def asciiStr(self) -> str:
-        output = "+" + "---+" * self.columns + "\n"
-        for row in self.eachRow():
-            top = "|"
-            bottom = "+"
-            for cell in row:
-                if not cell:                
-                    cell=Cell(-1,-1)
-                body = "%s" % self.contentsOf(cell)
-                if cell.linked(cell.east):
-                    east_boundary=" "
-                else:
-                    east_boundary="|"
+        return "".join(self._asciiLines())
 
-                top = top + body + east_boundary
-                if cell.linked(cell.south):
-                    south_boundary="   "
-                else:
-                    south_boundary="---"
-                corner = "+"
-                bottom =bottom + south_boundary + corner
-            
-            output=output+top+"\n"
-            output=output+bottom+"\n"
-        return output
- 
-class DistanceGrid(Grid):
+    def writeAscii(self, fp: Any) -> None:
+        """Write this grid as ASCII text, same as asciiStr(), line by line.
 
-    #def __init__(self,rows,columns,cellClass=Cell):
-    #    super(Grid, self).__init__(rows,columns,cellClass)
+        Args:
+            fp: Text file object to write to
+        """
+        for line in self._asciiLines():
+            fp.write(line)
 
-    def contentsOf(self, cell: Cell) -> str:
+    def writeUnicode(self, fp: Any) -> None:
+        """Write this grid as Unicode text, same as unicodeStr(), line by line.
 
-        if  self.distances.getDistanceTo(cell) is not None and self.distances.getDistanceTo(cell) is not None:
-            n=self.distances.getDistanceTo(cell)
-            return "%03d" % n
+        Args:
+            fp: Text file object to write to
+        """
+        for line in self._unicodeLines():
+            fp.write(line)
+
+    def toImage(self, path: str, cellSize: int = 4, showPath: Any = None) -> None:
+        """Write this grid as PNG or PPM image.
+
+        Format is chosen from the file extension (.png, .ppm). Walls are
+        one pixel wide and each cell is cellSize pixels, so the image is
+        columns*cellSize+1 pixels wide and rows*cellSize+1 pixels high.
+
+        Args:
+            path: Image file path
+            cellSize: Cell size in pixels, including one wall (at least 2)
+            showPath: Distances of path cells to highlight, for example
+                from pathTo() or solve() (default: no path)
+
+        Raises:
+            ValueError: If file extension or cell size is not supported
+        """
+        extension=path.lower().rsplit(".",1)[-1]
+        if extension not in ("png","ppm"):
+            raise ValueError("Unsupported image format: %s" % path)
+        if cellSize<2:
+            raise ValueError("Cell size must be at least 2")
+        width=self.columns*cellSize+1
+        height=self.rows*cellSize+1
+        scanlines=self._imageScanlines(cellSize,showPath)
+        with open(path,"wb") as fp:
+            if extension=="png":
+                _writePNG(fp,width,height,IMAGE_PALETTE,scanlines)
+            else:
+                _writePPM(fp,width,height,IMAGE_PALETTE,scanlines)
+
+    def _imageScanlines(self, cellSize: int, showPath: Any) -> Iterator[bytes]:
+        #scanlines of palette indices, with NumPy when it is available
+        columns=self.columns
+        masks=self.linkMasks()
+        onPath=bytearray(self.size())
+        if showPath is not None:
+            for cell in showPath.getCells():
+                onPath[cell.row*columns+cell.column]=1
+        if numpy is not None:
+            image=_imageArray(masks,onPath,self.rows,columns,cellSize)
+            for line in image:
+                yield line.tobytes()
+            return
+
+        #built from per cell segments: a wall or passage pixel and
+        #cellSize-1 pixels of cell
+        inside=cellSize-1
+        pixel=[bytes([index]) for index in range(len(IMAGE_PALETTE))]
+        #segments[edge][fill]
+        segments=[[pixel[edge]+pixel[fill]*inside for fill in range(3)] for edge in range(3)]
+        wall=pixel[IMAGE_WALL]
+        border=wall*(columns*cellSize+1)
+        yield border
+        previousPath=None
+        for start in range(0,len(masks),columns):
+            rowMasks=masks[start:start+columns]
+            path=onPath[start:start+columns]
+            if previousPath is not None:
+                top=[]
+                for mask,here,above in zip(rowMasks,path,previousPath):
+                    if not mask & LINK_NORTH:
+                        top.append(segments[IMAGE_WALL][IMAGE_WALL])
+                    elif here and above:
+                        top.append(segments[IMAGE_WALL][IMAGE_PATH])
+                    else:
+                        top.append(segments[IMAGE_WALL][IMAGE_FLOOR])
+                top.append(wall)
+                yield b"".join(top)
+            body=[]
+            left=0
+            for mask,here in zip(rowMasks,path):
+                if not mask & LINK_WEST:
+                    edge=IMAGE_WALL
+                elif here and left:
+                    edge=IMAGE_PATH
+                else:
+                    edge=IMAGE_FLOOR
+                body.append(segments[edge][IMAGE_PATH if here else IMAGE_FLOOR])
+                left=here
+            body.append(wall)
+            line=b"".join(body)
+            for _ in range(inside):
+                yield line
+            previousPath=path
+        yield border
+
+    def _asciiLines(self) -> Iterator[str]:
+        yield "+" + "---+" * self.columns + "\n"
+        #contents are not looked up when the grid does not override them
+        defaultContents=type(self).contentsOf is Grid.contentsOf
+        for row in self.eachRow():
+            top = ["|"]
+            bottom = ["+"]
+            for cell in row:
+                mask=cell.linkMask()
+                if defaultContents:
+                    top.append("   ")
+                else:
+                    top.append("%s" % self.contentsOf(cell))
+                top.append(" " if mask & LINK_EAST else "|")
+                bottom.append("   +" if mask & LINK_SOUTH else "---+")
+            top.append("\n")
+            bottom.append("\n")
+            yield "".join(top)
+            yield "".join(bottom)
+
+    def _unicodeLines(self) -> Iterator[str]:
+        rows=self.rows
+        columns=self.columns
+        defaultContents=type(self).contentsOf is Grid.contentsOf
+        #walls between cells of previous row and this row, all for borders
+        above=[True]*columns
+        #walls east of cells of previous and this row, last is the border
+        previousEast=None
+        rowIterator=self.eachRow()
+        for line in range(rows+1):
+            row=next(rowIterator) if line<rows else None
+            if row is not None:
+                masks=[cell.linkMask() for cell in row]
+                east=[not mask & LINK_EAST for mask in masks]
+                east[-1]=True
+            else:
+                east=None
+            corners=[]
+            for column in range(columns+1):
+                junction=0
+                #west side border is a wall, as is east side border
+                if previousEast is not None and (column==0 or previousEast[column-1]):
+                    junction|=BOX_UP
+                if column<columns and above[column]:
+                    junction|=BOX_RIGHT
+                if east is not None and (column==0 or east[column-1]):
+                    junction|=BOX_DOWN
+                if column>0 and above[column-1]:
+                    junction|=BOX_LEFT
+                corners.append(BOX_JUNCTIONS[junction])
+                if column<columns:
+                    corners.append("───" if above[column] else "   ")
+            corners.append("\n")
+            yield "".join(corners)
+            if row is None:
+                break
+
+            body=["│"]
+            for column,cell in enumerate(row):
+                if defaultContents:
+                    body.append("   ")
+                else:
+                    body.append("%s" % self.contentsOf(cell))
+                body.append("│" if east[column] else " ")
+            body.append("\n")
+            yield "".join(body)
+            above=[True]*columns if line==rows-1 else [not mask & LINK_SOUTH for mask in masks]
+            previousEast=east
+
+class DistanceGrid(Grid):
+
+    #def __init__(self,rows,columns,cellClass=Cell):
+    #    super(Grid, self).__init__(rows,columns,cellClass)
+
+    def contentsOf(self, cell: Cell) -> str:
+
+        n=self.distances.getDistanceTo(cell)
+        if n is not None:
+            return "%03d" % n
         else:
             return "   " #super(Grid, self).contentsOf(cell)
 
+#====================
+#Compact grid
+
+class CellView(BaseCell):
+    """Lightweight view to a cell in a CompactGrid.
+
+    A view holds only the grid and the cell index. Link state lives in the
+    bitmask array of the grid, so views are created on demand and two views
+    of the same cell are equal but not identical.
+
+    Attributes:
+        grid: CompactGrid that owns the cell
+        index: Cell index in the grid (row*columns+column)
+    """
+
+    __slots__=("grid","index")
+
+    def __init__(self, grid: 'CompactGrid', index: int) -> None:
+        """Initialize a view to a cell.
+
+        Args:
+            grid: CompactGrid that owns the cell
+            index: Cell index in the grid
+        """
+        self.grid=grid
+        self.index=index
+
+    @property
+    def row(self) -> int:
+        return self.index // self.grid.columns
+
+    @property
+    def column(self) -> int:
+        return self.index % self.grid.columns
+
+    @property
+    def north(self) -> Optional['CellView']:
+        grid=self.grid
+        index=self.index-grid.columns
+        return grid.CellClass(grid,index) if index>=0 else None
+
+    @property
+    def east(self) -> Optional['CellView']:
+        grid=self.grid
+        index=self.index+1
+        return grid.CellClass(grid,index) if index % grid.columns!=0 else None
+
+    @property
+    def south(self) -> Optional['CellView']:
+        grid=self.grid
+        index=self.index+grid.columns
+        return grid.CellClass(grid,index) if index<len(grid.cells) else None
+
+    @property
+    def west(self) -> Optional['CellView']:
+        grid=self.grid
+        return grid.CellClass(grid,self.index-1) if self.index % grid.columns!=0 else None
+
+    @property
+    def content(self) -> str:
+        return self.grid.contents.get(self.index,"   ")
+
+    @content.setter
+    def content(self, content: str) -> None:
+        #only non-default contents are stored
+        if content=="   ":
+            self.grid.contents.pop(self.index,None)
+        else:
+            self.grid.contents[self.index]=content
+
+    def linkBit(self, cell: Optional[Cell]) -> int:
+        """Get the link bit pointing from this cell to given cell.
+
+        Args:
+            cell: Another cell view in the same grid
+
+        Returns:
+            One of the LINK_* bits or 0 if cell is not adjacent
+        """
+        if not isinstance(cell,CellView) or cell.grid is not self.grid:
+            return 0
+        columns=self.grid.columns
+        delta=cell.index-self.index
+        if delta==-columns:
+            return LINK_NORTH
+        if delta==columns:
+            return LINK_SOUTH
+        if delta==1 and cell.index % columns!=0:
+            return LINK_EAST
+        if delta==-1 and self.index % columns!=0:
+            return LINK_WEST
+        return 0
+
+    def link(self, cell: Cell, bidi: bool = True) -> 'CellView':
+        bit=self.linkBit(cell)
+        if bit==0:
+            raise ValueError("Cell %s is not adjacent to %s" % (cell,self))
+        self.grid.cells[self.index]|=bit
+        if bidi==True:
+            cell.link(self,False)
+        return self
+
+    def unlink(self, cell: Cell, bidi: bool = True) -> 'CellView':
+        bit=self.linkBit(cell)
+        self.grid.cells[self.index]&=~bit
+        if bidi==True and bit!=0:
+            cell.unlink(self,False)
+        return self
+
+    def getLinks(self) -> List['CellView']:
+        return self.grid.linkedCells(self.index)
+
+    def linked(self, cell: Optional[Cell]) -> bool:
+        bit=self.linkBit(cell)
+        return bit!=0 and (self.grid.cells[self.index] & bit)!=0
+
+    def linkMask(self) -> int:
+        return self.grid.cells[self.index] & 15
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other,CellView) and other.grid is self.grid and other.index==self.index
+
+    def __hash__(self) -> int:
+        return hash(self.index)
+
+    def __repr__(self) -> str:
+        return "CellView(%d,%d)" % (self.row,self.column)
+
+class CompactGrid(Grid):
+    """Grid that stores the maze as a flat bitmask array.
+
+    Each cell uses one byte of a bytearray whose low 4 bits are the LINK_*
+    bits of the cell. No per cell objects are kept: getCell, eachCell and
+    eachRow return CellView objects, so the rest of mazepy (algorithms,
+    braiding, JSON export) work with compact grids as they are.
+
+    Attributes:
+        cells: bytearray of link bits, indexed by row*columns+column
+        contents: Dictionary of non-default cell contents, keyed by index
+    """
+
+    def __init__(self, rows: int, columns: int, cellClass: Type[Cell] = CellView) -> None:
+        """Initialize a compact grid with the specified dimensions.
+
+        Args:
+            rows: Number of rows in the grid
+            columns: Number of columns in the grid
+            cellClass: CellView subclass to use for views. Other cell
+                classes are ignored, because cells are not stored.
+        """
+        if not (isinstance(cellClass,type) and issubclass(cellClass,CellView)):
+            cellClass=CellView
+        self.contents=dict()
+        super().__init__(rows,columns,cellClass)
+
+    def prepareGrid(self) -> None:
+        #cells are not stored, link bits are in self.cells
+        self.cells=bytearray(self.rows*self.columns)
+        return None
+
+    def configureCells(self) -> None:
+        #neighbors are computed from the cell index
+        pass
+
+    def eachRow(self) -> Iterator[List[CellView]]:
+        for row in range(self.rows):
+            start=row*self.columns
+            yield [self.CellClass(self,i) for i in range(start,start+self.columns)]
+
+    def eachCell(self) -> Iterator[CellView]:
+        for i in range(self.rows*self.columns):
+            yield self.CellClass(self,i)
+
+    def getCell(self, row: int, column: int) -> CellView:
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise IndexError("Cell (%d,%d) is outside of the grid" % (row,column))
+        return self.CellClass(self,row*self.columns+column)
+
+    def getNeighbor(self, row: int, column: int) -> Optional[CellView]:
+        if not (0 <= row < self.rows):
+            return None
+        if not (0 <= column < self.columns):
+            return None
+        return self.CellClass(self,row*self.columns+column)
+
+    def randomCell(self) -> CellView:
+        #same random calls as in Grid, so that same seed gives same maze
+        row=random.randint(0, self.rows-1)
+        column = random.randint(0,self.columns-1)
+        return self.CellClass(self,row*self.columns+column)
+
+    def linkedCells(self, index: int) -> List[CellView]:
+        """Get views to cells linked to the cell at index.
+
+        Args:
+            index: Cell index in the grid
+
+        Returns:
+            List of linked cells in north, east, south, west order
+        """
+        mask=self.cells[index]
+        columns=self.columns
+        links=[]
+        if mask & LINK_NORTH:
+            links.append(self.CellClass(self,index-columns))
+        if mask & LINK_EAST:
+            links.append(self.CellClass(self,index+1))
+        if mask & LINK_SOUTH:
+            links.append(self.CellClass(self,index+columns))
+        if mask & LINK_WEST:
+            links.append(self.CellClass(self,index-1))
+        return links
+
+    def linkMasks(self) -> bytearray:
+        return bytearray(self.cells.translate(LINK_MASK_ONLY))
+
+class WindowGrid(CompactGrid):
+    """Window of rows of an endless maze that is generated row by row.
+
+    Rows come from a row generator such as ellerRows. The newest row is
+    row 0 and the oldest row still in the window is the last row, so the
+    maze grows north. advance() generates new rows and drops the oldest
+    ones: memory use stays O(rows*columns) however far the maze goes.
+
+    Row generators link each row to the previous one with LINK_NORTH,
+    the window flips rows so that the previous row is south of it.
+
+    Attributes:
+        rowSource: Iterator of rows of link bitmasks
+        rowsGenerated: Number of rows taken from rowSource
+    """
+
+    def __init__(self, rowSource: Iterator[bytearray], rows: int, columns: int,
+                 cellClass: Type[Cell] = CellView) -> None:
+        """Initialize a window and fill it with the first rows.
+
+        Args:
+            rowSource: Iterable of rows of link bitmasks, for example
+                ellerRows(columns)
+            rows: Number of rows in the window
+            columns: Number of columns
+
+        Raises:
+            ValueError: If rowSource ends before the window is full
+        """
+        super().__init__(rows,columns,cellClass)
+        self.rowSource=iter(rowSource)
+        self.rowsGenerated=0
+        if self.advance(rows)<rows:
+            raise ValueError("Row source ended before the window was filled")
+
+    def advance(self, count: int = 1) -> int:
+        """Generate new rows to the top of the window.
+
+        Cells move south by the number of new rows, their contents too.
+        Links to the dropped rows and to rows not yet generated are
+        removed, links to the previous top row are added.
+
+        Args:
+            count: Number of rows to generate
+
+        Returns:
+            Number of rows generated, less than count if rowSource ended
+        """
+        columns=self.columns
+        #newest rows, at most a window full
+        newRows=deque(maxlen=self.rows)
+        added=0
+        for masks in itertools.islice(self.rowSource,count):
+            if len(masks)!=columns:
+                raise ValueError("Row has %d columns, expected %d" % (len(masks),columns))
+            newRows.append(masks)
+            added=added+1
+        if added==0:
+            return 0
+        self.rowsGenerated=self.rowsGenerated+added
+        top=b"".join(reversed(newRows)).translate(_FLIP_NORTH_SOUTH)
+        shift=len(top)
+        cells=self.cells
+        cells[:]=top+cells[:len(cells)-shift]
+        if shift<len(cells):
+            for column in range(columns):
+                if cells[shift-columns+column] & LINK_SOUTH:
+                    cells[shift+column]|=LINK_NORTH
+        cells[:columns]=cells[:columns].translate(_NO_NORTH)
+        last=len(cells)-columns
+        cells[last:]=cells[last:].translate(_NO_SOUTH)
+        self.contents={index+shift:content for index,content in self.contents.items()
+                       if index+shift<len(cells)}
+        self.invalidateDeadEnds()
+        return added
+
+    def streamRow(self, row: int) -> int:
+        """Get the index of a window row in the row generator.
+
+        Args:
+            row: Row in the window
+
+        Returns:
+            Row index, 0 for the first generated row
+        """
+        return self.rowsGenerated-1-row
+
+class _ChunkCells:
+    #link bits of a ChunkedGrid indexed like CompactGrid.cells
+
+    __slots__=("grid",)
+
+    def __init__(self, grid: 'ChunkedGrid') -> None:
+        self.grid=grid
+
+    def __len__(self) -> int:
+        return self.grid.rows*self.grid.columns
+
+    def _locate(self, index: int) -> Any:
+        grid=self.grid
+        if not 0 <= index < grid.rows*grid.columns:
+            raise IndexError("Cell index %d is outside of the grid" % index)
+        (row,column)=divmod(index,grid.columns)
+        (chunkRow,localRow)=divmod(row,grid.chunkSize)
+        (chunkColumn,localColumn)=divmod(column,grid.chunkSize)
+        width=grid.chunkWidth(chunkColumn)
+        return (chunkRow,chunkColumn,localRow*width+localColumn)
+
+    def __getitem__(self, index: int) -> int:
+        (chunkRow,chunkColumn,local)=self._locate(index)
+        return self.grid.chunk(chunkRow,chunkColumn)[local]
+
+    def __setitem__(self, index: int, mask: int) -> None:
+        (chunkRow,chunkColumn,local)=self._locate(index)
+        self.grid.chunk(chunkRow,chunkColumn)[local]=mask
+        self.grid.dirty.add((chunkRow,chunkColumn))
+
+class ChunkedGrid(CompactGrid):
+    """Very large grid of chunks that are generated on demand.
+
+    Cells are in square chunks of chunkSize*chunkSize cells. A chunk is
+    generated when one of its cells is first used, from a seed of its own,
+    so chunks can be dropped and generated again. At most maxChunks chunks
+    are kept in memory, least recently used chunks are dropped first.
+    Changed chunks, for example braided ones, are written to disk when
+    dropped and read back when needed.
+
+    Each chunk is a perfect maze of the chunk algorithm. Chunks are joined
+    like Binary Tree cells: every chunk but the north east one has one
+    door to the chunk north or east of it, so the whole grid is a perfect
+    maze. Cells are CellView views with row*columns+column indices, so
+    neighbors and links cross chunk borders transparently.
+
+    Functions that go through all cells (linkMasks, toBytes, getDistances)
+    work, but need memory for the whole grid, and with less than
+    chunkColumns chunks in memory they generate chunks again for every
+    row.
+
+    Attributes:
+        seed: Seed of the grid, chunk seeds are derived from it
+        chunkSize: Number of rows and columns in a chunk
+        chunkRows: Number of chunk rows
+        chunkColumns: Number of chunk columns
+        maxChunks: Maximum number of chunks in memory
+        directory: Directory of dropped changed chunks, None until needed
+        temporaryDirectory: Whether directory was created by the grid
+        chunks: Chunks in memory, bytearrays of link bits in LRU order
+        dirty: Chunks in memory that have changed since generated
+    """
+
+    def __init__(self, rows: int, columns: int, cellClass: Type[Cell] = CellView, seed: int = 0,
+                 algorithm: str = "RB", chunkSize: int = 64, maxChunks: int = 64,
+                 directory: Optional[str] = None) -> None:
+        """Initialize a chunked grid. No chunks are generated yet.
+
+        Args:
+            rows: Number of rows in the grid
+            columns: Number of columns in the grid
+            cellClass: CellView subclass to use for views
+            seed: Seed of the maze
+            algorithm: Key of the algorithm that generates chunks
+            chunkSize: Number of rows and columns in a chunk
+            maxChunks: Maximum number of chunks in memory
+            directory: Directory for dropped changed chunks (default:
+                a temporary directory, removed by close())
+
+        Raises:
+            ValueError: If algorithm is not registered or sizes are not valid
+        """
+        if chunkSize<1 or maxChunks<1:
+            raise ValueError("Chunk size and number of chunks must be positive")
+        registered=getAlgorithm(algorithm)
+        self.seed=seed
+        self.chunkSize=chunkSize
+        self.chunkRows=-(-rows // chunkSize)
+        self.chunkColumns=-(-columns // chunkSize)
+        self.maxChunks=maxChunks
+        self.directory=directory
+        self.temporaryDirectory=False
+        self.chunks=OrderedDict()
+        self.dirty=set()
+        super().__init__(rows,columns,cellClass)
+        self.algorithm=registered.name
+        self.algorithm_key=algorithm
+
+    def prepareGrid(self) -> None:
+        #link bits are in chunks, self.cells finds them by cell index
+        self.cells=_ChunkCells(self)
+        return None
+
+    def chunkWidth(self, chunkColumn: int) -> int:
+        """Get the number of columns in chunks of a chunk column."""
+        return min(self.chunkSize,self.columns-chunkColumn*self.chunkSize)
+
+    def chunkHeight(self, chunkRow: int) -> int:
+        """Get the number of rows in chunks of a chunk row."""
+        return min(self.chunkSize,self.rows-chunkRow*self.chunkSize)
+
+    def chunkSeed(self, chunkRow: int, chunkColumn: int) -> str:
+        """Get the random seed of a chunk."""
+        return "%d:%d:%d" % (self.seed,chunkRow,chunkColumn)
+
+    def chunkDoor(self, chunkRow: int, chunkColumn: int) -> Any:
+        """Get the door from a chunk to the chunk north or east of it.
+
+        Args:
+            chunkRow: Chunk row
+            chunkColumn: Chunk column
+
+        Returns:
+            Tuple of (LINK_NORTH or LINK_EAST, offset of the door cell on
+            the chunk border), or None for the north east chunk
+        """
+        lastColumn=chunkColumn==self.chunkColumns-1
+        if chunkRow==0 and lastColumn:
+            return None
+        doorRandom=random.Random(self.chunkSeed(chunkRow,chunkColumn)+":door")
+        if chunkRow==0:
+            direction=LINK_EAST
+        elif lastColumn:
+            direction=LINK_NORTH
+        else:
+            direction=doorRandom.choice([LINK_NORTH,LINK_EAST])
+        if direction==LINK_NORTH:
+            return (direction,doorRandom.randrange(self.chunkWidth(chunkColumn)))
+        return (direction,doorRandom.randrange(self.chunkHeight(chunkRow)))
+
+    def generateChunk(self, chunkRow: int, chunkColumn: int) -> bytearray:
+        """Generate link bits of a chunk with its doors.
+
+        The global random generator is seeded with the chunk seed and
+        restored afterwards.
+
+        Args:
+            chunkRow: Chunk row
+            chunkColumn: Chunk column
+
+        Returns:
+            bytearray of LINK_* bits in row-major order
+        """
+        width=self.chunkWidth(chunkColumn)
+        height=self.chunkHeight(chunkRow)
+        state=random.getstate()
+        try:
+            random.seed(self.chunkSeed(chunkRow,chunkColumn))
+            chunk=getAlgorithm(self.algorithm_key).function(CompactGrid(height,width))
+        finally:
+            random.setstate(state)
+        cells=chunk.cells
+        door=self.chunkDoor(chunkRow,chunkColumn)
+        if door is not None:
+            (direction,offset)=door
+            if direction==LINK_NORTH:
+                cells[offset]|=LINK_NORTH
+            else:
+                cells[offset*width+width-1]|=LINK_EAST
+        #doors from the chunks south and west of this one
+        if chunkRow+1<self.chunkRows:
+            door=self.chunkDoor(chunkRow+1,chunkColumn)
+            if door[0]==LINK_NORTH:
+                cells[(height-1)*width+door[1]]|=LINK_SOUTH
+        if chunkColumn>0:
+            door=self.chunkDoor(chunkRow,chunkColumn-1)
+            if door[0]==LINK_EAST:
+                cells[door[1]*width]|=LINK_WEST
+        return cells
+
+    def chunkFile(self, chunkRow: int, chunkColumn: int) -> Optional[str]:
+        """Get the file of a dropped changed chunk, None if not on disk."""
+        if self.directory is None:
+            return None
+        path=os.path.join(self.directory,"chunk_%d_%d.bin" % (chunkRow,chunkColumn))
+        return path if os.path.exists(path) else None
+
+    def chunk(self, chunkRow: int, chunkColumn: int) -> bytearray:
+        """Get link bits of a chunk, generating or reading it if needed.
+
+        Args:
+            chunkRow: Chunk row
+            chunkColumn: Chunk column
+
+        Returns:
+            bytearray of LINK_* bits in row-major order
+        """
+        key=(chunkRow,chunkColumn)
+        cells=self.chunks.get(key)
+        if cells is not None:
+            self.chunks.move_to_end(key)
+            return cells
+        path=self.chunkFile(chunkRow,chunkColumn)
+        if path is not None:
+            with open(path,"rb") as f:
+                cells=bytearray(f.read())
+            #changed since generated, must be written again when dropped
+            self.dirty.add(key)
+        else:
+            cells=self.generateChunk(chunkRow,chunkColumn)
+        self.chunks[key]=cells
+        while len(self.chunks)>self.maxChunks:
+            self.dropChunk(next(iter(self.chunks)))
+        return cells
+
+    def dropChunk(self, key: Any) -> None:
+        """Drop a chunk from memory, writing it to disk if it has changed.
+
+        Args:
+            key: Tuple of (chunkRow, chunkColumn)
+        """
+        cells=self.chunks.pop(key)
+        if key not in self.dirty:
+            return
+        self.dirty.discard(key)
+        if self.directory is None:
+            self.directory=tempfile.mkdtemp(prefix="mazepy_chunks_")
+            self.temporaryDirectory=True
+        path=os.path.join(self.directory,"chunk_%d_%d.bin" % key)
+        with open(path,"wb") as f:
+            f.write(cells)
+        logger.debug("Wrote chunk %s to %s" % (key,path))
+
+    def close(self) -> None:
+        """Drop all chunks and remove the temporary chunk directory."""
+        self.chunks.clear()
+        self.dirty.clear()
+        if self.temporaryDirectory:
+            shutil.rmtree(self.directory,ignore_errors=True)
+            self.directory=None
+            self.temporaryDirectory=False
+
+    def linkMasks(self) -> bytearray:
+        masks=bytearray()
+        for row in range(self.rows):
+            (chunkRow,localRow)=divmod(row,self.chunkSize)
+            for chunkColumn in range(self.chunkColumns):
+                width=self.chunkWidth(chunkColumn)
+                masks+=self.chunk(chunkRow,chunkColumn)[localRow*width:(localRow+1)*width]
+        return masks
+
+#====================
+#image writers
+#Write images from scanlines of palette indices, one byte per pixel.
+
+def _pngChunk(chunkType: bytes, data: bytes) -> bytes:
+    return struct.pack(">I",len(data))+chunkType+data+struct.pack(">I",zlib.crc32(chunkType+data))
+
+def _imageArray(masks: bytearray, onPath: bytearray, rows: int, columns: int, cellSize: int) -> Any:
+    #same pixels as the scanlines in Grid._imageScanlines, as a 2-D array
+    links=numpy.frombuffer(bytes(masks),dtype=numpy.uint8).reshape(rows,columns)
+    path=numpy.frombuffer(bytes(onPath),dtype=numpy.uint8).reshape(rows,columns).astype(bool)
+    pathAbove=numpy.zeros_like(path)
+    pathAbove[1:]=path[:-1]
+    pathLeft=numpy.zeros_like(path)
+    pathLeft[:,1:]=path[:,:-1]
+
+    fill=numpy.where(path,IMAGE_PATH,IMAGE_FLOOR).astype(numpy.uint8)
+    north=numpy.where(links & LINK_NORTH,numpy.where(path & pathAbove,IMAGE_PATH,IMAGE_FLOOR),IMAGE_WALL)
+    west=numpy.where(links & LINK_WEST,numpy.where(path & pathLeft,IMAGE_PATH,IMAGE_FLOOR),IMAGE_WALL)
+    #one block of cellSize x cellSize pixels per cell, wall corner at top left
+    blocks=numpy.empty((rows,cellSize,columns,cellSize),dtype=numpy.uint8)
+    blocks[:,0,:,0]=IMAGE_WALL
+    blocks[:,0,:,1:]=north[:,:,None]
+    blocks[:,1:,:,0]=west[:,None,:]
+    blocks[:,1:,:,1:]=fill[:,None,:,None]
+    image=numpy.full((rows*cellSize+1,columns*cellSize+1),IMAGE_WALL,dtype=numpy.uint8)
+    image[:-1,:-1]=blocks.reshape(rows*cellSize,columns*cellSize)
+    return image
+
+def _writePNG(fp: Any, width: int, height: int, palette: List[Any], scanlines: Iterator[bytes]) -> None:
+    #8-bit indexed color PNG. A scanline equal to the previous one uses
+    #the Up filter, which makes it all zeros and fast to compress.
+    fp.write(b"\x89PNG\r\n\x1a\n")
+    fp.write(_pngChunk(b"IHDR",struct.pack(">IIBBBBB",width,height,8,3,0,0,0)))
+    fp.write(_pngChunk(b"PLTE",b"".join(bytes(color) for color in palette)))
+    compressor=zlib.compressobj(6)
+    data=[]
+    batch=[]
+    previous=None
+    unchanged=b"\x02"+bytes(width)
+    for line in scanlines:
+        if line==previous:
+            batch.append(unchanged)
+        else:
+            batch.append(b"\x00")
+            batch.append(line)
+            previous=line
+        #compressing many lines at a time is much faster
+        if len(batch)>=512:
+            data.append(compressor.compress(b"".join(batch)))
+            batch=[]
+    data.append(compressor.compress(b"".join(batch)))
+    data.append(compressor.flush())
+    fp.write(_pngChunk(b"IDAT",b"".join(data)))
+    fp.write(_pngChunk(b"IEND",b""))
+
+def _writePPM(fp: Any, width: int, height: int, palette: List[Any], scanlines: Iterator[bytes]) -> None:
+    #binary RGB PPM, palette indices are expanded one channel at a time
+    fp.write(b"P6\n%d %d\n255\n" % (width,height))
+    channels=[bytes(palette[i][channel] if i<len(palette) else 0 for i in range(256)) for channel in range(3)]
+    previous=None
+    rgb=b""
+    for line in scanlines:
+        #most scanlines repeat the previous one
+        if line is not previous:
+            expanded=bytearray(len(line)*3)
+            for channel in range(3):
+                expanded[channel::3]=line.translate(channels[channel])
+            rgb=bytes(expanded)
+            previous=line
+        fp.write(rgb)
+
 #====================
 #init mazes
 
@@ -529,24 +1807,234 @@ def initMazeFromJSON(jsonString: str, cellClass: Type[Cell] = Cell, gridClass: T
     grid.braid=jsonObj["braid"]
 
     #init cells
-    #for each cell link those that are neigbors
     for _cell in jsonObj["cells"]:
-        cell=json.loads(_cell)
-        gridCell=grid.getCell(cell["row"],cell["column"])
-        if "content" in cell:
-            gridCell.content=cell["content"]
+        _initCellFromJSON(grid,_cell)
+
+    return grid
+
+
+def _initCellFromJSON(grid: Grid, jsonString: str) -> None:
+    #for each cell link those that are neigbors
+    cell=json.loads(jsonString)
+    gridCell=grid.getCell(cell["row"],cell["column"])
+    if "content" in cell:
+        gridCell.content=cell["content"]
+    else:
+        gridCell.setContent(" ")
+
+    if cell["north"]:
+        gridCell.link(gridCell.north)
+    if cell["east"]:
+        gridCell.link(gridCell.east)
+    if cell["south"]:
+        gridCell.link(gridCell.south)
+    if cell["west"]:
+        gridCell.link(gridCell.west)
+
+
+class _JSONStreamReader:
+    """Reads JSON tokens and values from a text file in chunks."""
+
+    def __init__(self, fp: Any, chunkSize: int) -> None:
+        self.fp=fp
+        self.chunkSize=chunkSize
+        self.buffer=""
+        self.pos=0
+        self.eof=False
+        self.decoder=json.JSONDecoder()
+
+    def fill(self) -> bool:
+        #read next chunk, drop consumed part of the buffer
+        if self.eof:
+            return False
+        chunk=self.fp.read(self.chunkSize)
+        if not chunk:
+            self.eof=True
+            return False
+        self.buffer=self.buffer[self.pos:]+chunk
+        self.pos=0
+        return True
+
+    def peek(self) -> str:
+        """Get next non-whitespace character without consuming it."""
+        while True:
+            while self.pos<len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos=self.pos+1
+            if self.pos<len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON")
+
+    def expect(self, chars: str) -> str:
+        """Consume next non-whitespace character, one of chars."""
+        char=self.peek()
+        if char not in chars:
+            raise ValueError("Expected one of '%s' at '%s'" % (chars,self.buffer[self.pos:self.pos+20]))
+        self.pos=self.pos+1
+        return char
+
+    def value(self) -> Any:
+        """Decode next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value,end=self.decoder.raw_decode(self.buffer,self.pos)
+                #a number may continue in the next chunk
+                if self.eof or (end<len(self.buffer) and self.buffer[end] not in "0123456789.eE+-"):
+                    self.pos=end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise ValueError("Invalid JSON at '%s'" % self.buffer[self.pos:self.pos+20])
+            self.fill()
+
+
+def initMazeFromJSONStream(fp: Any, cellClass: Type[Cell] = Cell, gridClass: Type[Grid] = Grid,
+                           chunkSize: int = 65536) -> Grid:
+    """Initialize a maze from JSON in a text file, reading it in chunks.
+
+    Reads the same format as initMazeFromJSON, including files written by
+    Grid.dumpJSON() and Grid.toJSONString(). Cells are linked as they are
+    read, so memory use does not depend on the size of the file.
+
+    Args:
+        fp: Text file object to read from
+        cellClass: Cell class to use (default: Cell)
+        gridClass: Grid class to use (default: Grid)
+        chunkSize: Number of characters to read at a time
+
+    Returns:
+        Reconstructed Grid object
+
+    Raises:
+        ValueError: If JSON is not a valid maze
+    """
+    reader=_JSONStreamReader(fp,chunkSize)
+    header=dict()
+    grid=None
+    #cells before rows and columns, not written by mazepy
+    pendingCells=[]
+    reader.expect("{")
+    if reader.peek()=="}":
+        raise ValueError("Empty maze JSON")
+    while True:
+        key=reader.value()
+        reader.expect(":")
+        if key=="cells":
+            if grid is None and "rows" in header and "columns" in header:
+                grid=gridClass(header["rows"],header["columns"],cellClass)
+            reader.expect("[")
+            if reader.peek()=="]":
+                reader.expect("]")
+            else:
+                while True:
+                    _cell=reader.value()
+                    if grid is None:
+                        pendingCells.append(_cell)
+                    else:
+                        _initCellFromJSON(grid,_cell)
+                    if reader.expect(",]")=="]":
+                        break
         else:
-            gridCell.setContent(" ")
-        
-        if cell["north"]:
-            gridCell.link(gridCell.north)
-        if cell["east"]:
-            gridCell.link(gridCell.east)
-        if cell["south"]:
-            gridCell.link(gridCell.south)
-        if cell["west"]:
-            gridCell.link(gridCell.west)
+            header[key]=reader.value()
+        if reader.expect(",}")=="}":
+            break
+
+    if "rows" not in header or "columns" not in header:
+        raise ValueError("Maze JSON has no rows or columns")
+    if grid is None:
+        grid=gridClass(header["rows"],header["columns"],cellClass)
+    for _cell in pendingCells:
+        _initCellFromJSON(grid,_cell)
+    grid.algorithm=header.get("algorithm",grid.algorithm)
+    grid.algorithm_key=header.get("algorithm_key",grid.algorithm_key)
+    grid.braid=header.get("braid",grid.braid)
+    return grid
+
+
+def applyLinkMasks(grid: Grid, masks: Any) -> Grid:
+    """Link cells of a grid from LINK_* bits.
+
+    Masks are copied as they are to a CompactGrid, other grids (also
+    ChunkedGrid) link cells
+    one by one using east and south bits.
+
+    Args:
+        grid: Grid object without links
+        masks: bytes-like LINK_* bits in row-major order
+
+    Returns:
+        Grid object with links
+    """
+    if isinstance(grid,CompactGrid) and isinstance(grid.cells,bytearray):
+        grid.cells[:]=masks
+        return grid
+    columns=grid.columns
+    for index,mask in enumerate(masks):
+        if mask & (LINK_EAST | LINK_SOUTH):
+            cell=grid.getCell(index // columns, index % columns)
+            if mask & LINK_EAST:
+                cell.link(cell.east)
+            if mask & LINK_SOUTH:
+                cell.link(cell.south)
+    return grid
+
+def _checkLinkMasks(masks: bytes, rows: int, columns: int) -> None:
+    #links must stay inside the grid and both cells of a link must have it
+    if (any(mask & LINK_NORTH for mask in masks[:columns])
+            or any(mask & LINK_SOUTH for mask in masks[len(masks)-columns:])
+            or any(mask & LINK_WEST for mask in masks[0::columns])
+            or any(mask & LINK_EAST for mask in masks[columns-1::columns])):
+        raise ValueError("Corrupt mazepy binary maze: link outside of grid")
+    east=masks.translate(_LINK_BIT[LINK_EAST])
+    west=masks.translate(_LINK_BIT[LINK_WEST])
+    south=masks.translate(_LINK_BIT[LINK_SOUTH])
+    north=masks.translate(_LINK_BIT[LINK_NORTH])
+    if east[:-1]!=west[1:] or south[:len(masks)-columns]!=north[columns:]:
+        raise ValueError("Corrupt mazepy binary maze: one way link")
+
+def initMazeFromBytes(data: bytes, cellClass: Optional[Type[Cell]] = None, gridClass: Type[Grid] = Grid) -> Grid:
+    """Initialize a maze from mazepy binary format.
+
+    Args:
+        data: Maze as bytes, created by Grid.toBytes()
+        cellClass: Cell class to use (default: the grid class default)
+        gridClass: Grid class to use (default: Grid)
 
+    Returns:
+        Reconstructed Grid object
+
+    Raises:
+        ValueError: If data is not a supported mazepy binary maze
+    """
+    data=bytes(data)
+    if len(data)<MAZE_BYTES_HEADER.size or data[:4]!=MAZE_BYTES_MAGIC:
+        raise ValueError("Not a mazepy binary maze")
+    (magic,version,flags,rows,columns,braid,keyLength)=MAZE_BYTES_HEADER.unpack_from(data)
+    if version!=MAZE_BYTES_VERSION:
+        raise ValueError("Unsupported mazepy binary maze version: %d" % version)
+    offset=MAZE_BYTES_HEADER.size
+    key=data[offset:offset+keyLength].decode("utf-8") or None
+    packed=data[offset+keyLength:]
+    if flags & MAZE_BYTES_COMPRESSED:
+        try:
+            packed=zlib.decompress(packed)
+        except zlib.error as e:
+            raise ValueError("Corrupt mazepy binary maze: %s" % e) from None
+    masks=b"".join(map(_NIBBLE_PAIRS.__getitem__,packed))[:rows*columns]
+    if len(masks)!=rows*columns:
+        raise ValueError("Truncated mazepy binary maze")
+    if columns>0:
+        _checkLinkMasks(masks,rows,columns)
+
+    if cellClass is None:
+        grid=gridClass(rows,columns)
+    else:
+        grid=gridClass(rows,columns,cellClass)
+    applyLinkMasks(grid,masks)
+    grid.algorithm_key=key
+    grid.algorithm=MAZE_ALGORITHMS.get(key) if key is not None else None
+    grid.braid=braid
     return grid
 
 
@@ -555,31 +2043,25 @@ def initMaze(grid: Grid, algorithm: str) -> Grid:
     
     Args:
         grid: Grid object to populate with maze
-        algorithm: Algorithm key (BT, RB, AB, W, HK, S)
+        algorithm: Registered algorithm key, for example BT, RB, AB, W, HK or S
         
     Returns:
         Grid object with generated maze
+
+    Raises:
+        ValueError: If algorithm is not registered
     """
-    if algorithm=="AB":
-        grid=initAldousBroderMaze(grid)
-    if algorithm=="BT":
-        grid=initBinaryTreeMaze(grid)
-    if algorithm=="RB":
-        grid=initRecursiveBacktrackerMaze(grid)
-    if algorithm=="S":
-        grid=initSidewinderMaze(grid)
-    if algorithm=="W":
-        grid=initWilsonMaze(grid)
-    if algorithm=="HK":
-        grid=initHuntAndKillMaze(grid)
+    grid=getAlgorithm(algorithm).function(grid)
 
     grid.algorithm=MAZE_ALGORITHMS[algorithm]
     grid.algorithm_key=algorithm
+    #algorithms link cells directly
+    grid.invalidateDeadEnds()
 
     return grid
 
 def getRandomMaze(grid: Grid) -> Grid:
-  algorithm=random.choice(list(MAZE_ALGORITHMS.keys()))
+  algorithm=random.choice(randomAlgorithmKeys())
   return initMaze(grid,algorithm)
 
 def initBinaryTreeMaze(grid: Grid) -> Grid:
@@ -599,6 +2081,53 @@ def initBinaryTreeMaze(grid: Grid) -> Grid:
                 cell.link(neighbor)
     return grid
 
+def _addSouthLinks(rowMasks: Iterator[bytearray]) -> Iterator[bytearray]:
+    #yield rows one row late, with south links of the following row's
+    #north links
+    previous=None
+    for masks in rowMasks:
+        if previous is not None:
+            for column,mask in enumerate(masks):
+                if mask & LINK_NORTH:
+                    previous[column]|=LINK_SOUTH
+            yield previous
+        previous=masks
+    if previous is not None:
+        yield previous
+
+def _binaryTreeRows(columns: int, rows: Optional[int]) -> Iterator[bytearray]:
+    row=0
+    while rows is None or row<rows:
+        masks=bytearray(columns)
+        for column in range(columns):
+            if row==0 and column==columns-1:
+                continue
+            #same random calls as initBinaryTreeMaze
+            if row==0 or (column<columns-1 and random.randint(0,1)==1):
+                masks[column]|=LINK_EAST
+                masks[column+1]|=LINK_WEST
+            else:
+                masks[column]|=LINK_NORTH
+        yield masks
+        row=row+1
+
+def binaryTreeRows(columns: int, rows: Optional[int] = None) -> Iterator[bytearray]:
+    """Generate a maze row by row with Binary Tree algorithm.
+
+    Rows are the same as in initBinaryTreeMaze with the same seed. A row
+    is yielded when the next row is known, because south links of a row
+    are decided by the next row.
+
+    Args:
+        columns: Number of columns
+        rows: Number of rows, None for no end
+
+    Returns:
+        Iterator of rows of link bitmasks, including north links to the
+        previous row
+    """
+    return _addSouthLinks(_binaryTreeRows(columns,rows))
+
 
 def initRecursiveBacktrackerMaze(grid: Grid) -> Grid:
     stack = [] 
@@ -639,6 +2168,40 @@ def initSidewinderMaze(grid: Grid) -> Grid:
                 cell.link(cell.east)
     return grid
 
+def _sidewinderRows(columns: int, rows: Optional[int]) -> Iterator[bytearray]:
+    tf=[True,False]
+    row=0
+    while rows is None or row<rows:
+        masks=bytearray(columns)
+        runStart=0
+        for column in range(columns):
+            #same random calls as initSidewinderMaze
+            if column==columns-1 or (row>0 and random.choice(tf)==True):
+                member=random.choice(range(runStart,column+1))
+                if row>0:
+                    masks[member]|=LINK_NORTH
+                runStart=column+1
+            else:
+                masks[column]|=LINK_EAST
+                masks[column+1]|=LINK_WEST
+        yield masks
+        row=row+1
+
+def sidewinderRows(columns: int, rows: Optional[int] = None) -> Iterator[bytearray]:
+    """Generate a maze row by row with Sidewinder algorithm.
+
+    Rows are the same as in initSidewinderMaze with the same seed.
+
+    Args:
+        columns: Number of columns
+        rows: Number of rows, None for no end
+
+    Returns:
+        Iterator of rows of link bitmasks, including north links to the
+        previous row
+    """
+    return _addSouthLinks(_sidewinderRows(columns,rows))
+
 def initAldousBroderMaze(grid: Grid) -> Grid:
     cell=grid.randomCell()
     unvisited=grid.size()-1
@@ -650,55 +2213,942 @@ def initAldousBroderMaze(grid: Grid) -> Grid:
         cell=neighbor
     return grid
 
+class _OrderedIndexSet:
+    """Set of cell indexes 0..size-1 that keeps its members in ascending order.
+
+    Membership test is O(1), removal and access by position are O(log n)
+    using a Fenwick tree of member counts. random.choice() on this set picks
+    the same member as it would from a sorted list of the members, so
+    algorithms can use it in place of a list without changing the mazes
+    generated for a seed.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size=size
+        self.count=size
+        self.members=bytearray(b"\x01")*size
+        #all members present: node i covers lowbit(i) members
+        self.tree=array("i",(i & -i for i in range(size+1)))
+        self.topStep=1 << (size.bit_length()-1) if size>0 else 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.size and self.members[index]==1
+
+    def __getitem__(self, position: int) -> int:
+        if position<0:
+            position=position+self.count
+        if not (0 <= position < self.count):
+            raise IndexError("Position %d out of range" % position)
+        #find the smallest index where the count of members reaches position+1
+        tree=self.tree
+        index=0
+        remaining=position+1
+        step=self.topStep
+        while step>0:
+            nextIndex=index+step
+            if nextIndex<=self.size and tree[nextIndex]<remaining:
+                index=nextIndex
+                remaining=remaining-tree[nextIndex]
+            step=step>>1
+        return index
+
+    def remove(self, index: int) -> None:
+        if index not in self:
+            raise KeyError(index)
+        self.members[index]=0
+        self.count=self.count-1
+        tree=self.tree
+        i=index+1
+        while i<=self.size:
+            tree[i]=tree[i]-1
+            i=i+(i & -i)
+
 def initWilsonMaze(grid: Grid) -> Grid:
-    unvisited=[]
-    for cell in grid.eachCell():
-        unvisited.append(cell)
+    """Initialize a maze using Wilson's algorithm.
+
+    Unvisited cells are kept in an _OrderedIndexSet. Membership test is
+    O(1), but removal and random choice are O(log n), not O(1). A
+    swap-remove list would give O(1) choice but reorders the cells, so
+    the same seed would give a different maze and existing level ids
+    would no longer reproduce.
+    """
+    #unvisited cells are kept as indexes (row*columns+column) in the same
+    #order as the original list based implementation used, so that random
+    #choices and the generated maze stay the same for a seed
+    columns=grid.columns
+    unvisited=_OrderedIndexSet(grid.size())
 
     first = random.choice(unvisited)
     unvisited.remove(first)
 
     while len(unvisited)>0:
-        cell=random.choice(unvisited)
+        index=random.choice(unvisited)
+        cell=grid.getCell(index // columns, index % columns)
         path=[cell]
-        while cell in unvisited:
+        #position of each cell index in path, for loop-erasure
+        positions={index:0}
+        while index in unvisited:
             cell=random.choice(cell.neighbors())
-            if cell in path:
-                position=path.index(cell)
+            index=cell.row*columns+cell.column
+            position=positions.get(index)
+            if position is not None:
                 #in Ruby code: path = path[0..position]
-                #is in Python needs the line below
-                path=path[:position+1]
+                for erased in path[position+1:]:
+                    del positions[erased.row*columns+erased.column]
+                del path[position+1:]
             else:
+                positions[index]=len(path)
                 path.append(cell)
         #in Ryby: 0.upto(path.length-2)
         #is in Python the line below
         for i in range(len(path)-1):
             path[i].link(path[i+1])
-            unvisited.remove(path[i])
+            unvisited.remove(path[i].row*columns+path[i].column)
 
     return grid
 
-def initHuntAndKillMaze(grid: Grid) -> Grid:
+class _RandomIndexSet:
+    """Unordered set of cell indexes with O(1) add, remove and random choice.
+
+    Members are kept in a list and removed by swapping the last member into
+    the removed position, a dictionary maps members to list positions.
+    """
+
+    def __init__(self) -> None:
+        self.items=[]
+        self.positions=dict()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.positions
+
+    def __getitem__(self, position: int) -> int:
+        return self.items[position]
+
+    def add(self, index: int) -> None:
+        if index not in self.positions:
+            self.positions[index]=len(self.items)
+            self.items.append(index)
+
+    def discard(self, index: int) -> None:
+        position=self.positions.pop(index,None)
+        if position is None:
+            return
+        last=self.items.pop()
+        if position<len(self.items):
+            self.items[position]=last
+            self.positions[last]=position
+
+def initHuntAndKillMaze(grid: Grid, compat: bool = True) -> Grid:
+    """Initialize a maze using the Hunt and Kill algorithm.
+
+    Unvisited cells next to visited cells are kept in a frontier, so that
+    the hunt phase does not rescan the grid from the top.
+
+    Args:
+        grid: Grid object to populate with maze
+        compat: If True (default), hunt the first frontier cell in row-major
+            order like the original full scan did, which gives the same maze
+            for a seed (O(log n) per hunt). If False, hunt a random frontier
+            cell (O(1) per hunt), which gives different mazes.
+
+    Returns:
+        Grid object with generated maze
+    """
+    columns=grid.columns
+    visited=bytearray(grid.size())
+    if compat==True:
+        #min-heap of cell indexes, visited cells are skipped when popped
+        frontier=[]
+    else:
+        randomFrontier=_RandomIndexSet()
+
+    def visit(cell: Cell) -> None:
+        index=cell.row*columns+cell.column
+        if visited[index]:
+            return
+        visited[index]=1
+        if compat==False:
+            randomFrontier.discard(index)
+        for n in cell.neighbors():
+            neighborIndex=n.row*columns+n.column
+            if not visited[neighborIndex]:
+                if compat==True:
+                    heapq.heappush(frontier,neighborIndex)
+                else:
+                    randomFrontier.add(neighborIndex)
+
     currentCell = grid.randomCell()
 
     while currentCell != None:
-        unvisitedNeighbors= [n for n in currentCell.neighbors() if len(n.getLinks()) == 0]  
+        unvisitedNeighbors= [n for n in currentCell.neighbors() if not visited[n.row*columns+n.column]]
         if len(unvisitedNeighbors)>0:
             neighbor=random.choice(unvisitedNeighbors)
             currentCell.link(neighbor)
+            visit(currentCell)
+            visit(neighbor)
             currentCell=neighbor
         else:
             currentCell=None
-            for cell in grid.eachCell():
-                visitedNeighbors= [n for n in cell.neighbors() if len(n.getLinks()) != 0]
-                if len(cell.getLinks())==0 and len(visitedNeighbors)!=0:
-                    currentCell=cell
-                    neighbor=random.choice(visitedNeighbors)
-                    currentCell.link(neighbor)
+            index=None
+            if compat==True:
+                while len(frontier)>0:
+                    index=heapq.heappop(frontier)
+                    if not visited[index]:
+                        break
+                    index=None
+            elif len(randomFrontier)>0:
+                index=random.choice(randomFrontier)
+            if index is not None:
+                currentCell=grid.getCell(index // columns, index % columns)
+                visitedNeighbors= [n for n in currentCell.neighbors() if visited[n.row*columns+n.column]]
+                neighbor=random.choice(visitedNeighbors)
+                currentCell.link(neighbor)
+                visit(currentCell)
+
+    return grid
+
+def _findRoot(parents: array, index: int) -> int:
+    #union-find root with path halving
+    while parents[index]!=index:
+        parents[index]=parents[parents[index]]
+        index=parents[index]
+    return index
+
+def initKruskalMaze(grid: Grid) -> Grid:
+    """Randomized Kruskal's algorithm with union-find.
+
+    All walls between neighbors are shuffled and a wall is removed when
+    the cells on its sides are not yet connected.
+    """
+    rows=grid.rows
+    columns=grid.columns
+    #edge 2*index is the east wall and 2*index+1 the south wall of a cell
+    edges=[]
+    for index in range(rows*columns):
+        if index % columns<columns-1:
+            edges.append(2*index)
+        if index<(rows-1)*columns:
+            edges.append(2*index+1)
+    random.shuffle(edges)
+
+    parents=array("i",range(rows*columns))
+    sizes=array("i",[1])*(rows*columns)
+    for edge in edges:
+        index=edge >> 1
+        other=index+columns if edge & 1 else index+1
+        root=_findRoot(parents,index)
+        otherRoot=_findRoot(parents,other)
+        if root==otherRoot:
+            continue
+        #union by size
+        if sizes[root]<sizes[otherRoot]:
+            (root,otherRoot)=(otherRoot,root)
+        parents[otherRoot]=root
+        sizes[root]=sizes[root]+sizes[otherRoot]
+        cell=grid.getCell(index // columns, index % columns)
+        cell.link(cell.south if edge & 1 else cell.east)
+    return grid
+
+def initPrimMaze(grid: Grid) -> Grid:
+    """Randomized (simplified) Prim's algorithm with an indexed frontier.
+
+    Starting from a random cell, a random frontier cell is joined to a
+    random neighbor that is already in the maze, until no frontier is left.
+    """
+    columns=grid.columns
+    inMaze=bytearray(grid.size())
+    frontier=_RandomIndexSet()
+
+    def add(cell: Cell) -> None:
+        inMaze[cell.row*columns+cell.column]=1
+        for n in cell.neighbors():
+            index=n.row*columns+n.column
+            if not inMaze[index]:
+                frontier.add(index)
+
+    add(grid.randomCell())
+    while len(frontier)>0:
+        index=random.choice(frontier)
+        frontier.discard(index)
+        cell=grid.getCell(index // columns, index % columns)
+        inNeighbors=[n for n in cell.neighbors() if inMaze[n.row*columns+n.column]]
+        cell.link(random.choice(inNeighbors))
+        add(cell)
+    return grid
+
+def ellerRows(columns: int, rows: Optional[int] = None) -> Iterator[bytearray]:
+    """Generate a maze row by row with Eller's algorithm.
+
+    Only the current row is kept in memory, so the number of rows may be
+    unlimited. Each yielded row is a bytearray of LINK_* bits, one byte
+    per cell, including north links to the previous row.
+
+    Args:
+        columns: Number of columns
+        rows: Number of rows, None for no end. The last row joins all
+            remaining sets, so the maze is perfect.
+
+    Yields:
+        Rows of link bitmasks
+    """
+    #set of each column in the current row, and columns of each set
+    sets=list(range(columns))
+    members={column:[column] for column in range(columns)}
+    nextSet=columns
+    north=bytearray(columns)
+    row=0
+    while rows is None or row<rows:
+        last=rows is not None and row==rows-1
+        masks=bytearray(north)
+
+        #join adjacent cells of different sets, all of them in the last row
+        for column in range(columns-1):
+            (left,right)=(sets[column],sets[column+1])
+            if left==right or (not last and random.random()<0.5):
+                continue
+            masks[column]|=LINK_EAST
+            masks[column+1]|=LINK_WEST
+            #merge smaller set to larger
+            if len(members[left])<len(members[right]):
+                (left,right)=(right,left)
+            for member in members[right]:
+                sets[member]=left
+            members[left].extend(members.pop(right))
+
+        if last:
+            yield masks
+            return
+
+        #each set continues down from at least one cell
+        north=bytearray(columns)
+        for setMembers in members.values():
+            down=[member for member in setMembers if random.random()<0.5]
+            if len(down)==0:
+                down=[random.choice(setMembers)]
+            for member in down:
+                masks[member]|=LINK_SOUTH
+                north[member]=LINK_NORTH
+        #cells without link from above start new sets
+        newMembers=dict()
+        for column in range(columns):
+            if north[column]:
+                newMembers.setdefault(sets[column],[]).append(column)
+            else:
+                sets[column]=nextSet
+                newMembers[nextSet]=[column]
+                nextSet=nextSet+1
+        members=newMembers
+        yield masks
+        row=row+1
+
+def initEllerMaze(grid: Grid) -> Grid:
+    """Eller's algorithm, generating the grid row by row with ellerRows."""
+    return applyLinkMasks(grid,b"".join(ellerRows(grid.columns,grid.rows)))
+
+def climbableRows(rowSource: Iterator[bytearray]) -> Iterator[bytearray]:
+    """Link each run of a row to the next row.
+
+    In a perfect maze the way to the next row may go back through any
+    number of rows. When every run of horizontally linked cells has a link
+    to the next row, the next row can be reached from any cell without
+    going back, also when old rows are dropped as in WindowGrid. The
+    added links make loops, so the maze is not perfect.
+
+    Args:
+        rowSource: Iterable of rows of link bitmasks
+
+    Yields:
+        Rows of link bitmasks, one row late
+    """
+    previous=None
+    for masks in rowSource:
+        masks=bytearray(masks)
+        if previous is not None:
+            runStart=0
+            for column in range(len(masks)):
+                if column<len(masks)-1 and previous[column] & LINK_EAST:
+                    continue
+                run=range(runStart,column+1)
+                if not any(previous[member] & LINK_SOUTH for member in run):
+                    member=random.choice(run)
+                    previous[member]|=LINK_SOUTH
+                    masks[member]|=LINK_NORTH
+                runStart=column+1
+            yield previous
+        previous=masks
+    if previous is not None:
+        yield previous
+
+#====================
+#solving
+#Single pair shortest path search that stops as soon as the path is known,
+#instead of computing distances to every cell of the maze.
+
+SOLVE_METHODS=["astar","bidi"]
+
+def _pathFromParents(start: Cell, meeting: Cell, parents: Dict[Cell, Optional[Cell]],
+                     goalParents: Dict[Cell, Optional[Cell]]) -> List[Cell]:
+    #cells from start to meeting cell and on from meeting cell to goal
+    path=[]
+    cell=meeting
+    while cell is not None:
+        path.append(cell)
+        cell=parents[cell]
+    path.reverse()
+    cell=goalParents.get(meeting)
+    while cell is not None:
+        path.append(cell)
+        cell=goalParents[cell]
+    return path
+
+def _solveBidirectional(start: Cell, goal: Cell) -> Optional[List[Cell]]:
+    #breadth first search from both ends, expanding one whole level of the
+    #smaller frontier at a time
+    if start==goal:
+        return [start]
+    startParents={start:None}
+    goalParents={goal:None}
+    startFrontier=[start]
+    goalFrontier=[goal]
+    startDepth={start:0}
+    goalDepth={goal:0}
+    while len(startFrontier)>0 and len(goalFrontier)>0:
+        forward=len(startFrontier)<=len(goalFrontier)
+        if forward==True:
+            (frontier,parents,depth,otherDepth)=(startFrontier,startParents,startDepth,goalDepth)
+        else:
+            (frontier,parents,depth,otherDepth)=(goalFrontier,goalParents,goalDepth,startDepth)
+        newFrontier=[]
+        best=None
+        for cell in frontier:
+            dist=depth[cell]+1
+            for linked in cell.getLinks():
+                if linked in depth:
+                    continue
+                parents[linked]=cell
+                depth[linked]=dist
+                newFrontier.append(linked)
+                if linked in otherDepth:
+                    #other meetings on this level may be shorter
+                    total=dist+otherDepth[linked]
+                    if best is None or total<best[0]:
+                        best=(total,linked)
+        if best is not None:
+            return _pathFromParents(start,best[1],startParents,goalParents)
+        if forward==True:
+            startFrontier=newFrontier
+        else:
+            goalFrontier=newFrontier
+    return None
+
+def _solveAStar(start: Cell, goal: Cell) -> Optional[List[Cell]]:
+    #A* with Manhattan distance, which never overestimates in a grid maze
+    parents={start:None}
+    cost={start:0}
+    #counter keeps heap entries comparable without comparing cells
+    counter=0
+    heap=[(abs(start.row-goal.row)+abs(start.column-goal.column),counter,start)]
+    while len(heap)>0:
+        (_,_,cell)=heapq.heappop(heap)
+        if cell==goal:
+            return _pathFromParents(start,goal,parents,{})
+        dist=cost[cell]+1
+        for linked in cell.getLinks():
+            if dist<cost.get(linked,dist+1):
+                cost[linked]=dist
+                parents[linked]=cell
+                counter=counter+1
+                estimate=dist+abs(linked.row-goal.row)+abs(linked.column-goal.column)
+                heapq.heappush(heap,(estimate,counter,linked))
+    return None
+
+def solve(grid: Grid, start: Cell, goal: Cell, method: str = "astar") -> Any:
+    """Find a shortest path between two cells.
+
+    Only as much of the maze is searched as is needed to find the path.
+    In braided mazes there may be several shortest paths, any of them
+    may be returned.
+
+    Args:
+        grid: Grid object with the maze
+        start: Start cell
+        goal: Goal cell
+        method: "astar" for A* search or "bidi" for bidirectional breadth
+            first search (default: "astar", which explores the least in
+            braided mazes)
+
+    Returns:
+        Tuple of (path, length) where path is Distances from start with
+        only the cells of the path, and length is the number of moves
+
+    Raises:
+        ValueError: If method is not known or there is no path
+    """
+    if method=="bidi":
+        cells=_solveBidirectional(start,goal)
+    elif method=="astar":
+        cells=_solveAStar(start,goal)
+    else:
+        raise ValueError("Unknown solve method: %s" % method)
+    if cells is None:
+        raise ValueError("No path from %s to %s" % (start.toString(),goal.toString()))
+    path=Distances(cells[0])
+    for distance,cell in enumerate(cells):
+        path.setDistanceTo(cell,distance)
+    return (path,len(cells)-1)
+
+#====================
+#distance oracle
+#Answers distance queries between any two cells without searching the
+#maze: exactly with lowest common ancestors when the maze is perfect
+#(a tree), and as bounds from landmark distances otherwise.
+
+class DistanceOracle:
+    """Precomputed distances for fast distance queries between cells.
+
+    Landmarks are chosen by farthest point: the first is cell (0,0) and
+    each next one is the cell farthest from the landmarks so far. On a
+    perfect maze the breadth first search tree from the first landmark is
+    the maze itself, and distances are exact using binary lifting to find
+    the lowest common ancestor in O(log n).
+
+    Exact O(log n) queries are only possible on perfect mazes. On braided
+    mazes landmarks give only lower and upper bounds (see bounds()). An
+    exact distance() whose bounds differ runs solve(), O(n) per query. Use
+    exact=False to get the upper bound without searching.
+
+    Attributes:
+        grid: The grid of the maze
+        perfect: Whether the maze is perfect, so that distances are exact
+        landmarks: Cell indices of landmarks
+        landmarkDistances: array('i') of distances from each landmark
+    """
+
+    def __init__(self, grid: Grid, landmarks: int = 4) -> None:
+        """Precompute landmark distances and ancestor tables.
+
+        Args:
+            grid: Grid object with the maze, all cells connected
+            landmarks: Number of landmarks (at least 1)
+        """
+        self.grid=grid
+        self.columns=grid.columns
+        size=grid.rows*grid.columns
+        masks=grid.linkMasks()
+        links=sum(LINK_COUNT[mask] for mask in masks)//2
+
+        self.landmarks=[]
+        self.landmarkDistances=[]
+        nearest=None
+        for _ in range(max(1,min(landmarks,size))):
+            index=0 if nearest is None else max(range(size),key=nearest.__getitem__)
+            distances=_maskDistances(masks,grid.rows,grid.columns,index)
+            self.landmarks.append(index)
+            self.landmarkDistances.append(distances)
+            if nearest is None:
+                nearest=array("i",distances)
+            else:
+                nearest=array("i",map(min,nearest,distances))
+
+        depth=self.landmarkDistances[0]
+        self.perfect=(links==size-1 and -1 not in depth)
+        self.ancestors=[]
+        if self.perfect==True:
+            self.depth=depth
+            self.ancestors.append(self._parents(masks,depth))
+            #ancestors[k][v] is the 2**k:th ancestor of v
+            while (1 << len(self.ancestors))<=max(depth):
+                previous=self.ancestors[-1]
+                self.ancestors.append(array("i",[previous[parent] for parent in previous]))
+
+    def _parents(self, masks: bytearray, depth: array) -> array:
+        #parent of each cell in the tree rooted at the first landmark,
+        #root is its own parent
+        columns=self.columns
+        offsets=((LINK_NORTH,-columns),(LINK_EAST,1),(LINK_SOUTH,columns),(LINK_WEST,-1))
+        parents=array("i",range(len(depth)))
+        for index,mask in enumerate(masks):
+            for bit,offset in offsets:
+                if mask & bit and depth[index+offset]<depth[index]:
+                    parents[index]=index+offset
                     break
+        return parents
+
+    def index(self, cell: Cell) -> int:
+        return cell.row*self.columns+cell.column
+
+    def _lowestCommonAncestor(self, a: int, b: int) -> int:
+        depth=self.depth
+        if depth[a]<depth[b]:
+            (a,b)=(b,a)
+        difference=depth[a]-depth[b]
+        k=0
+        while difference>0:
+            if difference & 1:
+                a=self.ancestors[k][a]
+            difference=difference >> 1
+            k=k+1
+        if a==b:
+            return a
+        for ancestors in reversed(self.ancestors):
+            if ancestors[a]!=ancestors[b]:
+                a=ancestors[a]
+                b=ancestors[b]
+        return self.ancestors[0][a]
+
+    def bounds(self, a: Cell, b: Cell) -> Any:
+        """Get lower and upper bound of the distance between two cells.
+
+        Bounds come from the triangle inequality over landmarks, O(number
+        of landmarks). Both are the exact distance on a perfect maze.
+
+        Args:
+            a: First cell
+            b: Second cell
+
+        Returns:
+            Tuple of (lower, upper)
+        """
+        if self.perfect==True:
+            distance=self.distance(a,b)
+            return (distance,distance)
+        i=self.index(a)
+        j=self.index(b)
+        lower=0
+        upper=None
+        for distances in self.landmarkDistances:
+            lower=max(lower,abs(distances[i]-distances[j]))
+            through=distances[i]+distances[j]
+            if upper is None or through<upper:
+                upper=through
+        return (lower,upper)
+
+    def distance(self, a: Cell, b: Cell, exact: bool = True) -> int:
+        """Get the distance between two cells.
+
+        O(log n) on a perfect maze. On other mazes the bounds are used
+        when they meet. Otherwise an exact distance needs solve(), which is
+        O(n), and an inexact distance is the upper bound.
+
+        Args:
+            a: First cell
+            b: Second cell
+            exact: If False, do not search on mazes that are not perfect
+
+        Returns:
+            Number of moves from a to b, or the length of a path through a
+            landmark if exact is False
+        """
+        i=self.index(a)
+        j=self.index(b)
+        if self.perfect==True:
+            depth=self.depth
+            return depth[i]+depth[j]-2*depth[self._lowestCommonAncestor(i,j)]
+        (lower,upper)=self.bounds(a,b)
+        if lower==upper or exact==False:
+            return upper
+        return solve(self.grid,a,b)[1]
+
+    def randomGoal(self, start: Cell, targetDistance: int, tolerance: int = 0,
+                   attempts: int = 1000, exact: bool = True) -> Any:
+        """Pick a random goal at about the given distance from start.
+
+        Random cells are tried until one is within tolerance of the target
+        distance. On mazes that are not perfect, cells whose bounds can not
+        be within tolerance are skipped without solving, and other cells
+        are solved with solve() unless exact is False.
+
+        Args:
+            start: Start cell
+            targetDistance: Wanted distance from start to goal
+            tolerance: Accepted difference from target distance
+            attempts: Maximum number of cells to try
+            exact: If False, use upper bounds instead of solving, see distance()
+
+        Returns:
+            Tuple of (goal, distance), the closest goal found
+        """
+        best=None
+        for _ in range(attempts):
+            goal=self.grid.randomCell()
+            (lower,upper)=self.bounds(start,goal)
+            if best is not None and (lower-targetDistance>=best[0] or targetDistance-upper>=best[0]):
+                continue
+            distance=upper if lower==upper or exact==False else solve(self.grid,start,goal)[1]
+            difference=abs(distance-targetDistance)
+            if best is None or difference<best[0]:
+                best=(difference,goal,distance)
+                if difference<=tolerance:
+                    break
+        return (best[1],best[2])
+
+#====================
+#vectorized generators
+#These draw all random decisions in one batch with NumPy and return a
+#2-D uint8 array of LINK_* bits. They use NumPy's random generator, so
+#mazes differ from initMaze() mazes for the same seed.
+
+def _requireNumpy() -> None:
+    if numpy is None:
+        raise ImportError("NumPy is required for vectorized maze generation")
+
+def _randomBits(rng: Any, rows: int, columns: int) -> Any:
+    #random booleans, drawn as packed bytes which is faster than
+    #drawing one integer per cell
+    packed=rng.integers(0,256,size=(rows,(columns+7)//8),dtype=numpy.uint8)
+    return numpy.unpackbits(packed,axis=1,count=columns).view(bool)
+
+def _linkMasks(north: Any, east: Any) -> Any:
+    #combine boolean north and east link arrays to LINK_* bitmasks,
+    #setting also the opposite bits of the linked neighbors
+    masks=north.view(numpy.uint8)*numpy.uint8(LINK_NORTH)
+    masks|=east.view(numpy.uint8)*numpy.uint8(LINK_EAST)
+    masks[:-1]|=north[1:].view(numpy.uint8)*numpy.uint8(LINK_SOUTH)
+    masks[:,1:]|=east[:,:-1].view(numpy.uint8)*numpy.uint8(LINK_WEST)
+    return masks
+
+def initBinaryTreeMasks(rows: int, columns: int, seed: Optional[int] = None) -> Any:
+    """Generate a Binary Tree maze as an array of link bitmasks.
+
+    Args:
+        rows: Number of rows in the maze
+        columns: Number of columns in the maze
+        seed: Seed for NumPy random generator (default: None)
+
+    Returns:
+        NumPy uint8 array of shape (rows, columns) with LINK_* bits
 
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    _requireNumpy()
+    rng=numpy.random.default_rng(seed)
+    hasNorth=(numpy.arange(rows)>0)[:,None]
+    hasEast=(numpy.arange(columns)<columns-1)[None,:]
+    coin=_randomBits(rng,rows,columns)
+    #link north when it is the only choice or coin says so, otherwise east
+    north=hasNorth & (~hasEast | coin)
+    east=hasEast & ~north
+    return _linkMasks(north,east)
+
+def initSidewinderMasks(rows: int, columns: int, seed: Optional[int] = None) -> Any:
+    """Generate a Sidewinder maze as an array of link bitmasks.
+
+    Args:
+        rows: Number of rows in the maze
+        columns: Number of columns in the maze
+        seed: Seed for NumPy random generator (default: None)
+
+    Returns:
+        NumPy uint8 array of shape (rows, columns) with LINK_* bits
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    _requireNumpy()
+    if rows==0 or columns==0:
+        #no cells, no runs
+        return numpy.zeros((rows,columns),dtype=numpy.uint8)
+    rng=numpy.random.default_rng(seed)
+    atEastern=(numpy.arange(columns)==columns-1)[None,:]
+    atNorthern=(numpy.arange(rows)==0)[:,None]
+    coin=_randomBits(rng,rows,columns)
+    closeOut=atEastern | (~atNorthern & coin)
+
+    #runs end at close out cells, last column always closes out so
+    #runs never continue to next row
+    indexType=numpy.int32 if rows*columns<2**31 else numpy.int64
+    runEnd=numpy.flatnonzero(closeOut).astype(indexType)
+    runStart=numpy.empty_like(runEnd)
+    runStart[0]=0
+    runStart[1:]=runEnd[:-1]
+    runStart[1:]+=1
+    lengths=(runEnd-runStart+1).astype(numpy.float32)
+    offset=(rng.random(len(runEnd),dtype=numpy.float32)*lengths).astype(indexType)
+    #float32 rounding may give offset equal to run length
+    member=numpy.minimum(runStart+offset,runEnd)
+    #members in the first row have no north neighbor
+    member=member[member>=columns]
+    north=numpy.zeros(rows*columns,dtype=bool)
+    north[member]=True
+    return _linkMasks(north.reshape(rows,columns),~closeOut)
+
+def initMazeFromMasks(masks: Any, cellClass: Optional[Type[Cell]] = None, gridClass: Type[Grid] = CompactGrid,
+                      algorithm: Optional[str] = None) -> Grid:
+    """Initialize a maze from rows of link bitmasks.
+
+    Copying to a CompactGrid is a plain memory copy, other grid classes
+    link their cells one by one.
+
+    Args:
+        masks: 2-D NumPy array or sequence of byte rows with LINK_* bits
+        cellClass: Cell class to use (default: the grid class default)
+        gridClass: Grid class to use (default: CompactGrid)
+        algorithm: Algorithm key of the maze, if known
+
+    Returns:
+        Grid object with the maze
+    """
+    maskRows=[bytes(row) for row in masks] if not (numpy is not None and isinstance(masks,numpy.ndarray)) else masks
+    rows=len(maskRows)
+    columns=len(maskRows[0]) if rows>0 else 0
+    if cellClass is None:
+        grid=gridClass(rows,columns)
+    else:
+        grid=gridClass(rows,columns,cellClass)
+
+    if numpy is not None and isinstance(maskRows,numpy.ndarray):
+        applyLinkMasks(grid,maskRows.astype(numpy.uint8).tobytes())
+    else:
+        applyLinkMasks(grid,b"".join(maskRows))
+
+    if algorithm is not None:
+        grid.algorithm=MAZE_ALGORITHMS[algorithm]
+        grid.algorithm_key=algorithm
+    return grid
+
+#====================
+#algorithm registry
+
+class MazeAlgorithm:
+    """A registered maze generation algorithm and its properties.
+
+    Attributes:
+        key: Short key of the algorithm, used in saved mazes
+        name: Name of the algorithm
+        function: Function that generates a maze to a grid and returns it
+        complexity: Expected time complexity
+        bias: Texture bias of generated mazes
+        vectorized: Function(rows, columns, seed) returning link bitmasks,
+            or None
+        streaming: Function(columns) yielding rows of link bitmasks, or None
+        randomPool: Whether the algorithm is chosen by random level
+            generation
+    """
+
+    def __init__(self, key: str, name: str, function: Any, complexity: str = "", bias: str = "",
+                 vectorized: Any = None, streaming: Any = None, randomPool: bool = False) -> None:
+        self.key=key
+        self.name=name
+        self.function=function
+        self.complexity=complexity
+        self.bias=bias
+        self.vectorized=vectorized
+        self.streaming=streaming
+        self.randomPool=randomPool
+
+    def __repr__(self) -> str:
+        return "MazeAlgorithm(%s, %s)" % (self.key,self.name)
+
+def registerAlgorithm(key: str, name: str, function: Any, complexity: str = "", bias: str = "",
+                      vectorized: Any = None, streaming: Any = None,
+                      randomPool: bool = False) -> MazeAlgorithm:
+    """Register a maze generation algorithm.
+
+    Random level generation chooses from the random pool in registration
+    order, so adding an algorithm to the pool changes mazes of existing
+    seeds. New algorithms are registered outside of the pool by default.
+
+    Args:
+        key: Short key of the algorithm
+        name: Name of the algorithm
+        function: Function(grid) that generates the maze and returns the grid
+        complexity: Expected time complexity, for example "O(n)"
+        bias: Texture bias of generated mazes
+        vectorized: Function(rows, columns, seed) returning link bitmasks
+        streaming: Function(columns) yielding rows of link bitmasks
+        randomPool: Whether random level generation may choose the algorithm
+
+    Returns:
+        The registered MazeAlgorithm
+
+    Raises:
+        ValueError: If key is already registered
+    """
+    if key in MAZE_REGISTRY:
+        raise ValueError("Maze algorithm already registered: %s" % key)
+    algorithm=MazeAlgorithm(key,name,function,complexity,bias,vectorized,streaming,randomPool)
+    MAZE_REGISTRY[key]=algorithm
+    MAZE_ALGORITHMS[key]=name
+    MAZE_ALGORITHMS_DESC.append("%s=%s" % (key,name))
+    return algorithm
+
+def getAlgorithm(key: str) -> MazeAlgorithm:
+    """Get a registered algorithm.
+
+    Raises:
+        ValueError: If algorithm is not registered
+    """
+    try:
+        return MAZE_REGISTRY[key]
+    except KeyError:
+        raise ValueError("Unknown maze algorithm: %s" % key) from None
+
+def randomAlgorithmKeys() -> List[str]:
+    """Get keys of algorithms in the random pool, in registration order."""
+    return [key for key,algorithm in MAZE_REGISTRY.items() if algorithm.randomPool]
+
+def streamingAlgorithmKeys() -> List[str]:
+    """Get keys of algorithms that generate rows one at a time, in registration order."""
+    return [key for key,algorithm in MAZE_REGISTRY.items() if algorithm.streaming is not None]
+
+def initStreamingMaze(algorithm: str, rows: int, columns: int,
+                      cellClass: Type[Cell] = CellView, climbable: bool = False) -> WindowGrid:
+    """Initialize a window to an endless maze of a row-local algorithm.
+
+    Args:
+        algorithm: Key of an algorithm with a streaming function
+        rows: Number of rows in the window
+        columns: Number of columns
+        cellClass: CellView subclass to use for views
+        climbable: Add links so that the newest row can be reached from
+            any cell of the window, see climbableRows
+
+    Returns:
+        WindowGrid filled with the first rows
+
+    Raises:
+        ValueError: If algorithm is not registered or can not stream rows
+    """
+    registered=getAlgorithm(algorithm)
+    if registered.streaming is None:
+        raise ValueError("Maze algorithm can not stream rows: %s" % algorithm)
+    rowSource=registered.streaming(columns)
+    if climbable:
+        rowSource=climbableRows(rowSource)
+    grid=WindowGrid(rowSource,rows,columns,cellClass)
+    grid.algorithm=registered.name
+    grid.algorithm_key=algorithm
     return grid
 
+#the random pool and its order must not change: levels choose the
+#algorithm with random.choice from this list
+registerAlgorithm("AB","Aldous Broder",initAldousBroderMaze,"random walk cover time, unbounded worst case",
+                  "unbiased",randomPool=True)
+registerAlgorithm("BT","Binary Tree",initBinaryTreeMaze,"O(n)",
+                  "diagonal, open north row and east column",vectorized=initBinaryTreeMasks,
+                  streaming=binaryTreeRows,randomPool=True)
+registerAlgorithm("HK","Hunt And Kill",initHuntAndKillMaze,"O(n log n)",
+                  "long corridors, few dead ends",randomPool=True)
+registerAlgorithm("RB","Recursive Backtracker",initRecursiveBacktrackerMaze,"O(n)",
+                  "long winding corridors, few dead ends",randomPool=True)
+registerAlgorithm("S","Sidewinder",initSidewinderMaze,"O(n)",
+                  "vertical, open north row",vectorized=initSidewinderMasks,
+                  streaming=sidewinderRows,randomPool=True)
+registerAlgorithm("W","Wilson",initWilsonMaze,"loop-erased random walks, unbounded worst case",
+                  "unbiased",randomPool=True)
+
+registerAlgorithm("K","Kruskal",initKruskalMaze,"O(n α(n))","many short dead ends")
+registerAlgorithm("P","Prim",initPrimMaze,"O(n)","radial, many short dead ends")
+registerAlgorithm("E","Eller",initEllerMaze,"O(n), O(columns) memory","horizontal, like Sidewinder",
+                  streaming=ellerRows)
+
 def printGrid(grid: Grid, withDistance: bool = False) -> None:
     print("%s Maze" % grid.algorithm)
     print("Deadends: %d" % len(grid.getDeadEndCells()))
@@ -712,7 +3162,7 @@ def printGrid(grid: Grid, withDistance: bool = False) -> None:
         goalRow=grid.rows-1#random.randint(0, rows-1)
         goalColumn=grid.columns-1#random.randint(0, columns-1)
         goal= grid.getCell(goalRow,goalColumn)
-        distances = start.getDistances()
+        distances = grid.getDistances(start)
         grid.distances = distances.pathTo(goal)
         print("Start: ", start.toString())
         print("Goal: ", goal.toString())
@@ -38,14 +38,19 @@ from typing import List, Optional, Any
 from .globals import (
     NAME, DESCRIPTION, COPYRIGHT, LICENSE,
     MIN_SCROLL_ROWS, MIN_SCROLL_COLS,
-    FULLSCREEN_MIN_ROWS, FULLSCREEN_MIN_COLS
+    FULLSCREEN_MIN_ROWS, FULLSCREEN_MIN_COLS,
+    MAZE_ROWS, MAZE_COLS, MAZE_BRAID, DEFAULT_FRAME_RATE
 )
 from .mazepy import mazepy
 from .curses_utils import curses_utils
 from .utils import utils
-from .highscores import getGameMoves, getMazeInfo, saveScores, listHighScores
+from .highscores import (
+    getGameMoves, getMazeInfo, saveScores, listHighScores, migrateMazes, exportThumbnails
+)
 from .gameclasses import Player, Goal, MazingCell, GameGrid
 from .GameScreen import GameScreen
+from .generate import runGenerate
+from .benchmark import DEFAULT_BENCHMARK_SIZES, GRID_CLASSES, runBenchmark
 
 # Configure logging - write to file to avoid interfering with curses display
 import os
@@ -61,6 +66,14 @@ logger = logging.getLogger(__name__)
 # Command line args (global for compatibility)
 args: Optional[argparse.Namespace] = None
 
+# Movement keys and directions
+MOVE_KEYS = {
+    curses.KEY_UP: 'up', ord('w'): 'up',
+    curses.KEY_DOWN: 'down', ord('s'): 'down',
+    curses.KEY_LEFT: 'left', ord('a'): 'left',
+    curses.KEY_RIGHT: 'right', ord('d'): 'right',
+}
+
 
 def parseCommandLineArgs() -> None:
     """Parse command line arguments."""
@@ -95,22 +108,149 @@ def parseCommandLineArgs() -> None:
         action='store_true',
         help='Show entire maze. Remember: this is cheating.'
     )
+    parser.add_argument(
+        '--hard',
+        action='store_true',
+        help='Hard mode. Player and X are at the ends of the longest path in the maze.'
+    )
+    parser.add_argument(
+        '--climb',
+        action='store_true',
+        help='Endless climb. Maze is generated as you go up, climb as high as you can. '
+             'Scores are not saved.'
+    )
+    parser.add_argument(
+        '--fps',
+        type=int,
+        default=DEFAULT_FRAME_RATE,
+        metavar='FPS',
+        help='Maximum screen updates per second, 0 for no limit. '
+             'Default is %d.' % DEFAULT_FRAME_RATE
+    )
     parser.add_argument(
         '-hs', '--highscores',
         action='store_true',
-        help='Show high scores. Specify --level to select scores for the level '
-             'and --cheat to include cheat scores.'
+        help='Show high scores. Specify --level to select scores for the level, '
+             '--hard for hard mode scores and --cheat to include cheat scores.'
     )
     parser.add_argument(
         '--cheat',
         action='store_true',
         help='Show also cheat highscores.'
     )
+    parser.add_argument(
+        '--thumbnails',
+        nargs=1,
+        metavar='DIR',
+        help='Write an image of the maze of each level in high score file to directory.'
+    )
+    parser.add_argument(
+        '--migratedb',
+        action='store_true',
+        help='Convert mazes saved by older versions in high score file to '
+             'compact binary format.'
+    )
+    parser.add_argument(
+        '--jsonmazes',
+        action='store_true',
+        help='Save mazes to high score file also in the format of older versions, '
+             'so that they can show them.'
+    )
+    parser.add_argument(
+        '--compactdb',
+        action='store_true',
+        help='With --migratedb, remove mazes in the format of older versions from '
+             'high score file and compact the file. Older versions can not show '
+             'these mazes after this.'
+    )
     parser.add_argument(
         '-v', '--version',
         action='store_true',
         help='Show version info.'
     )
+
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    generateParser = subparsers.add_parser(
+        'generate',
+        help='Pre-generate levels to the level cache.',
+        description='Pre-generate levels in parallel and save mazes, starts, goals '
+                    'and shortest paths to the level cache used by the game.'
+    )
+    generateParser.add_argument(
+        'levels',
+        metavar='LEVELS',
+        help='Levels to generate, for example 1-1000 or 5,42,100-199.'
+    )
+    generateParser.add_argument(
+        '-o', '--output',
+        default=None,
+        metavar='FILE',
+        help='Level cache file. Default is the level cache of the game.'
+    )
+    generateParser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Number of worker processes. Default is number of CPUs.'
+    )
+    generateParser.add_argument(
+        '--rows',
+        type=int,
+        default=MAZE_ROWS,
+        help=f'Maze rows. Default is {MAZE_ROWS}.'
+    )
+    generateParser.add_argument(
+        '--columns',
+        type=int,
+        default=MAZE_COLS,
+        help=f'Maze columns. Default is {MAZE_COLS}.'
+    )
+    generateParser.add_argument(
+        '--braid',
+        type=float,
+        default=MAZE_BRAID,
+        help=f'Braiding factor 0.0-1.0. Default is {MAZE_BRAID}.'
+    )
+    generateParser.add_argument(
+        '--hard',
+        action='store_true',
+        help='Generate hard mode levels.'
+    )
+    benchmarkParser = subparsers.add_parser(
+        'benchmark',
+        help='Time maze algorithms.',
+        description='Time each registered maze algorithm across grid sizes.'
+    )
+    benchmarkParser.add_argument(
+        '-s', '--sizes',
+        default=DEFAULT_BENCHMARK_SIZES,
+        help=f'Grid sizes as ROWSxCOLUMNS list. Default is {DEFAULT_BENCHMARK_SIZES}.'
+    )
+    benchmarkParser.add_argument(
+        '-a', '--algorithms',
+        default=None,
+        metavar='KEYS',
+        help='Comma separated algorithm keys. Default is all algorithms.'
+    )
+    benchmarkParser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        metavar='N',
+        help='Runs per algorithm and size, best time is shown. Default is 3.'
+    )
+    benchmarkParser.add_argument(
+        '--grid',
+        choices=sorted(GRID_CLASSES.keys()),
+        default='grid',
+        help='Grid class to use. Default is grid.'
+    )
+    benchmarkParser.add_argument(
+        '-l', '--list',
+        action='store_true',
+        help='List registered algorithms and their properties.'
+    )
     
     global args
     args = parser.parse_args()
@@ -126,6 +266,73 @@ def getHelpLine() -> str:
     return "Use cursor keys to move and 'q' to quit."
 
 
+def readKeys(stdscr: Any, timeout: int) -> List[int]:
+    """Wait for a key and read all keys pending after it.
+
+    Args:
+        stdscr: Curses standard screen object
+        timeout: Milliseconds to wait for the first key
+
+    Returns:
+        Keys in the order they were pressed, empty if no key was pressed
+    """
+    keys: List[int] = []
+    stdscr.timeout(timeout)
+    c = stdscr.getch()
+    if c == -1:
+        return keys
+    stdscr.nodelay(True)
+    while c != -1:
+        keys.append(c)
+        c = stdscr.getch()
+    stdscr.timeout(timeout)
+    return keys
+
+
+def handleKeys(stdscr: Any, gameScreen: GameScreen, keys: List[int]) -> bool:
+    """Apply keys read with readKeys and show the result in one frame.
+
+    Args:
+        stdscr: Curses standard screen object
+        gameScreen: Game screen
+        keys: Keys in the order they were pressed
+
+    Returns:
+        True if the player quit the game
+    """
+    quitGame=False
+    for c in keys:
+        if c in MOVE_KEYS:
+            gameScreen.applyMove(MOVE_KEYS[c])
+            if gameScreen.atGoal():
+                #keys after reaching 'X' are ignored
+                break
+        elif c == ord('h'):
+            gameScreen.updateStatusLine(getHelpLine())
+        elif c== ord('i'):
+            #info
+            player=gameScreen.player
+            #gameScreen.gamepad.cursyncup()
+            (screenRow,screenColumn)=gameScreen.gamepad.getyx()
+            #gameScreen.updateStatusLine("%s screen: (%d,%d) pad corner: (%d,%d)" % (player.__str__(),screenRow,screenColumn,gameScreen.padCornerRow,gameScreen.padCornerColumn))
+            gameScreen.updateStatusLine("%s" % (player))
+        elif c== ord('I'):
+            player=gameScreen.player
+            (screenRow,screenColumn)=stdscr.getyx()
+            gameScreen.updateStatusLine("%s screen: (%d,%d) pad corner: (%d,%d)" % (player.__str__(),screenRow,screenColumn,gameScreen.padCornerRow,gameScreen.padCornerColumn))
+            #gameScreen.updateStatusLine("Screen row,col: (%d,%d)" % (screenRow,screenColumn))
+        elif c== ord('T'):
+            #stdscr.deleteln()
+            #stdscr.insdelln(2)
+            curses_utils.infoWindow(stdscr,line1="This is line1",line2="line 2",line3="Then line 3",line4="and line4")
+            gameScreen.updateStatusLine("Test: %d" % random.randint(1,99999))
+        elif c == ord('q'):
+            quitGame=True
+            break
+    gameScreen.render()
+    return quitGame
+
+
 def start(stdscr: Any, textList: List[str]) -> None:
     """Start the game.
     
@@ -174,6 +381,8 @@ def start(stdscr: Any, textList: List[str]) -> None:
     line1="Welcome to MazinGame!"
     if replayGameId is not None:
         line3="REPLAY: game %d" % replayGameId
+    elif args.climb:
+        line3="Climb as high as you can."
     else:
         line3="'X' marks the spot. Go there."
     
@@ -234,47 +443,31 @@ def start(stdscr: Any, textList: List[str]) -> None:
     else:
         logger.info(f"Starting new game with level: {level}")
         gameScreen.initGame(level)
-        while 1:
-            if gameScreen.gameover==False:
-                c = stdscr.getch()
-            else:
+        quitGame=False
+        while not quitGame:
+            if gameScreen.gameover==True:
                 logger.info("Game completed successfully")
                 break
-            if c == ord('h'):
-                gameScreen.updateStatusLine(getHelpLine())
-            elif c == curses.KEY_UP or c== ord('w'):
-                gameScreen.movePlayer('up')
-            elif c == curses.KEY_DOWN or c== ord('s'):
-                gameScreen.movePlayer('down')
-            elif c == curses.KEY_LEFT or c== ord('a'):
-                gameScreen.movePlayer('left')
-            elif c == curses.KEY_RIGHT or c== ord('d'):
-                gameScreen.movePlayer('right')
-            elif c== ord('i'):
-                #info
-                player=gameScreen.player
-                #gameScreen.gamepad.cursyncup()
-                (screenRow,screenColumn)=gameScreen.gamepad.getyx()
-                #gameScreen.updateStatusLine("%s screen: (%d,%d) pad corner: (%d,%d)" % (player.__str__(),screenRow,screenColumn,gameScreen.padCornerRow,gameScreen.padCornerColumn))
-                gameScreen.updateStatusLine("%s" % (player))
-            elif c== ord('I'):
-                player=gameScreen.player
-                (screenRow,screenColumn)=stdscr.getyx()
-                gameScreen.updateStatusLine("%s screen: (%d,%d) pad corner: (%d,%d)" % (player.__str__(),screenRow,screenColumn,gameScreen.padCornerRow,gameScreen.padCornerColumn))
-                #gameScreen.updateStatusLine("Screen row,col: (%d,%d)" % (screenRow,screenColumn))
-            elif c== ord('T'):
-                #stdscr.deleteln()
-                #stdscr.insdelln(2)
-                infoWindow(stdscr,line1="This is line1",line2="line 2",line3="Then line 3",line4="and line4")
-                gameScreen.updateStatusLine("Test: %d" % random.randint(1,99999))
-            elif c == ord('q'):
-                #utils.debug(time.mktime(time.gmtime()))            
-                break  # Exit the while()
+            #wake up to show moves and elapsed time not yet on screen
+            keys=readKeys(stdscr,gameScreen.idleTimeout())
+            if not keys:
+                gameScreen.tick()
+                continue
+            #all pending keys are applied and shown in one frame
+            quitGame=handleKeys(stdscr,gameScreen,keys)
 
     if cursorVisibility>-1:
         curses.curs_set(cursorVisibility)
 
-    if not (replayGameId is not None):
+    if args.climb:
+        gameScreen.calculateScore(False)
+        textList.append("Endless climb:")
+        textList.append("  Level    : %d" % gameScreen.level)
+        textList.append("  Algorithm: %s" % gameScreen.grid.algorithm)
+        textList.append("  Climbed  : %d" % gameScreen.climbed)
+        textList.append("  Moves    : %d" % gameScreen.totalMoves)
+        textList.append("  Elapsed  : %.03fsecs" % gameScreen.elapsed)
+    elif not (replayGameId is not None):
         if gameScreen.gameover==True:
             cheat=False
             if args.showpath or args.showmaze:
@@ -291,6 +484,8 @@ def start(stdscr: Any, textList: List[str]) -> None:
             textList.append("  Moves    : %d/%d" % (gameScreen.totalMoves,gameScreen.shortestPathLength))
             textList.append("  Elapsed  : %.03fsecs" % gameScreen.elapsed)
             textList.append("  Score    : %d" % gameScreen.score)
+            if args.hard:
+                textList.append("  --hard mode was active.")
             if args.showpath:
                 textList.append("  --showpath cheat was active.")
             if args.showmaze:
@@ -306,12 +501,37 @@ def main() -> None:
     try:
         parseCommandLineArgs()
         logger.info("MazinGame started")
+
+        if args.command == 'generate':
+            logger.info(f"Generating levels: {args.levels}")
+            runGenerate(args)
+            return
+
+        if args.command == 'benchmark':
+            runBenchmark(args)
+            return
         
         if args.highscores:
             logger.info("Displaying high scores")
             listHighScores(args)
             return
             
+        if args.thumbnails:
+            count = exportThumbnails(args.thumbnails[0])
+            if count < 0:
+                print("No high score file.")
+            else:
+                print("Wrote %d thumbnails to %s." % (count, args.thumbnails[0]))
+            return
+            
+        if args.migratedb:
+            count = migrateMazes(args.compactdb)
+            if count < 0:
+                print("No high score file.")
+            else:
+                print("Migrated %d mazes." % count)
+            return
+            
         if args.version:
             print("%s v%s" % (NAME,__version__))
             print("")
@@ -321,6 +541,10 @@ def main() -> None:
             print(LICENSE)
             return
             
+        if args.replay and args.climb:
+            print("Can not replay endless climb.")
+            return
+
         if args.replay:
             replayGameId=args.replay[0]
             logger.info(f"Replaying game ID: {replayGameId}")
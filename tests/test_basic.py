@@ -42,6 +42,31 @@ def test_goal_class():
     assert goal.screenColumn == 15
 
 
+def test_read_keys():
+    """Test that all pending keys are read at once."""
+    from mazingame.mazingame import readKeys
+
+    class FakeScreen:
+        def __init__(self, keys):
+            self.keys = list(keys)
+            self.timeouts = []
+
+        def timeout(self, delay):
+            self.timeouts.append(delay)
+
+        def nodelay(self, flag):
+            self.timeouts.append(0 if flag else -1)
+
+        def getch(self):
+            return self.keys.pop(0) if self.keys else -1
+
+    screen = FakeScreen([ord("w"), ord("w"), ord("a")])
+    assert readKeys(screen, 33) == [ord("w"), ord("w"), ord("a")]
+    # Waits for the first key only, timeout is restored
+    assert screen.timeouts == [33, 0, 33]
+    assert readKeys(screen, 33) == []
+
+
 # Placeholder for more comprehensive tests
 # These will need to be expanded based on actual game logic
 
@@ -0,0 +1,32 @@
+"""Tests for the maze algorithm benchmark."""
+import argparse
+
+import pytest
+
+from mazingame import benchmark
+
+
+def test_parse_sizes():
+    """Test size specification parsing."""
+    assert benchmark.parseSizes("20x25, 3X4") == [(20, 25), (3, 4)]
+    for spec in ("", "20", "0x5", "ax5"):
+        with pytest.raises(ValueError):
+            benchmark.parseSizes(spec)
+
+
+def test_benchmark_algorithms():
+    """Test that each algorithm and size gets a timing."""
+    results = benchmark.benchmarkAlgorithms([(4, 5), (6, 3)], repeat=1, keys=["BT", "RB"])
+    assert {(r["key"], r["rows"], r["columns"]) for r in results} == {
+        ("BT", 4, 5), ("RB", 4, 5), ("BT", 6, 3), ("RB", 6, 3)}
+    assert all(r["seconds"] >= 0 for r in results)
+
+
+@pytest.mark.parametrize("repeat", [0, -1])
+def test_benchmark_invalid_repeat(repeat, capsys):
+    """Test that repeat less than 1 is rejected."""
+    with pytest.raises(ValueError):
+        benchmark.benchmarkAlgorithms([(4, 5)], repeat=repeat, keys=["BT"])
+    args = argparse.Namespace(list=False, sizes="4x5", algorithms="BT", repeat=repeat, grid="grid")
+    benchmark.runBenchmark(args)
+    assert capsys.readouterr().out.startswith("Invalid benchmark: ")
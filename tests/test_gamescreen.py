@@ -0,0 +1,348 @@
+"""Tests for GameScreen rendering, with fake curses windows."""
+import argparse
+
+import pytest
+
+from mazingame import GameScreen as gamescreen
+from mazingame.mazingame import MOVE_KEYS, handleKeys, readKeys
+from mazingame.globals import MAZE_ROWS, PAD_COLS, PAD_ROWS
+
+
+class FakeWindow:
+    """Curses window that keeps its characters in lists."""
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.lines = [[" "] * columns for _ in range(rows)]
+        self.calls = []
+
+    def addstr(self, row, column, text):
+        self.calls.append(("addstr", row, column, text))
+        for offset, character in enumerate(text):
+            if column + offset < self.columns:
+                self.lines[row][column + offset] = character
+
+    def addch(self, row, column, character):
+        self.calls.append(("addch", row, column, character))
+        self.lines[row][column] = chr(character)
+
+    def inch(self, row, column):
+        self.calls.append(("inch", row, column))
+        return ord(self.lines[row][column])
+
+    def getmaxyx(self):
+        return (self.rows, self.columns)
+
+    def refresh(self, *args):
+        self.calls.append(("refresh",) + args)
+
+    def noutrefresh(self, *args):
+        self.calls.append(("noutrefresh",) + args)
+
+    def move(self, row, column):
+        self.cursor = (row, column)
+
+    def clrtoeol(self):
+        (row, column) = self.cursor
+        self.lines[row][column:] = [" "] * (self.columns - column)
+
+    def setscrreg(self, top, bottom):
+        self.region = (top, bottom)
+
+    def scrollok(self, flag):
+        self.scrolling = flag
+
+    def scroll(self, rows):
+        assert self.scrolling
+        (top, bottom) = self.region
+        lines = self.lines[top:bottom + 1]
+        blank = [[" "] * self.columns for _ in range(-rows)]
+        self.lines[top:bottom + 1] = blank + lines[:len(lines) + rows]
+
+    def timeout(self, delay):
+        self.delay = delay
+
+    def nodelay(self, flag):
+        self.delay = 0 if flag else -1
+
+    def getch(self):
+        return self.keys.pop(0) if getattr(self, "keys", None) else -1
+
+    def text(self, rows=None):
+        return ["".join(line) for line in self.lines[:rows]]
+
+
+def shadowText(screen):
+    return [line.decode() for line in screen.shadow]
+
+
+def makeGameScreen(monkeypatch, tmp_path, level=42, **options):
+    monkeypatch.setenv("MAZINGAME_CACHE_FILE", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(gamescreen.curses, "newpad", FakeWindow)
+    updates = []
+    monkeypatch.setattr(gamescreen.curses, "doupdate", lambda: updates.append(1))
+    args = argparse.Namespace(climb=False, replay=None, showpath=False, showmaze=False, hard=False,
+                              fps=0)
+    for name, value in options.items():
+        setattr(args, name, value)
+    screen = gamescreen.GameScreen(FakeWindow(50, 110), False, args, 50, 110)
+    screen.initGame(level)
+    screen.updates = updates
+    return screen
+
+
+def test_frame_is_drawn_one_line_at_a_time(monkeypatch, tmp_path):
+    """Test that game start draws the pad with one call per pad row."""
+    screen = makeGameScreen(monkeypatch, tmp_path, showmaze=True, showpath=True)
+    frame = screen.composeFrame()
+    assert len(frame) == PAD_ROWS
+    assert all(len(line) == PAD_COLS for line in frame)
+    assert [call[0] for call in screen.gamepad.calls[:PAD_ROWS]] == ["addstr"] * PAD_ROWS
+    # Walls are the same as in the text maze
+    walls = screen.grid.asciiStr().split("\n")[:MAZE_ROWS * 2 + 1]
+    for (line, wallLine) in zip(frame, walls):
+        assert line.replace("*", " ").replace("X", " ") == wallLine
+    goal = screen.goal
+    assert frame[goal.screenRow][goal.screenColumn] == "X"
+    assert sum(line.count("*") for line in frame) == screen.shortestPathLength
+
+
+def test_hard_mode_start_is_drawn_at_player(monkeypatch, tmp_path):
+    """Test that player starting above the bottom row is drawn to its own row."""
+    screen = makeGameScreen(monkeypatch, tmp_path, level=7, hard=True)
+    player = screen.player
+    assert player.row < MAZE_ROWS - 1
+    assert player.screenRow == player.row * 2 + 1
+    assert screen.gamepad.lines[player.screenRow][player.screenColumn] == "@"
+    assert screen.padCornerRow <= player.screenRow < screen.padCornerRow + screen.screenRows
+
+
+@pytest.mark.parametrize("showmaze", [False, True])
+def test_frame_without_path(monkeypatch, tmp_path, showmaze):
+    """Test that only the goal is drawn without cheats."""
+    screen = makeGameScreen(monkeypatch, tmp_path, showmaze=showmaze)
+    frame = screen.composeFrame()
+    assert "*" not in "".join(frame)
+    if not showmaze:
+        assert "".join(frame).strip() == "X"
+
+
+@pytest.mark.parametrize("showmaze", [False, True])
+def test_moves_use_shadow_buffer(monkeypatch, tmp_path, showmaze):
+    """Test that moves never read the pad and only write changes."""
+    screen = makeGameScreen(monkeypatch, tmp_path, showmaze=showmaze)
+    pad = screen.gamepad
+    for direction in ["up", "left", "up", "right", "down", "up", "up", "left"] * 5:
+        before = shadowText(screen)
+        del pad.calls[:]
+        screen.movePlayer(direction)
+        writes = [call for call in pad.calls if call[0] == "addstr"]
+        assert "inch" not in [call[0] for call in pad.calls]
+        # Every write changes a character
+        for (_, row, column, character) in writes:
+            assert before[row][column] != character
+        assert len(writes) == len(set((row, column) for (_, row, column, _) in writes))
+    assert pad.text() == shadowText(screen)
+    player = screen.player
+    assert screen.shadow[player.screenRow][player.screenColumn] == ord("@")
+
+
+def test_climb_scrolls_shadow_buffer(monkeypatch, tmp_path):
+    """Test that shadow buffer follows the pad when the maze grows."""
+    screen = makeGameScreen(monkeypatch, tmp_path, climb=True, showmaze=True)
+    player = screen.player
+    # Pretend that the player has climbed near the top
+    player.row = 2
+    player.screenRow = player.row * 2 + 1
+    screen.climb()
+    assert screen.grid.rowsGenerated == MAZE_ROWS + 8
+    assert screen.gamepad.text() == shadowText(screen)
+    walls = screen.grid.asciiStr().split("\n")[:MAZE_ROWS * 2 + 1]
+    assert shadowText(screen)[:MAZE_ROWS * 2 + 1] == walls
+
+
+def test_move_refreshes_dirty_area(monkeypatch, tmp_path):
+    """Test that a move copies only changed pad area and updates terminal once."""
+    screen = makeGameScreen(monkeypatch, tmp_path)
+    pad = screen.gamepad
+    player = screen.player
+    checked = 0
+    for direction in ["up", "left", "right", "down", "up", "up", "right", "left"] * 3:
+        (row, column) = (player.screenRow, player.screenColumn)
+        corner = (screen.padCornerRow, screen.padCornerColumn)
+        del pad.calls[:]
+        del screen.stdscr.calls[:]
+        del screen.updates[:]
+        screen.movePlayer(direction)
+        calls = pad.calls + screen.stdscr.calls
+        assert "refresh" not in [call[0] for call in calls]
+        if (row, column) == (player.screenRow, player.screenColumn):
+            # Wall, nothing to show
+            assert screen.updates == []
+            continue
+        assert len(screen.updates) == 1
+        if corner != (screen.padCornerRow, screen.padCornerColumn):
+            continue
+        refreshes = [call for call in pad.calls if call[0] == "noutrefresh"]
+        assert len(refreshes) == 1
+        (_, top, left, screenTop, screenLeft, bottom, right) = refreshes[0]
+        # Old and new location of the player, with the walls between them
+        assert bottom - screenTop <= 2 and right - screenLeft <= 2
+        rows = (min(row, player.screenRow), max(row, player.screenRow))
+        columns = (min(column, player.screenColumn), max(column, player.screenColumn))
+        assert top <= rows[0] and top + bottom - screenTop >= rows[1]
+        assert left <= columns[0] and left + right - screenLeft >= columns[1]
+        checked += 1
+    assert checked > 0
+    assert screen.dirtyRect is None
+
+
+def test_moves_are_coalesced_to_frames(monkeypatch, tmp_path):
+    """Test that moves made within a frame interval are shown in one frame."""
+    now = [1000.0]
+    monkeypatch.setattr(gamescreen.time, "monotonic", lambda: now[0])
+    screen = makeGameScreen(monkeypatch, tmp_path, showmaze=True, fps=10)
+    player = screen.player
+    statusCalls = screen.stdscr.calls
+    del screen.updates[:]
+    del statusCalls[:]
+    moved = [direction for direction in ["up", "left", "right", "down"] * 5
+             if screen.applyMove(direction)]
+    assert moved
+    # Frame interval has not passed since game start
+    now[0] += 0.05
+    assert not screen.render()
+    assert screen.updates == []
+    assert screen.framePending
+    # All moves are drawn to the pad already, player symbol is drawn with the frame
+    assert screen.shadow[player.screenRow][player.screenColumn] != ord("@")
+    screen.tick()
+    assert screen.updates == []
+    now[0] += 0.06
+    screen.tick()
+    assert len(screen.updates) == 1
+    assert not screen.framePending
+    assert screen.shadow[player.screenRow][player.screenColumn] == ord("@")
+    assert screen.gamepad.text() == shadowText(screen)
+    # Status line is updated on a timer, not with every frame
+    assert statusCalls == []
+    assert screen.statusPending
+    now[0] += gamescreen.STATUS_INTERVAL
+    screen.tick()
+    assert len(screen.updates) == 2
+    status = [call[3] for call in statusCalls if call[0] == "addstr"]
+    assert len(status) == 1
+    assert "Moves: %d/" % len(moved) in status[0]
+    assert not screen.statusPending
+    screen.tick()
+    assert len(screen.updates) == 2
+
+
+def test_status_tick_keeps_player_on_screen(monkeypatch, tmp_path):
+    """Test that a status update between frames does not show the pad without player."""
+    now = [1000.0]
+    monkeypatch.setattr(gamescreen.time, "monotonic", lambda: now[0])
+    screen = makeGameScreen(monkeypatch, tmp_path, level=42, fps=2)
+    player = screen.player
+    statusCalls = screen.stdscr.calls
+    del screen.updates[:]
+    del statusCalls[:]
+    screen.lastFrame = now[0]
+    assert screen.applyMove(pathDirections(screen)[0])
+    padCalls = len(screen.gamepad.calls)
+    now[0] += 0.25
+    screen.tick()
+    # Status line is due, but the frame that draws '@' is not
+    assert screen.framePending
+    assert [call[0] for call in screen.gamepad.calls[padCalls:]] == []
+    assert len(screen.updates) == 1
+    status = [call[3] for call in statusCalls if call[0] == "addstr"]
+    assert len(status) == 1 and "Moves: 1/" in status[0]
+    now[0] += 0.25
+    screen.tick()
+    assert not screen.framePending
+    assert screen.shadow[player.screenRow][player.screenColumn] == ord("@")
+    assert "noutrefresh" in [call[0] for call in screen.gamepad.calls[padCalls:]]
+
+
+def test_elapsed_time_ticks_when_idle(monkeypatch, tmp_path):
+    """Test that status line shows elapsed time also without moves."""
+    now = [1000.0]
+    monkeypatch.setattr(gamescreen.time, "monotonic", lambda: now[0])
+    screen = makeGameScreen(monkeypatch, tmp_path, fps=10)
+    statusCalls = screen.stdscr.calls
+    del screen.updates[:]
+    del statusCalls[:]
+    screen.lastStatus = now[0]
+    padCalls = len(screen.gamepad.calls)
+    screen.tick()
+    assert screen.updates == []
+    for updates in (1, 2):
+        now[0] += gamescreen.STATUS_INTERVAL
+        screen.tick()
+        assert len(screen.updates) == updates
+        status = [call[3] for call in statusCalls if call[0] == "addstr"]
+        assert len(status) == updates and "Elapsed: " in status[-1]
+    assert screen.gamepad.calls[padCalls:] == []
+
+
+def test_idle_timeout(monkeypatch, tmp_path):
+    """Test that game loop wakes up in time for pending frames."""
+    screen = makeGameScreen(monkeypatch, tmp_path, fps=50)
+    assert screen.idleTimeout() == 20
+    screen = makeGameScreen(monkeypatch, tmp_path)
+    assert screen.idleTimeout() == int(gamescreen.STATUS_INTERVAL * 1000)
+
+
+def pathDirections(screen):
+    cells = sorted(screen.shortestPath.getCells(), key=screen.shortestPath.getDistanceTo)
+    directions = []
+    for (cell, nextCell) in zip(cells, cells[1:]):
+        if nextCell.row != cell.row:
+            directions.append("up" if nextCell.row < cell.row else "down")
+        else:
+            directions.append("left" if nextCell.column < cell.column else "right")
+    return directions
+
+
+@pytest.mark.parametrize("level", [49, 7, 42])
+def test_burst_of_moves_keeps_player_visible(monkeypatch, tmp_path, level):
+    """Test that one frame after many moves scrolls the player into view."""
+    now = [1000.0]
+    monkeypatch.setattr(gamescreen.time, "monotonic", lambda: now[0])
+    screen = makeGameScreen(monkeypatch, tmp_path, level=level, fps=10)
+    player = screen.player
+    del screen.updates[:]
+    # Walk towards 'X', but stop before reaching it
+    for direction in pathDirections(screen)[:-1][:48]:
+        assert screen.applyMove(direction)
+    assert screen.updates == []
+    now[0] += 0.2
+    screen.tick()
+    assert len(screen.updates) == 1
+    assert screen.padCornerRow <= player.screenRow < screen.padCornerRow + screen.screenRows
+    assert screen.padCornerColumn <= player.screenColumn < screen.padCornerColumn + screen.screenColumns
+
+
+def test_batch_of_keys_is_one_frame(monkeypatch, tmp_path):
+    """Test that keys read together are shown in one frame with the player visible."""
+    now = [1000.0]
+    monkeypatch.setattr(gamescreen.time, "monotonic", lambda: now[0])
+    screen = makeGameScreen(monkeypatch, tmp_path, level=42, fps=10)
+    player = screen.player
+    keyOf = {direction: key for (key, direction) in MOVE_KEYS.items()}
+    stdscr = screen.stdscr
+    stdscr.keys = [keyOf[direction] for direction in pathDirections(screen)[:-1][:48]]
+    moves = len(stdscr.keys)
+    del screen.updates[:]
+    now[0] += 0.2
+    keys = readKeys(stdscr, screen.idleTimeout())
+    assert len(keys) == moves
+    assert not handleKeys(stdscr, screen, keys)
+    assert len(screen.updates) == 1
+    assert screen.totalMoves == moves
+    assert screen.shadow[player.screenRow][player.screenColumn] == ord("@")
+    assert screen.padCornerRow <= player.screenRow < screen.padCornerRow + screen.screenRows
+    assert screen.padCornerColumn <= player.screenColumn < screen.padCornerColumn + screen.screenColumns
+    assert handleKeys(stdscr, screen, [ord("q")])
@@ -0,0 +1,101 @@
+"""Tests for high score storage."""
+import argparse
+
+from mazingame import highscores
+from mazingame.mazepy import mazepy
+from mazingame.utils import utils
+
+
+def test_migrate_json_mazes(tmp_path, monkeypatch):
+    """Test that JSON mazes of older versions are converted to binary."""
+    dbFile = str(tmp_path / "highscores.sqlite")
+    monkeypatch.setattr(highscores, "getHighScoreFile", lambda: dbFile)
+    grid = mazepy.initMaze(mazepy.Grid(10, 12), "RB")
+    (conn, cursor) = utils.openDatabase(dbFile)
+    cursor.execute('''CREATE TABLE mazes (gameid integer, player_row integer,
+        player_column integer, goal_row integer, goal_column integer, maze_json text)''')
+    cursor.execute("insert into mazes values (1,9,3,2,4,?)", (grid.toJSONString(),))
+    conn.commit()
+    utils.closeDatabase(conn)
+
+    before = highscores.getMazeInfo(1)
+    assert before["maze_blob"] is None
+    assert highscores.migrateMazes() == 1
+    after = highscores.getMazeInfo(1)
+    assert after["maze_json"] == before["maze_json"]
+    assert mazepy.initMazeFromBytes(after["maze_blob"]).toJSONString() == grid.toJSONString()
+    assert highscores.migrateMazes() == 0
+    assert highscores.migrateMazes(compact=True) == 0
+    compacted = highscores.getMazeInfo(1)
+    assert compacted["maze_json"] is None
+    assert compacted["maze_blob"] == after["maze_blob"]
+
+
+def test_export_thumbnails(tmp_path, monkeypatch):
+    """Test that one image is written for each level."""
+    dbFile = str(tmp_path / "highscores.sqlite")
+    monkeypatch.setattr(highscores, "getHighScoreFile", lambda: dbFile)
+    (conn, cursor) = utils.openDatabase(dbFile)
+    cursor.execute("CREATE TABLE highscores (gameid integer, level integer)")
+    cursor.execute('''CREATE TABLE mazes (gameid integer, player_row integer,
+        player_column integer, goal_row integer, goal_column integer, maze_json text,
+        maze_blob blob)''')
+    for (gameid, level) in ((1, 7), (2, 7), (3, 9)):
+        grid = mazepy.initMaze(mazepy.Grid(4, 5), "BT")
+        cursor.execute("insert into highscores values (?,?)", (gameid, level))
+        cursor.execute("insert into mazes values (?,3,0,0,4,null,?)", (gameid, grid.toBytes()))
+    conn.commit()
+    utils.closeDatabase(conn)
+
+    assert highscores.exportThumbnails(str(tmp_path / "thumbs")) == 2
+    assert sorted(p.name for p in (tmp_path / "thumbs").iterdir()) == ["level_7.png", "level_9.png"]
+
+
+def test_hard_scores_listed_separately(tmp_path, monkeypatch, capsys):
+    """Test that hard mode scores are not listed with normal scores."""
+    dbFile = str(tmp_path / "highscores.sqlite")
+    monkeypatch.setattr(highscores, "getHighScoreFile", lambda: dbFile)
+    (conn, cursor) = utils.openDatabase(dbFile)
+    # Table of an older version, without hard column
+    cursor.execute('''CREATE TABLE highscores (gameid integer primary key autoincrement,
+        timestamp text, score integer, level integer, algorithm text, player_name text,
+        elapsed_secs real, moves integer, shortest_path_moves integer, cheat integer,
+        version text, braid real, replay_of_gameid integer)''')
+    cursor.execute("insert into highscores (score,level,cheat) values (111,5,0)")
+    conn.commit()
+    utils.closeDatabase(conn)
+
+    grid = mazepy.initMaze(mazepy.Grid(4, 5), "BT")
+    player = argparse.Namespace(name="player", startingRow=3, startingColumn=0,
+                                visitedCells=[grid.getCell(3, 0)])
+    goal = argparse.Namespace(row=0, column=4)
+    args = argparse.Namespace(replay=None, hard=True, jsonmazes=False)
+    gameid = highscores.saveScores(args, "1.0", grid, player, goal, 5, 222, 7, 7, 1.0, False, "BT")
+    assert gameid == 2
+    assert highscores.selectFromHighScores(1, "hard") == 0
+    assert highscores.selectFromHighScores(gameid, "hard") == 1
+    mazeInfo = highscores.getMazeInfo(gameid)
+    assert mazeInfo["maze_json"] is None
+    assert highscores.loadMaze(mazeInfo).toJSONString() == grid.toJSONString()
+
+    listArgs = argparse.Namespace(showpath=False, showmaze=False, cheat=False, level=[5])
+    highscores.listHighScores(argparse.Namespace(hard=False, **vars(listArgs)))
+    normal = capsys.readouterr().out
+    assert "111" in normal and "222" not in normal
+    highscores.listHighScores(argparse.Namespace(hard=True, **vars(listArgs)))
+    hard = capsys.readouterr().out
+    assert "222" in hard and "111" not in hard
+
+
+def test_save_json_mazes(tmp_path, monkeypatch):
+    """Test that JSON mazes for older versions are saved only when asked."""
+    dbFile = str(tmp_path / "highscores.sqlite")
+    monkeypatch.setattr(highscores, "getHighScoreFile", lambda: dbFile)
+    grid = mazepy.initMaze(mazepy.Grid(4, 5), "BT")
+    player = argparse.Namespace(name="player", startingRow=3, startingColumn=0, visitedCells=[])
+    goal = argparse.Namespace(row=0, column=4)
+    args = argparse.Namespace(replay=None, hard=False, jsonmazes=True)
+    gameid = highscores.saveScores(args, "1.0", grid, player, goal, 5, 222, 7, 7, 1.0, False, "BT")
+    mazeInfo = highscores.getMazeInfo(gameid)
+    assert mazeInfo["maze_json"] == grid.toJSONString()
+    assert mazepy.initMazeFromBytes(mazeInfo["maze_blob"]).toJSONString() == grid.toJSONString()
@@ -0,0 +1,59 @@
+"""Tests for the level cache."""
+import random
+
+from mazingame import levelcache, levels
+
+
+def test_warm_start_matches_cold_start(tmp_path):
+    """Test that cached levels and random state equal generated ones."""
+    cache = levelcache.LevelCache(str(tmp_path / "cache.sqlite"), 10)
+    cold = levelcache.getLevel(7, cache=cache)
+    coldRandom = random.random()
+    assert len(cache) == 1
+
+    warm = levelcache.getLevel(7, cache=cache)
+    warmRandom = random.random()
+    assert warm.grid.toJSONString() == cold.grid.toJSONString()
+    assert warm.pathCells() == cold.pathCells()
+    assert warm.shortestPathLength == cold.shortestPathLength
+    assert warmRandom == coldRandom
+
+
+def test_lru_eviction(tmp_path):
+    """Test that least recently used levels are evicted."""
+    cache = levelcache.LevelCache(str(tmp_path / "cache.sqlite"), 2)
+    levelcache.getLevel(1, cache=cache)
+    levelcache.getLevel(2, cache=cache)
+    # Use level 1 so that level 2 is least recently used
+    assert cache.get(1, levels.levelAlgorithm(1)) is not None
+    levelcache.getLevel(3, cache=cache)
+    assert len(cache) == 2
+    assert cache.get(2, levels.levelAlgorithm(2)) is None
+    assert cache.get(1, levels.levelAlgorithm(1)) is not None
+
+
+def test_hard_mode_cached_separately(tmp_path):
+    """Test that normal and hard mode of a level are different cache entries."""
+    cache = levelcache.LevelCache(str(tmp_path / "cache.sqlite"), 10)
+    normal = levelcache.getLevel(5, cache=cache)
+    hard = levelcache.getLevel(5, cache=cache, hard=True)
+    assert len(cache) == 2
+    cached = cache.get(5, levels.levelAlgorithm(5), hard=True)
+    assert cached.hard
+    assert (cached.playerRow, cached.playerColumn) == (hard.playerRow, hard.playerColumn)
+    assert cached.shortestPathLength == hard.shortestPathLength >= normal.shortestPathLength
+
+
+def test_schema_created_once(tmp_path, monkeypatch):
+    """Test that cache queries do not run schema statements."""
+    cache = levelcache.LevelCache(str(tmp_path / "cache.sqlite"), 10)
+    levelcache.getLevel(3, cache=cache)
+    assert cache.schemaReady
+
+    def noSchema(cursor):
+        raise AssertionError("schema created again")
+
+    monkeypatch.setattr(cache, "_createSchema", noSchema)
+    assert levelcache.getLevel(3, cache=cache).level == 3
+    levelcache.getLevel(4, cache=cache)
+    assert len(cache) == 2
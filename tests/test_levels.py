@@ -0,0 +1,62 @@
+"""Tests for level generation and pre-generation."""
+import random
+import pytest
+
+from mazingame import generate, levelcache, levels
+
+
+def test_generate_level_is_reproducible():
+    """Test that a level always gives the same maze, start and goal."""
+    first = levels.generateLevel(42)
+    second = levels.generateLevel(42)
+    assert first.grid.toJSONString() == second.grid.toJSONString()
+    assert (first.playerRow, first.playerColumn) == (second.playerRow, second.playerColumn)
+    assert (first.goalRow, first.goalColumn) == (second.goalRow, second.goalColumn)
+    assert first.shortestPathLength == len(first.pathCells()) - 1
+    assert first.pathCells()[0] == (first.playerRow, first.playerColumn)
+    assert first.pathCells()[-1] == (first.goalRow, first.goalColumn)
+
+
+def test_parse_levels():
+    """Test level specification parsing."""
+    assert generate.parseLevels("1-3,7, 10-11") == [1, 2, 3, 7, 10, 11]
+    assert generate.parseLevels("-2-0") == [-2, -1, 0]
+    with pytest.raises(ValueError):
+        generate.parseLevels("5-1")
+
+
+@pytest.mark.parametrize("hard", [False, True])
+def test_generate_levels_to_cache(tmp_path, monkeypatch, hard):
+    """Test that the game gets generated levels from the cache."""
+    cache = levelcache.LevelCache(str(tmp_path / "cache.sqlite"), 10)
+    result = generate.generateLevels([1, 2, 3], cache, workers=1, hard=hard, quiet=True)
+    assert result["count"] == 3
+    assert sum(stats["count"] for stats in result["algorithms"].values()) == 3
+    assert len(cache) == 3
+
+    expected = levels.generateLevel(2, hard=hard)
+    expectedRandom = random.random()
+
+    def notGenerated(*args):
+        raise AssertionError("level was generated again")
+
+    monkeypatch.setattr(levelcache, "generateLevel", notGenerated)
+    stored = levelcache.getLevel(2, cache=cache, hard=hard)
+    assert random.random() == expectedRandom
+    assert stored.hard == hard
+    assert stored.grid.toJSONString() == expected.grid.toJSONString()
+    assert stored.pathCells() == expected.pathCells()
+    assert stored.shortestPathLength == expected.shortestPathLength
+    assert cache.get(4, levels.levelAlgorithm(4), hard=hard) is None
+
+
+def test_hard_level_uses_longest_path():
+    """Test that hard mode puts player and goal at the ends of the longest path."""
+    normal = levels.generateLevel(11, 8, 10)
+    normalRandom = random.random()
+    hard = levels.generateLevel(11, 8, 10, hard=True)
+    assert random.random() == normalRandom
+    assert hard.grid.toBytes() == normal.grid.toBytes()
+    (_, _, length) = hard.grid.longestPath()
+    assert hard.shortestPathLength == length
+    assert hard.playerRow >= hard.goalRow
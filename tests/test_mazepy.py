@@ -0,0 +1,586 @@
+"""Tests for the vendored mazepy library."""
+import io
+import itertools
+import random
+import struct
+import zlib
+
+import pytest
+
+from mazingame.mazepy import mazepy
+
+
+def makeMaze(gridClass, algorithm, seed, rows=12, columns=15):
+    random.seed(seed)
+    grid = gridClass(rows, columns)
+    return mazepy.initMaze(grid, algorithm)
+
+
+@pytest.mark.parametrize("algorithm", sorted(mazepy.MAZE_ALGORITHMS.keys()))
+def test_compact_grid_same_maze_as_grid(algorithm):
+    """Test that CompactGrid generates the same maze as Grid with same seed."""
+    grid = makeMaze(mazepy.Grid, algorithm, 7)
+    compact = makeMaze(mazepy.CompactGrid, algorithm, 7)
+    assert compact.toJSONString() == grid.toJSONString()
+    assert compact.asciiStr() == grid.asciiStr()
+
+
+def test_compact_grid_views():
+    """Test that cell views share link state through the grid."""
+    grid = mazepy.CompactGrid(3, 4)
+    cell = grid.getCell(1, 1)
+    cell.link(cell.east)
+    assert grid.getCell(1, 2).linked(grid.getCell(1, 1))
+    assert grid.getCell(1, 1) == cell
+    assert cell.getLinks() == [grid.getCell(1, 2)]
+    assert grid.getCell(0, 3).east is None
+    assert grid.getCell(1, 0).west is None
+    assert not hasattr(cell, "__dict__")
+    with pytest.raises(ValueError):
+        cell.link(grid.getCell(2, 3))
+    cell.unlink(grid.getCell(1, 2))
+    assert grid.cells == bytearray(12)
+
+
+def test_compact_grid_from_json():
+    """Test that JSON exported mazes load into a CompactGrid."""
+    grid = makeMaze(mazepy.Grid, "W", 3)
+    grid.doBraid(0.5)
+    jsonString = grid.toJSONString()
+    compact = mazepy.initMazeFromJSON(jsonString, gridClass=mazepy.CompactGrid)
+    assert compact.toJSONString() == jsonString
+    start = compact.getCell(0, 0)
+    path = start.getDistances().pathTo(compact.getCell(11, 14))
+    assert path.isPartOfPath(compact.getCell(11, 14))
+
+
+@pytest.mark.parametrize("algorithm", sorted(mazepy.MAZE_ALGORITHMS.keys()))
+def test_slotted_cell_same_maze_as_cell(algorithm):
+    """Test that SlottedCell generates the same maze as Cell with same seed."""
+    random.seed(11)
+    grid = mazepy.initMaze(mazepy.Grid(12, 15), algorithm)
+    grid.doBraid(0.5)
+    random.seed(11)
+    slotted = mazepy.initMaze(mazepy.Grid(12, 15, mazepy.SlottedCell), algorithm)
+    slotted.doBraid(0.5)
+    assert slotted.toJSONString() == grid.toJSONString()
+
+
+def test_slotted_cell_links():
+    """Test SlottedCell link semantics."""
+    from mazingame.gameclasses import MazingCell
+
+    grid = mazepy.Grid(3, 3, MazingCell)
+    cell = grid.getCell(1, 1)
+    cell.link(cell.west).link(cell.north)
+    assert cell.getLinks() == [cell.north, cell.west]
+    assert cell.west.linked(cell)
+    assert not cell.linked(None)
+    assert not hasattr(cell, "__dict__")
+    with pytest.raises(ValueError):
+        cell.link(grid.getCell(0, 0))
+    cell.unlink(cell.north)
+    assert cell.mask == mazepy.LINK_WEST
+    assert cell.north.mask == 0
+
+
+def test_ordered_index_set_matches_list():
+    """Test that random.choice picks the same members as from a list."""
+    members = list(range(37))
+    indexSet = mazepy._OrderedIndexSet(37)
+    random.seed(5)
+    expected = []
+    while members:
+        member = random.choice(members)
+        members.remove(member)
+        expected.append(member)
+    random.seed(5)
+    picked = []
+    while len(indexSet) > 0:
+        member = random.choice(indexSet)
+        indexSet.remove(member)
+        picked.append(member)
+    assert picked == expected
+    assert 3 not in indexSet
+
+
+def countLinks(grid):
+    return sum(len(cell.getLinks()) for cell in grid.eachCell()) // 2
+
+
+@pytest.mark.parametrize("compat", [True, False])
+def test_hunt_and_kill_perfect_maze(compat):
+    """Test that both Hunt and Kill modes generate a perfect maze."""
+    random.seed(2)
+    grid = mazepy.initHuntAndKillMaze(mazepy.Grid(15, 20), compat)
+    assert countLinks(grid) == grid.size() - 1
+    assert len(grid.getCell(0, 0).getDistances()) == grid.size()
+
+
+# Hunt and Kill maze of seed 2 made with the original row-major scan
+HUNT_AND_KILL_SEED_2 = """\
++---+---+---+---+---+---+---+---+
+|   |                       |   |
++   +---+   +---+   +---+   +   +
+|   |   |       |   |           |
++   +   +---+   +   +---+---+---+
+|   |           |   |           |
++   +   +---+---+   +   +---+   +
+|           |   |       |       |
++---+---+   +   +---+---+   +---+
+|           |       |       |   |
++   +---+---+---+   +   +---+   +
+|                   |           |
++---+---+---+---+---+---+---+---+
+"""
+
+
+def test_hunt_and_kill_compat_same_maze():
+    """Test that compat mode gives the same maze as the original algorithm."""
+    random.seed(2)
+    grid = mazepy.initHuntAndKillMaze(mazepy.Grid(6, 8), compat=True)
+    assert grid.asciiStr() == HUNT_AND_KILL_SEED_2
+
+
+@pytest.mark.parametrize("generator,algorithm", [("initBinaryTreeMasks", "BT"),
+                                                 ("initSidewinderMasks", "S")])
+@pytest.mark.parametrize("gridClass", [mazepy.CompactGrid, mazepy.Grid])
+def test_vectorized_generators(generator, algorithm, gridClass):
+    """Test that vectorized generators give perfect mazes."""
+    pytest.importorskip("numpy")
+    masks = getattr(mazepy, generator)(13, 17, seed=4)
+    assert masks.shape == (13, 17)
+    grid = mazepy.initMazeFromMasks(masks, gridClass=gridClass, algorithm=algorithm)
+    assert grid.algorithm_key == algorithm
+    assert countLinks(grid) == grid.size() - 1
+    assert len(grid.getCell(0, 0).getDistances()) == grid.size()
+    assert (getattr(mazepy, generator)(13, 17, seed=4) == masks).all()
+
+
+@pytest.mark.parametrize("generator", ["initBinaryTreeMasks", "initSidewinderMasks"])
+@pytest.mark.parametrize("size", [(0, 5), (5, 0), (0, 0)])
+def test_vectorized_generators_empty(generator, size):
+    """Test that vectorized generators give no masks for empty sizes."""
+    pytest.importorskip("numpy")
+    masks = getattr(mazepy, generator)(*size, seed=4)
+    assert masks.shape == size
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+@pytest.mark.parametrize("compress", [True, False])
+def test_bytes_roundtrip(gridClass, compress):
+    """Test that binary format restores the same maze."""
+    grid = makeMaze(gridClass, "W", 3, 9, 14)
+    grid.doBraid(0.5)
+    data = grid.toBytes(compress)
+    restored = mazepy.initMazeFromBytes(data, gridClass=gridClass)
+    assert restored.toJSONString() == grid.toJSONString()
+    assert restored.algorithm_key == "W"
+    assert restored.braid == 0.5
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromBytes(b"JUNK" + data[4:])
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromBytes(data[:len(data) // 2])
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+@pytest.mark.parametrize("cellIndex,bit", [(4, mazepy.LINK_EAST), (1, mazepy.LINK_NORTH),
+                                           (15, mazepy.LINK_SOUTH), (10, mazepy.LINK_WEST),
+                                           (6, mazepy.LINK_EAST)])
+def test_bytes_corrupt_links(gridClass, cellIndex, bit):
+    """Test that links off the grid or to one side only raise ValueError."""
+    grid = makeMaze(mazepy.Grid, "BT", 3, 4, 5)
+    data = bytearray(grid.toBytes(False))
+    # Uncompressed cells are two per byte, first cell in low nibble
+    offset = len(data) - 10 + cellIndex // 2
+    shift = 4 * (cellIndex % 2)
+    data[offset] ^= bit << shift
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromBytes(bytes(data), gridClass=gridClass)
+
+
+def test_bytes_corrupt_compressed():
+    """Test that corrupt compressed data raises ValueError."""
+    data = makeMaze(mazepy.Grid, "BT", 3, 60, 60).toBytes(True)
+    assert len(data) < 60 * 30
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromBytes(data[:-4] + bytes(4))
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromBytes(data[:len(data) // 2])
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+@pytest.mark.parametrize("chunkSize", [1, 7, 65536])
+def test_json_stream_roundtrip(gridClass, chunkSize):
+    """Test streaming JSON writer and reader against toJSONString."""
+    grid = makeMaze(gridClass, "HK", 4, 6, 9)
+    grid.doBraid(0.5)
+    out = io.StringIO()
+    grid.dumpJSON(out)
+    assert out.getvalue() == grid.toJSONString()
+    for text in (out.getvalue(), grid.toJSONString(True)):
+        restored = mazepy.initMazeFromJSONStream(io.StringIO(text), gridClass=gridClass,
+                                                 chunkSize=chunkSize)
+        assert restored.toJSONString() == grid.toJSONString()
+    with pytest.raises(ValueError):
+        mazepy.initMazeFromJSONStream(io.StringIO(out.getvalue()[:-10]), chunkSize=chunkSize)
+
+
+@pytest.mark.parametrize("method", mazepy.SOLVE_METHODS)
+@pytest.mark.parametrize("algorithm", ["AB", "BT", "RB"])
+def test_solve_finds_shortest_path(method, algorithm):
+    """Test that solve returns a connected path as short as flood fill."""
+    grid = makeMaze(mazepy.Grid, algorithm, 5, 10, 13)
+    grid.doBraid(0.7)
+    random.seed(9)
+    for _ in range(25):
+        start = grid.randomCell()
+        goal = grid.randomCell()
+        (path, length) = mazepy.solve(grid, start, goal, method)
+        assert length == len(start.getDistances().pathTo(goal)) - 1
+        cells = sorted(path.getCells(), key=path.getDistanceTo)
+        assert cells[0] is start and cells[-1] is goal
+        assert len(cells) == length + 1
+        assert all(a.linked(b) for a, b in zip(cells, cells[1:]))
+    with pytest.raises(ValueError):
+        mazepy.solve(grid, start, goal, "dfs")
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+def test_array_distances_match_distances(gridClass):
+    """Test that array distances equal dictionary distances."""
+    grid = makeMaze(gridClass, "W", 6, 11, 8)
+    grid.doBraid(0.5)
+    start = grid.getCell(3, 4)
+    goal = grid.getCell(10, 0)
+    distances = start.getDistances()
+    arrayDistances = grid.getDistances(start)
+    assert len(arrayDistances) == len(distances) == grid.size()
+    for cell in grid.eachCell():
+        assert arrayDistances.getDistanceTo(cell) == distances.getDistanceTo(cell)
+    path = arrayDistances.pathTo(goal)
+    assert len(path) == len(distances.pathTo(goal))
+    assert path.isPartOfPath(goal) and path.isPartOfPath(start)
+    maxDistance = max(distances.cells.values())
+    assert arrayDistances.maxDistance() == maxDistance
+    histogram = arrayDistances.histogram()
+    assert len(histogram) == maxDistance + 1 and sum(histogram) == grid.size()
+    assert distances.getDistanceTo(arrayDistances.farthestCell()) == maxDistance
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+def test_array_distances_partial_path(gridClass):
+    """Test that paths on a partial map do not step into cells without a distance."""
+    grid = makeMaze(gridClass, "W", 6, 11, 8)
+    grid.doBraid(1.0)
+    start = grid.getCell(3, 4)
+    full = grid.getDistances(start)
+    # Map of a search stopped after distance 6
+    partial = mazepy.ArrayDistances(grid, start, mazepy.array(
+        "i", (distance if distance <= 6 else -1 for distance in full.distances)))
+    for goal in grid.eachCell():
+        distance = partial.getDistanceTo(goal)
+        if distance is None:
+            with pytest.raises(ValueError):
+                partial.pathTo(goal)
+            continue
+        path = sorted(partial.pathTo(goal).getCells(), key=full.getDistanceTo)
+        assert [full.getDistanceTo(cell) for cell in path] == list(range(distance + 1))
+        assert all(a.linked(b) for (a, b) in zip(path, path[1:]))
+
+
+def test_array_distances_disconnected_path():
+    """Test that there is no path to cells that are not connected to root."""
+    grid = mazepy.Grid(2, 3)
+    grid.getCell(0, 0).link(grid.getCell(0, 1))
+    grid.getCell(1, 0).link(grid.getCell(1, 1))
+    distances = grid.getDistances(grid.getCell(0, 0))
+    assert len(distances.pathTo(grid.getCell(0, 1))) == 2
+    with pytest.raises(ValueError):
+        distances.pathTo(grid.getCell(1, 1))
+
+
+@pytest.mark.parametrize("braid", [0.0, 0.6])
+def test_distance_oracle(braid):
+    """Test oracle distances and bounds against breadth first search."""
+    grid = makeMaze(mazepy.Grid, "RB", 7, 9, 11)
+    grid.doBraid(braid)
+    oracle = mazepy.DistanceOracle(grid, landmarks=3)
+    assert oracle.perfect == (braid == 0.0)
+    cells = list(grid.eachCell())
+    for start in cells[::7]:
+        distances = grid.getDistances(start)
+        for cell in cells:
+            (lower, upper) = oracle.bounds(start, cell)
+            assert lower <= distances.getDistanceTo(cell) <= upper
+            assert oracle.distance(start, cell) == distances.getDistanceTo(cell)
+    start = grid.getCell(8, 0)
+    (goal, distance) = oracle.randomGoal(start, 12, tolerance=1)
+    assert abs(distance - 12) <= 1
+    assert distance == grid.getDistances(start).getDistanceTo(goal)
+
+
+def test_distance_oracle_inexact(monkeypatch):
+    """Test that inexact queries on braided mazes do not search."""
+    grid = makeMaze(mazepy.Grid, "RB", 7, 9, 11)
+    grid.doBraid(1.0)
+    oracle = mazepy.DistanceOracle(grid, landmarks=3)
+    assert not oracle.perfect
+
+    def notSolved(*args):
+        raise AssertionError("solve() was called")
+
+    monkeypatch.setattr(mazepy, "solve", notSolved)
+    start = grid.getCell(8, 0)
+    distances = grid.getDistances(start)
+    for cell in grid.eachCell():
+        distance = oracle.distance(start, cell, exact=False)
+        assert distance == oracle.bounds(start, cell)[1]
+        assert distance >= distances.getDistanceTo(cell)
+    (goal, distance) = oracle.randomGoal(start, 12, tolerance=1, exact=False)
+    assert distance == oracle.bounds(start, goal)[1]
+
+
+def scanDeadEnds(grid):
+    return [(cell.row, cell.column) for cell in grid.eachCell() if len(cell.getLinks()) == 1]
+
+
+@pytest.mark.parametrize("gridClass", [mazepy.Grid, mazepy.CompactGrid])
+def test_dead_end_index(gridClass):
+    """Test that dead end index follows Grid.link and Grid.unlink."""
+    grid = makeMaze(gridClass, "BT", 8, 9, 10)
+    assert [(c.row, c.column) for c in grid.getDeadEndCells()] == scanDeadEnds(grid)
+    cell = grid.getCell(4, 4)
+    for neighbor in cell.neighbors():
+        if cell.linked(neighbor):
+            grid.unlink(cell, neighbor)
+        else:
+            grid.link(cell, neighbor)
+        assert [(c.row, c.column) for c in grid.getDeadEndCells()] == scanDeadEnds(grid)
+    random.seed(2)
+    grid.doBraid(0.3)
+    grid.doBraid(0.6, preferDeadEnds=True)
+    assert [(c.row, c.column) for c in grid.getDeadEndCells()] == scanDeadEnds(grid)
+
+
+@pytest.mark.parametrize("size", [(1, 1), (1, 2), (1, 6), (6, 1)])
+def test_braid_degenerate_grids(size):
+    """Test that braiding grids with one row or column does not fail."""
+    grid = makeMaze(mazepy.Grid, "RB", 1, *size)
+    grid.doBraid(1.0)
+    grid.doBraid(1.0, preferDeadEnds=True)
+
+
+def test_text_renderers():
+    """Test ASCII and Unicode rendering of a small handmade maze."""
+    grid = mazepy.Grid(2, 2)
+    grid.getCell(0, 0).link(grid.getCell(0, 1))
+    grid.getCell(0, 1).link(grid.getCell(1, 1))
+    grid.getCell(1, 1).link(grid.getCell(1, 0))
+    assert grid.asciiStr() == ("+---+---+\n"
+                               "|       |\n"
+                               "+---+   +\n"
+                               "|       |\n"
+                               "+---+---+\n")
+    assert grid.unicodeStr() == ("┌───────┐\n"
+                                 "│       │\n"
+                                 "├───╴   │\n"
+                                 "│       │\n"
+                                 "└───────┘\n")
+    for (write, text) in ((grid.writeAscii, grid.asciiStr()), (grid.writeUnicode, grid.unicodeStr())):
+        out = io.StringIO()
+        write(out)
+        assert out.getvalue() == text
+
+
+def readPNG(path):
+    """Decode an indexed PNG written by mazepy to (width, height, RGB bytes)."""
+    data = open(path, "rb").read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    (pos, chunks) = (8, {})
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        chunkType = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(chunkType + body)
+        chunks[chunkType] = chunks.get(chunkType, b"") + body
+        pos += 12 + length
+    (width, height) = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    palette = chunks[b"PLTE"]
+    (pixels, previous) = (bytearray(), bytes(width))
+    for y in range(height):
+        line = raw[y * (width + 1):(y + 1) * (width + 1)]
+        # Only None and Up filters are used
+        assert line[0] in (0, 2)
+        line = line[1:] if line[0] == 0 else bytes((a + b) & 255 for a, b in zip(line[1:], previous))
+        for index in line:
+            pixels += palette[index * 3:index * 3 + 3]
+        previous = line
+    return (width, height, bytes(pixels))
+
+
+@pytest.mark.parametrize("withNumpy", [True, False])
+def test_image_export(tmp_path, monkeypatch, withNumpy):
+    """Test that PNG and PPM images have the same pixels and show the path."""
+    if withNumpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(mazepy, "numpy", None)
+    grid = makeMaze(mazepy.Grid, "RB", 2, 5, 7)
+    (path, _) = mazepy.solve(grid, grid.getCell(4, 0), grid.getCell(0, 6))
+    grid.toImage(str(tmp_path / "maze.png"), 5, showPath=path)
+    grid.toImage(str(tmp_path / "maze.ppm"), 5, showPath=path)
+    (width, height, pixels) = readPNG(str(tmp_path / "maze.png"))
+    assert (width, height) == (7 * 5 + 1, 5 * 5 + 1)
+    header = b"P6\n%d %d\n255\n" % (width, height)
+    ppm = (tmp_path / "maze.ppm").read_bytes()
+    assert ppm == header + pixels
+
+    def pixel(x, y):
+        return tuple(pixels[(y * width + x) * 3:(y * width + x) * 3 + 3])
+
+    assert pixel(0, 0) == mazepy.IMAGE_PALETTE[mazepy.IMAGE_WALL]
+    # Centers of start cell and cells off the path
+    assert pixel(2, 4 * 5 + 2) == mazepy.IMAGE_PALETTE[mazepy.IMAGE_PATH]
+    offPath = [cell for cell in grid.eachCell() if not path.isPartOfPath(cell)][0]
+    assert pixel(offPath.column * 5 + 2, offPath.row * 5 + 2) == mazepy.IMAGE_PALETTE[mazepy.IMAGE_FLOOR]
+    with pytest.raises(ValueError):
+        grid.toImage(str(tmp_path / "maze.gif"))
+
+
+def test_algorithm_registry():
+    """Test that random pool keeps the order levels depend on."""
+    assert mazepy.randomAlgorithmKeys() == ["AB", "BT", "HK", "RB", "S", "W"]
+    assert mazepy.getAlgorithm("BT").vectorized is mazepy.initBinaryTreeMasks
+    with pytest.raises(ValueError):
+        mazepy.registerAlgorithm("BT", "Binary Tree", mazepy.initBinaryTreeMaze)
+    with pytest.raises(ValueError):
+        mazepy.initMaze(mazepy.Grid(3, 3), "XX")
+
+
+@pytest.mark.parametrize("algorithm", ["K", "P", "E"])
+@pytest.mark.parametrize("size", [(1, 1), (1, 9), (9, 1), (14, 11)])
+@pytest.mark.parametrize("gridClass", [mazepy.CompactGrid, mazepy.Grid])
+def test_perfect_maze_generators(algorithm, size, gridClass):
+    """Test that Kruskal, Prim and Eller give reproducible perfect mazes."""
+    grid = makeMaze(gridClass, algorithm, 6, *size)
+    assert grid.algorithm_key == algorithm
+    assert countLinks(grid) == grid.size() - 1
+    assert len(grid.getDistances(grid.getCell(0, 0))) == grid.size()
+    assert makeMaze(gridClass, algorithm, 6, *size).toBytes() == grid.toBytes()
+    assert algorithm not in mazepy.randomAlgorithmKeys()
+
+
+def test_eller_rows_endless():
+    """Test that endless Eller rows stay consistent between rows."""
+    random.seed(8)
+    previous = None
+    for row in itertools.islice(mazepy.ellerRows(12), 500):
+        assert len(row) == 12
+        if previous is not None:
+            for (above, below) in zip(previous, row):
+                assert bool(above & mazepy.LINK_SOUTH) == bool(below & mazepy.LINK_NORTH)
+        previous = row
+
+
+@pytest.mark.parametrize("algorithm", ["BT", "S"])
+@pytest.mark.parametrize("size", [(1, 1), (1, 6), (6, 1), (13, 17)])
+def test_streaming_rows_same_maze(algorithm, size):
+    """Test that streamed rows give the same maze as the grid algorithm."""
+    (rows, columns) = size
+    grid = makeMaze(mazepy.Grid, algorithm, 5, rows, columns)
+    random.seed(5)
+    streaming = mazepy.getAlgorithm(algorithm).streaming
+    assert b"".join(streaming(columns, rows)) == grid.linkMasks()
+
+
+def checkWindowLinks(grid):
+    masks = grid.linkMasks()
+    columns = grid.columns
+    for index, mask in enumerate(masks):
+        if mask & mazepy.LINK_NORTH:
+            assert index >= columns and masks[index - columns] & mazepy.LINK_SOUTH
+        if mask & mazepy.LINK_SOUTH:
+            assert index + columns < len(masks) and masks[index + columns] & mazepy.LINK_NORTH
+        if mask & mazepy.LINK_EAST:
+            assert masks[index + 1] & mazepy.LINK_WEST
+
+
+@pytest.mark.parametrize("algorithm", ["BT", "S", "E"])
+@pytest.mark.parametrize("climbable", [False, True])
+def test_window_grid(algorithm, climbable):
+    """Test that window keeps its size and consistent links as it advances."""
+    random.seed(7)
+    grid = mazepy.initStreamingMaze(algorithm, 6, 9, climbable=climbable)
+    assert grid.algorithm_key == algorithm
+    grid.getCell(1, 3).setContent("o")
+    grid.getCell(5, 3).setContent("x")
+    assert grid.advance(2) == 2
+    # Cells move south, the bottom row is dropped
+    assert grid.getCell(1, 3).getContent() == "   "
+    assert grid.getCell(3, 3).getContent() == " o "
+    assert list(grid.contents.keys()) == [3 * 9 + 3]
+    for count in [1, 3, 10, 1, 25]:
+        assert grid.advance(count) == count
+        assert len(grid.cells) == 6 * 9
+        checkWindowLinks(grid)
+    assert grid.rowsGenerated == 6 + 2 + 40
+    assert grid.streamRow(5) == 42
+    if climbable:
+        # Each run below the top row links north
+        masks = grid.linkMasks()
+        for row in range(1, 6):
+            run = []
+            for index in range(row * 9, row * 9 + 9):
+                run.append(masks[index])
+                if not masks[index] & mazepy.LINK_EAST:
+                    assert any(mask & mazepy.LINK_NORTH for mask in run)
+                    run = []
+
+
+def test_streaming_errors():
+    """Test that unsupported streaming and short row sources are errors."""
+    with pytest.raises(ValueError):
+        mazepy.initStreamingMaze("RB", 5, 5)
+    with pytest.raises(ValueError):
+        mazepy.WindowGrid(mazepy.ellerRows(5, 3), 5, 5)
+    assert mazepy.streamingAlgorithmKeys() == ["BT", "S", "E"]
+
+
+@pytest.mark.parametrize("algorithm", ["RB", "BT", "E"])
+@pytest.mark.parametrize("size", [(1, 1), (37, 53), (5, 40)])
+def test_chunked_grid_perfect_maze(algorithm, size):
+    """Test that chunks and their doors make one reproducible perfect maze."""
+    random.seed(1)
+    state = random.getstate()
+    grid = mazepy.ChunkedGrid(*size, seed=9, algorithm=algorithm, chunkSize=8, maxChunks=2)
+    assert countLinks(grid) == grid.size() - 1
+    assert len(grid.getDistances(grid.getCell(0, 0))) == grid.size()
+    assert len(grid.chunks) <= 2
+    cached = mazepy.ChunkedGrid(*size, seed=9, algorithm=algorithm, chunkSize=8, maxChunks=100)
+    assert cached.linkMasks() == grid.linkMasks()
+    # Chunks are generated without changing the global random state
+    assert random.getstate() == state
+
+
+def test_chunked_grid_eviction(tmp_path):
+    """Test that changed chunks are written to disk and read back."""
+    grid = mazepy.ChunkedGrid(40, 40, seed=2, chunkSize=8, maxChunks=2, directory=str(tmp_path))
+    cell = grid.getCell(7, 3)
+    # South neighbor is in the next chunk
+    assert (cell.south.row, cell.south.column) == (8, 3)
+    linked = cell.linked(cell.south)
+    if linked:
+        cell.unlink(cell.south)
+    else:
+        cell.link(cell.south)
+    for chunkRow in range(5):
+        for chunkColumn in range(5):
+            grid.chunk(chunkRow, chunkColumn)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["chunk_0_0.bin", "chunk_1_0.bin"]
+    cell = grid.getCell(7, 3)
+    assert cell.linked(cell.south) != linked
+    assert cell.south.linked(cell) != linked
+    grid.close()
+    assert tmp_path.exists()